@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
 
@@ -12,28 +13,35 @@ from ...config.timing_server_loader import get_login_rate_rule, get_refresh_rate
 from ...core.config import settings
 from ...core.database import get_session
 from ...core.logging_config import get_logger
-from ...core.security import decode_jwt
+from ...core.security import compute_refresh_token_digest, decode_jwt
 from ...core.types.token import ACCESS
 from ...schemas.auth import RefreshRequest, SignupRequest, TokenPair, UserRead
 from ...services.auth_service import AuthService
-from ...services.rate_limit import InMemoryRateLimiter, RateRule
+from ...services.home_feed_cache import invalidate_home_feed
+from ...services.identity_cache import invalidate_identity
+from ...services.login_lockout import create_login_lockout
+from ...services.rate_limit import RateRule, call_limiter, create_rate_limiter
+from ...services.token import get_refresh_single_flight
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 LOG = get_logger("api.auth")
 
-rate_limiter = InMemoryRateLimiter()
+rate_limiter = create_rate_limiter()
 _login_srv_rule = get_login_rate_rule()
 _refresh_srv_rule = get_refresh_rate_rule()
-login_rule = RateRule(count=_login_srv_rule.count, window_seconds=_login_srv_rule.window_seconds)
-refresh_rule = RateRule(count=_refresh_srv_rule.count, window_seconds=_refresh_srv_rule.window_seconds)
+login_rule = RateRule.from_view(_login_srv_rule)
+refresh_rule = RateRule.from_view(_refresh_srv_rule)
+login_lockout = create_login_lockout()
 
 
-def _perform_signup(payload: SignupRequest, session: Session) -> UserRead:
+async def _perform_signup(payload: SignupRequest, session: Session) -> UserRead:
     """
     Gemeinsame Signup-Logik für /signup und /register Endpunkte.
+
+    Argon2 läuft im Passwort-Pool, nur die DB-Arbeit im Threadpool.
     """
     service = AuthService(session)
-    user = service.signup(str(payload.email), payload.password)
+    user = await service.signup_async(str(payload.email), payload.password)
     LOG.info("user_signed_up", extra={"user_id": user.id})
     # Robust: Validierung/Serialisierung durch das Pydantic-Modell selbst
     # Nutzt from_attributes=True (siehe UserRead.model_config), damit ORMs unterstützt werden
@@ -41,19 +49,19 @@ def _perform_signup(payload: SignupRequest, session: Session) -> UserRead:
 
 
 @router.post("/signup", response_model=UserRead)
-def signup(payload: SignupRequest, session: Session = Depends(get_session)):
+async def signup(payload: SignupRequest, session: Session = Depends(get_session)):
     """Registriert ein neues Benutzerkonto."""
-    return _perform_signup(payload, session)
+    return await _perform_signup(payload, session)
 
 
 @router.post("/register", response_model=UserRead)
-def register(payload: SignupRequest, session: Session = Depends(get_session)):
+async def register(payload: SignupRequest, session: Session = Depends(get_session)):
     """Registriert ein neues Benutzerkonto (Alias für /signup)."""
-    return _perform_signup(payload, session)
+    return await _perform_signup(payload, session)
 
 
 @router.post("/login", response_model=TokenPair)
-def login(
+async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session),
@@ -62,21 +70,35 @@ def login(
     Authentifiziert einen Benutzer und stellt Token-Paar aus.
 
     Rate-Limiting pro Username+IP zur Reduzierung von Brute-Force-Angriffen.
+    Jeder Versuch wird vor der Passwortprüfung im Login-Lockout gezählt; gesperrte
+    Konten/IPs werden ohne Passwortprüfung abgewiesen.
+    Ein voller Passwort-Pool wird mit 503 abgewiesen, bevor ein Threadpool-Thread belegt wird.
     """
     ip = request.client.host if request.client else "unknown"
     # In Test/Dev-Umgebungen deaktivieren wir das Rate-Limit, um flakige Tests zu vermeiden
     if settings.ENV == "prod":
         key = f"login:{ip}:{form_data.username}"
-        if not rate_limiter.allow(key, login_rule):
+        if not await call_limiter(rate_limiter.blocking, rate_limiter.allow, key, login_rule):
             LOG.warning("login_rate_limited", extra={"client": ip})
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Too many login attempts",
             )
+    await call_limiter(login_lockout.blocking, login_lockout.try_acquire, form_data.username, ip)
     service = AuthService(session)
-    user = service.authenticate(form_data.username, form_data.password)
+    try:
+        user = await service.authenticate_async(form_data.username, form_data.password)
+    except HTTPException as exc:
+        # 401 bleibt als Fehlversuch gezählt; alles andere (403, 503) zählt nicht
+        if exc.status_code != status.HTTP_401_UNAUTHORIZED:
+            await call_limiter(login_lockout.blocking, login_lockout.release, form_data.username, ip)
+        raise
+    except BaseException:
+        await call_limiter(login_lockout.blocking, login_lockout.release, form_data.username, ip)
+        raise
+    await call_limiter(login_lockout.blocking, login_lockout.record_success, form_data.username, ip)
     LOG.info("login_success", extra={"user_id": user.id, "client": ip})
-    access, refresh, expires_in = service.issue_tokens(user)
+    access, refresh, expires_in = await run_in_threadpool(service.issue_tokens, user)
     return TokenPair(
         access_token=access,
         refresh_token=refresh,
@@ -86,7 +108,15 @@ def login(
 
 
 @router.post("/refresh", response_model=TokenPair)
-def refresh(payload: RefreshRequest, request: Request, session: Session = Depends(get_session)):
+async def refresh(payload: RefreshRequest, request: Request, session: Session = Depends(get_session)):
+    """
+    Rotiert ein Refresh-Token.
+
+    Parallele Anfragen mit demselben Token (Single-Flight inkl. kurzer Nachlaufzeit) teilen
+    sich eine Rotation und erhalten dasselbe neue Token-Paar; die DB-Arbeit läuft im Threadpool.
+    Die gemeinsame Rotation überdauert ggf. den Request des ersten Aufrufers und nutzt daher
+    eine eigene Session auf derselben Engine statt dessen Request-Session.
+    """
     # Vorab: minimale Formatprüfung – leere oder getrimmte Tokens sind ungültig
     token = payload.refresh_token or ""
     if (not isinstance(token, str)) or (token != token.strip()) or (len(token) < 10):
@@ -96,21 +126,29 @@ def refresh(payload: RefreshRequest, request: Request, session: Session = Depend
     ip = request.client.host if request.client else "unknown"
     if settings.ENV == "prod":
         key = f"refresh:{ip}"
-        if not rate_limiter.allow(key, refresh_rule):
+        if not await call_limiter(rate_limiter.blocking, rate_limiter.allow, key, refresh_rule):
             LOG.warning("refresh_rate_limited", extra={"client": ip})
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Too many refresh attempts",
             )
 
-    service = AuthService(session)
-    access, refresh_token, expires_in, user = service.rotate_refresh(token)
-    LOG.info("token_refreshed", extra={"user_id": user.id})
-    return TokenPair(
-        access_token=access,
-        refresh_token=refresh_token,
-        expires_in=expires_in,
-        role=user.role.value if hasattr(user.role, "value") else str(user.role),
+    bind = session.get_bind()
+
+    def _rotate_blocking() -> TokenPair:
+        with Session(bind) as rotation_session:
+            access, refresh_token, expires_in, user = AuthService(rotation_session).rotate_refresh(token)
+            LOG.info("token_refreshed", extra={"user_id": user.id})
+            return TokenPair(
+                access_token=access,
+                refresh_token=refresh_token,
+                expires_in=expires_in,
+                role=user.role.value if hasattr(user.role, "value") else str(user.role),
+            )
+
+    return await get_refresh_single_flight().run(
+        compute_refresh_token_digest(token),
+        lambda: run_in_threadpool(_rotate_blocking),
     )
 
 
@@ -146,7 +184,12 @@ def upgrade_to_premium(user=Depends(get_current_user), session: Session = Depend
     Erfordert Authentifizierung.
     Ändert die Benutzerrolle von 'common' zu 'premium'.
     """
-    from ...models.user import UserRole
+    from ...models.user import User, UserRole
+
+    # Identität ist ein Snapshot – für die Änderung die aktuelle Zeile laden
+    user = session.get(User, user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or missing user")
 
     if user.role == UserRole.premium:
         raise HTTPException(
@@ -158,6 +201,8 @@ def upgrade_to_premium(user=Depends(get_current_user), session: Session = Depend
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_identity(user.email)
+    invalidate_home_feed(user.id)
 
     LOG.info("premium_activated", extra={"user_id": user.id})
     return user
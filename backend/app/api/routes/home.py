@@ -2,24 +2,29 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...api.deps import get_current_user
 from ...config.timing_server_loader import get_feed_rate_rule
-from ...core.database import get_session
+from ...core.database import get_async_session
 from ...core.logging_config import get_logger
 from ...fixtures.v1 import get_feed_page
+from ...homewidget.contracts.v1.cursor import decode_cursor
 from ...homewidget.contracts.v1.widget_contracts import FeedPageV1
 from ...schemas.widget import WidgetRead
 from ...services import demo_feed_real_source as real_src
-from ...services.home_feed_service import HomeFeedService
-from ...services.rate_limit import InMemoryRateLimiter, RateRule
+from ...services.home_feed_cache import feed_cache_ttl, get_cached_feed, store_feed
+from ...services.home_feed_service import AsyncHomeFeedService
+from ...services.rate_limit import RateRule, call_limiter, create_rate_limiter
 
 router = APIRouter(prefix="/api/home", tags=["home"])
 LOG = get_logger("api.home")
 
-_rate_limiter = InMemoryRateLimiter()
+_WIDGET_READ_LIST = TypeAdapter(list[WidgetRead])
+
+_rate_limiter = create_rate_limiter()
 _FEED_RULE_CACHE: RateRule | None = None
 _FEED_RULE_CACHE_TS: float | None = None
 # Warum genau 5 Sekunden TTL?
@@ -48,7 +53,7 @@ def _current_feed_rule() -> RateRule:
         return _FEED_RULE_CACHE
 
     srv_rule = get_feed_rate_rule()
-    rule = RateRule(count=srv_rule.count, window_seconds=srv_rule.window_seconds)
+    rule = RateRule.from_view(srv_rule)
     _FEED_RULE_CACHE = rule
     _FEED_RULE_CACHE_TS = now
     return rule
@@ -67,32 +72,42 @@ def _enforce_rate_limit(*, key: str, event: str) -> None:
 
 
 @router.get("/feed", response_model=list[WidgetRead])
-def get_feed(
+async def get_feed(
         _request: Request,
-        session: Session = Depends(get_session),
+        session: AsyncSession = Depends(get_async_session),
         user=Depends(get_current_user),
-) -> list[WidgetRead]:
+) -> Response:
     """
     Liefert den BackendWidget-Feed für den aktuellen Benutzer.
 
-    Rate-Limiting pro Benutzer-ID.
+    Rate-Limiting pro Benutzer-ID. Antworten werden pro (user_id, role) als
+    serialisiertes JSON gecacht (siehe `services.home_feed_cache`).
     """
-    _enforce_rate_limit(key=f"feed:{user.id}", event="feed_rate_limited")
+    await call_limiter(_rate_limiter.blocking, _enforce_rate_limit, key=f"feed:{user.id}", event="feed_rate_limited")
+
+    cached = await get_cached_feed(user.id, user.role)
+    if cached is not None:
+        LOG.debug("feed_cache_hit", extra={"user_id": user.id})
+        return Response(content=cached, media_type="application/json")
 
     LOG.debug("fetching_feed_for_user", extra={"user_email": user.email})
-    widgets = HomeFeedService(session).get_user_widgets(user)
+    # Async-DB-Zugriff: belegt keinen Threadpool-Slot
+    widgets = await AsyncHomeFeedService(session).get_user_widgets(user)
+    ttl_seconds = feed_cache_ttl(widgets)
     # ORM -> Schema konvertieren, um genau list[WidgetRead] zurückzugeben
     widgets_read: list[WidgetRead] = [
         WidgetRead.model_validate(w, from_attributes=True) for w in widgets
     ]
+    body = _WIDGET_READ_LIST.dump_json(widgets_read)
+    await store_feed(user.id, user.role, body, ttl_seconds)
     LOG.info("feed_delivered", extra={"count": len(widgets_read)})
-    return widgets_read
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/feed_v1", response_model=FeedPageV1)
 def get_feed_v1(
         _request: Request,
-        cursor: Annotated[int, Query(ge=0)] = 0,
+        cursor: Annotated[str | None, Query(max_length=256)] = None,
         limit: Annotated[int, Query(ge=1, le=100)] = 20,
         user=Depends(get_current_user),
 ) -> FeedPageV1:
@@ -100,12 +115,18 @@ def get_feed_v1(
     Versionierter Feed v1 (read-only) mit stabiler Sortierung und Cursor-Pagination.
 
     Sortierung: priority desc, created_at desc, id desc
-    Cursor: Offset (int). next_cursor wird gesetzt, wenn weitere Elemente existieren.
+    Cursor: opaker Keyset-Cursor aus `next_cursor`; numerische Offsets bleiben aus
+    Kompatibilitätsgründen gültig. next_cursor wird gesetzt, wenn weitere Elemente existieren.
     """
     _enforce_rate_limit(key=f"feed_v1:{user.id}", event="feed_v1_rate_limited")
 
     try:
-        real_page = real_src.load_real_demo_feed_v1(cursor=cursor, limit=limit)
+        page_cursor = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    try:
+        real_page = real_src.load_real_demo_feed_v1(cursor=page_cursor, limit=limit)
         if real_page and real_page.items:
             LOG.info("feed_v1_real_delivered", extra={"count": len(real_page.items)})
             return real_page
@@ -119,6 +140,6 @@ def get_feed_v1(
             exc_info=True,
         )
 
-    page = get_feed_page(cursor=cursor, limit=limit)
+    page = get_feed_page(cursor=page_cursor, limit=limit)
     LOG.info("feed_v1_fixture_delivered", extra={"count": len(page.items)})
     return page
\ No newline at end of file
@@ -3,24 +3,26 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ...api.deps import get_current_user
-from ...core.database import get_session
+from ...core.database import get_async_session, get_session
 from ...core.logging_config import get_logger
 from ...fixtures.v1 import is_fixture_id
 from ...models.widget import Widget
 from ...homewidget.contracts.v1.widget_contracts import WidgetDetailV1
 from ...schemas.widget import WidgetCreate, WidgetRead
 from ...services import demo_feed_real_source as real_src
+from ...services.home_feed_cache import invalidate_home_feed
 
 router = APIRouter(prefix="/api/widgets", tags=["widgets"])
 LOG = get_logger("api.widgets")
 
 
 @router.get("/", response_model=list[WidgetRead])
-def list_widgets(session: Session = Depends(get_session), user=Depends(get_current_user)):
+async def list_widgets(session: AsyncSession = Depends(get_async_session), user=Depends(get_current_user)):
     """Listet alle Widgets des aktuellen Benutzers auf."""
-    widgets = session.exec(select(Widget).where(Widget.owner_id == user.id)).all()
+    widgets = (await session.exec(select(Widget).where(Widget.owner_id == user.id))).all()
     LOG.info("widgets_listed", extra={"count": len(widgets)})
     return widgets
 
@@ -36,6 +38,7 @@ def create_widget(
     session.add(widget)
     session.commit()
     session.refresh(widget)
+    invalidate_home_feed(user.id)
     LOG.info("widget_created", extra={"widget_id": widget.id})
     return widget
 
@@ -52,6 +55,7 @@ def delete_widget(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BackendWidget not found")
     session.delete(widget)
     session.commit()
+    invalidate_home_feed(user.id)
     LOG.info("widget_deleted", extra={"widget_id": widget_id})
     return None
 
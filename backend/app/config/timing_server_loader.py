@@ -18,7 +18,7 @@ from dataclasses import dataclass
 from datetime import timedelta
 from functools import lru_cache
 from pathlib import Path
-from typing import TypedDict
+from typing import Literal, TypedDict
 
 from pydantic import BaseModel, Field, PositiveInt, ValidationError, field_validator
 
@@ -39,6 +39,9 @@ class LockoutTimings(BaseModel):
 class RateLimitTimings(BaseModel):
     windowMs: PositiveInt = Field(..., description="Fenstergröße in Millisekunden")
     maxRequests: PositiveInt = Field(..., description="Max. Requests im Fenster")
+    algorithm: Literal["sliding_window", "gcra"] = Field(
+        "sliding_window", description="Limiter-Algorithmus (gcra = O(1) Zustand je Key)"
+    )
 
 
 class RateLimits(BaseModel):
@@ -88,6 +91,7 @@ class TimingServerFile(BaseModel):
 class RateRuleView:
     count: int
     window_seconds: int
+    algorithm: str = "sliding_window"
 
 
 class ServerTimingsView(TypedDict):
@@ -162,7 +166,9 @@ def _load_raw() -> ServerTimings:
 
 def _to_view(server: ServerTimings) -> ServerTimingsView:
     def _rl_to_view(rl: RateLimitTimings) -> RateRuleView:
-        return RateRuleView(count=int(rl.maxRequests), window_seconds=int(rl.windowMs // 1000))
+        return RateRuleView(
+            count=int(rl.maxRequests), window_seconds=int(rl.windowMs // 1000), algorithm=rl.algorithm
+        )
 
     # Entweder eine globale Regel oder kontext-spezifische Regeln
     if isinstance(server.security.rateLimit, RateLimitTimings):
@@ -269,6 +275,18 @@ def get_feed_rate_rule() -> RateRuleView:
         raise
 
 
+def get_lockout_policy() -> tuple[int, timedelta]:
+    """Liefert (maxAttempts, cooldown) des Login-Lockouts; cooldown 0 deaktiviert ihn."""
+    try:
+        timings = get_active_server_timings()
+        return timings["lockout_max_attempts"], timings["lockout_cooldown"]
+    except Exception:
+        if _active_env() != "prod":
+            logging.getLogger("config.timing").warning("lockout_policy_fallback_disabled")
+            return FALLBACK_RATE_LIMIT_COUNT, timedelta(0)
+        raise
+
+
 def _parse_rate_rule_expr(expr: str) -> RateRuleView:
     """Hilfsfunktion: parst "N/W" in eine RateRuleView.
 
@@ -8,6 +8,14 @@ import os
 from datetime import timedelta
 
 
+def _default_shared_state_path(database_url: str) -> str:
+    """Legt die Shared-State-Datei ins Verzeichnis einer SQLite-Datenbankdatei."""
+    directory = "."
+    if database_url.startswith("sqlite:///") and ":memory:" not in database_url:
+        directory = os.path.dirname(database_url.removeprefix("sqlite:///")) or "."
+    return os.path.join(directory, "homewidget-shared-state.sqlite")
+
+
 class Settings:
     """
     Konfigurationseinstellungen für das Backend.
@@ -52,6 +60,74 @@ class Settings:
     FEED_RATE_LIMIT: str    = os.getenv("FEED_RATE_LIMIT", "60/60")
     REFRESH_RATE_LIMIT: str = os.getenv("REFRESH_RATE_LIMIT", "10/600")
 
+    # Per-User Cache für /api/home/feed (Sekunden); 0 deaktiviert den Cache
+    HOME_FEED_CACHE_TTL_SECONDS: int = int(os.getenv("HOME_FEED_CACHE_TTL_SECONDS", "30"))
+
+    # Feed-v1-Provider: Timeout je Provider, Gesamt-Deadline pro Seite (Sekunden) und Thread-Pool-Größe
+    PROVIDER_TIMEOUT_SECONDS: float = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "2.0"))
+    FEED_PAGE_DEADLINE_SECONDS: float = float(os.getenv("FEED_PAGE_DEADLINE_SECONDS", "3.0"))
+    PROVIDER_MAX_WORKERS: int = int(os.getenv("PROVIDER_MAX_WORKERS", "8"))
+    # Frischefenster des Provider-Ergebnis-Caches (Sekunden); 0 deaktiviert den Cache
+    PROVIDER_CACHE_FRESH_SECONDS: float = float(os.getenv("PROVIDER_CACHE_FRESH_SECONDS", "60"))
+
+    # Argon2-Pool: gleichzeitige Hash-Operationen und maximale Warteschlange (darüber: 503)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS") or min(4, os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+    # Cache verifizierter Access-Token-Claims (max. Einträge); 0 deaktiviert den Cache
+    JWT_CLAIMS_CACHE_SIZE: int = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "10000"))
+
+    # Identity-Cache für get_current_user: TTL (Sekunden, 0 deaktiviert) und max. Einträge
+    IDENTITY_CACHE_TTL_SECONDS: float = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "30"))
+    IDENTITY_CACHE_MAX_ENTRIES: int = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+
+    # Bloom-Negativ-Filter vor der Token-Blacklist: Sync/Rebuild-Intervall (Sekunden, 0 deaktiviert),
+    # Bits und Hashfunktionen je Bucket sowie Bucket-Breite nach Token-Ablauf (Sekunden)
+    BLACKLIST_FILTER_SYNC_SECONDS: float = float(os.getenv("BLACKLIST_FILTER_SYNC_SECONDS", "5"))
+    BLACKLIST_FILTER_BITS: int = int(os.getenv("BLACKLIST_FILTER_BITS", str(1 << 18)))
+    BLACKLIST_FILTER_HASHES: int = int(os.getenv("BLACKLIST_FILTER_HASHES", "7"))
+    BLACKLIST_FILTER_BUCKET_SECONDS: int = int(os.getenv("BLACKLIST_FILTER_BUCKET_SECONDS", "300"))
+
+    # Shared State für Blacklist/Rate-Limits über Worker hinweg: "memory" (je Prozess) oder "sqlite" (WAL-Datei)
+    SHARED_STATE_BACKEND: str = os.getenv("SHARED_STATE_BACKEND", "memory").strip().lower()
+    # Default: neben der SQLite-Datenbank (App-Datenverzeichnis), sonst im Arbeitsverzeichnis
+    SHARED_STATE_PATH: str = os.getenv("SHARED_STATE_PATH") or _default_shared_state_path(DATABASE_URL)
+
+    # In-Memory-Rate-Limiter: Obergrenze getrackter Keys (je Algorithmus, LRU-Verdrängung;
+    # 0 = ohne Obergrenze) und Intervall des Sweepers für leere Fenster (Sekunden, 0 deaktiviert)
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    RATE_LIMIT_SWEEP_SECONDS: float = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+
+    # Login-Lockout: Schwelle je IP = lockout.maxAttempts (timing.server.json) * Faktor
+    LOGIN_LOCKOUT_IP_FACTOR: int = int(os.getenv("LOGIN_LOCKOUT_IP_FACTOR", "4"))
+
+    # Refresh-Rotation: gleichzeitige Refreshes mit demselben Token erhalten dasselbe neue
+    # Token-Paar, ebenso bis zu N Sekunden nach Abschluss (verspätete Retries bzw. parallele
+    # Tabs; 0 = Wiederverwendung sofort 401)
+    REFRESH_REUSE_GRACE_SECONDS: float = float(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "5"))
+
+    # Cleanup abgelaufener/widerrufener Refresh-Tokens: Zeilen je Transaktion und Pause
+    # zwischen den Batches (Sekunden), damit Login/Refresh nicht auf die DB-Sperre warten
+    TOKEN_PURGE_BATCH_SIZE: int = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", "5000"))
+    TOKEN_PURGE_PAUSE_SECONDS: float = float(os.getenv("TOKEN_PURGE_PAUSE_SECONDS", "0.05"))
+
+    # SQLite-Pragmas (WAL, synchronous, Cache, mmap) je Profil: prod | dev | e2e | off
+    SQLITE_PRAGMA_PROFILE: str = os.getenv("SQLITE_PRAGMA_PROFILE") or os.getenv("HW_PROFILE") or "dev"
+
+    # DB-Connection-Pool (SQLite-Dateien und Server-DBs): Größe + Overflow sollten die
+    # Threadpool-Parallelität abdecken; pre_ping/recycle nur für Server-DBs (Postgres)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "1").strip().lower() not in ("0", "false", "no")
+    # Eigener Pool der AsyncEngine (async Sessions); Verbindungen kommen zu denen des
+    # Sync-Pools hinzu, max. gesamt: DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW
+    DB_ASYNC_POOL_SIZE: int = int(os.getenv("DB_ASYNC_POOL_SIZE", "5"))
+    DB_ASYNC_MAX_OVERFLOW: int = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "10"))
+    # Intervall des periodischen `db_pool_stats`-Logs (Sekunden, 0 deaktiviert)
+    DB_POOL_STATS_SECONDS: float = float(os.getenv("DB_POOL_STATS_SECONDS", "60"))
+
     # CORS
     # Kommagetrennte Ursprünge, z. B. "http://localhost:19006,http://localhost:3000"
     _CORS_ORIGINS_RAW: str = os.getenv("CORS_ORIGINS", "*")
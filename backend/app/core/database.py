@@ -4,15 +4,113 @@ Konfiguriert die SQLModel-Engine und stellt Hilfsfunktionen für Schema-Initiali
 """
 from __future__ import annotations
 
+import asyncio
 import os
+from collections.abc import AsyncGenerator
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .config import settings
+from .db_pool import PoolMetrics, install_pool_metrics, pool_options
 from .logging_config import get_logger
 
-DB_SCHEMA_VERSION = 1  # Dokumentiert die aktuelle Schema-Version für SQLite PRAGMA user_version
+# Aktuelle Schema-Version (SQLite: PRAGMA user_version); entspricht dem letzten Schritt in
+# `core.migrations.MIGRATIONS`
+DB_SCHEMA_VERSION = 3
+
+# SQLite-Pragmas je Profil (`SQLITE_PRAGMA_PROFILE`, Default: `HW_PROFILE`), angewandt bei jedem
+# Verbindungsaufbau. WAL: Leser blockieren nicht hinter Schreibern; synchronous=NORMAL: fsync
+# nur beim Checkpoint statt bei jedem Commit (in WAL crash-sicher, nur die letzten Commits
+# können bei Stromausfall verloren gehen). cache_size < 0 = KiB. "off" = SQLite-Defaults.
+SQLITE_PRAGMA_PROFILES: dict[str, dict[str, Any]] = {
+    "prod": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+    "dev": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -16384,
+        "mmap_size": 67108864,
+        "temp_store": "MEMORY",
+    },
+    # E2E-Läufe verwerfen die DB; Dauerhaftigkeit ist dort nachrangig
+    "e2e": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "busy_timeout": 5000,
+        "cache_size": -16384,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+    },
+    "off": {},
+}
+
+# Pragmas ohne Wirkung bzw. ohne Sinn für In-Memory-Datenbanken
+_FILE_ONLY_PRAGMAS = frozenset({"journal_mode", "mmap_size"})
+
+
+def sqlite_pragmas_for(profile: str | None = None) -> dict[str, Any]:
+    """Liefert die Pragmas des Profils; unbekannte Profile fallen auf "dev" zurück."""
+    name = (profile or settings.SQLITE_PRAGMA_PROFILE).strip().lower()
+    return SQLITE_PRAGMA_PROFILES.get(name, SQLITE_PRAGMA_PROFILES["dev"])
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: dict[str, Any]) -> None:
+    """
+    Registriert einen `connect`-Hook, der die Pragmas auf jede neue DBAPI-Verbindung anwendet.
+
+    Args:
+        engine: SQLite-Engine.
+        pragmas: Name -> Wert (siehe `SQLITE_PRAGMA_PROFILES`).
+    """
+    if not pragmas:
+        return
+    in_memory = engine.url.database in (None, "", ":memory:")
+    statements = [
+        f"PRAGMA {name}={value}"
+        for name, value in pragmas.items()
+        if not (in_memory and name in _FILE_ONLY_PRAGMAS)
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def _with_pool_options(url: str, kwargs: dict[str, Any], *, asyncio: bool = False) -> dict[str, Any]:
+    """Ergänzt die Pool-Settings; eine explizit übergebene `poolclass` wird unverändert übernommen."""
+    if "poolclass" in kwargs:
+        return kwargs
+    return {**pool_options(url, asyncio=asyncio), **kwargs}
+
+
+def create_sqlite_engine(url: str, *, profile: str | None = None, **kwargs: Any) -> Engine:
+    """
+    Erzeugt eine SQLite-Engine mit `check_same_thread=False`, den Pragmas des Profils
+    und der Pool-Konfiguration aus den Settings (überschreibbar per `kwargs`).
+    """
+    connect_args = {"check_same_thread": False, **kwargs.pop("connect_args", {})}
+    sqlite_engine = create_engine(url, echo=False, connect_args=connect_args, **_with_pool_options(url, kwargs))
+    install_sqlite_pragmas(sqlite_engine, sqlite_pragmas_for(profile))
+    return sqlite_engine
+
 
 def _create_engine_with_fallback(url: str):
     """
@@ -43,12 +141,12 @@ def _create_engine_with_fallback(url: str):
                         "db_dir_not_writable_fallback_tmp",
                         extra={"original": url, "fallback": fallback},
                     )
-                    return create_engine(fallback, echo=False)
+                    return create_sqlite_engine(fallback)
 
-        # Für SQLite stabilere Defaults setzen
+        # Für SQLite stabilere Defaults und Pragmas (WAL etc.) setzen
         if url.startswith("sqlite://"):
-            return create_engine(url, echo=False, connect_args={"check_same_thread": False})
-        return create_engine(url, echo=False)
+            return create_sqlite_engine(url)
+        return create_engine(url, echo=False, **pool_options(url))
     except Exception as exc:  # defensive: als letztes Mittel auf /tmp wechseln
         if settings.ENV != "prod":
             fallback = "sqlite:////tmp/homewidget-e2e.db"
@@ -57,19 +155,139 @@ def _create_engine_with_fallback(url: str):
                 extra={"original": url, "fallback": fallback},
                 exc_info=exc,
             )
-            return create_engine(fallback, echo=False)
+            return create_sqlite_engine(fallback)
         raise
 
 
 engine = _create_engine_with_fallback(settings.DATABASE_URL)
+_pool_metrics = install_pool_metrics(engine)
 LOG = get_logger("infrastructure.db")
 
 
+def get_pool_metrics() -> PoolMetrics:
+    """Gibt die Pool-Metriken der Anwendungs-Engine zurück."""
+    return _pool_metrics
+
+
+# Async-Treiber je Dialekt für die `AsyncEngine` (heiße Lesepfade ohne Threadpool-Slot)
+_ASYNC_DRIVERS: dict[str, str] = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+_async_engine: AsyncEngine | None = None
+_async_pool_metrics: PoolMetrics | None = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    Leitet die Async-URL aus einer Sync-URL ab (`sqlite://` → `sqlite+aiosqlite://`,
+    `postgresql[+psycopg2]://` → `postgresql+asyncpg://`).
+
+    Raises:
+        ValueError: Für Dialekte ohne unterstützten Async-Treiber.
+    """
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"no async driver for dialect {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str, *, profile: str | None = None, **kwargs: Any) -> AsyncEngine:
+    """
+    Erzeugt eine `AsyncEngine` zur Sync-URL `url` mit Pool-Konfiguration aus den Settings
+    und – für SQLite – denselben Pragmas wie die Sync-Engine.
+    """
+    async_url = async_database_url(url)
+    async_engine = create_async_engine(async_url, echo=False, **_with_pool_options(async_url, kwargs, asyncio=True))
+    if async_engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas_for(profile))
+    return async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Liefert die (lazy erzeugte) `AsyncEngine` zur aktuellen Anwendungs-Engine.
+
+    Sie folgt der URL von `engine`, also auch einem `/tmp`-Fallback aus `init_db`.
+    """
+    global _async_engine, _async_pool_metrics
+    if _async_engine is None or _async_engine.url.database != engine.url.database:
+        _async_engine = create_async_db_engine(engine.url.render_as_string(hide_password=False))
+        _async_pool_metrics = install_pool_metrics(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_pool_metrics() -> PoolMetrics | None:
+    """Gibt die Pool-Metriken der `AsyncEngine` zurück (None, solange sie nicht erzeugt wurde)."""
+    return _async_pool_metrics
+
+
+def log_pool_stats() -> None:
+    """Loggt die Pool-Metriken der Sync- und (falls erzeugt) der Async-Engine als `db_pool_stats`."""
+    for name, metrics in (("sync", get_pool_metrics()), ("async", get_async_pool_metrics())):
+        if metrics is None:
+            continue
+        stats = metrics.stats()
+        LOG.info(
+            "db_pool_stats",
+            extra={
+                "engine": name,
+                "checkouts": stats.checkouts,
+                "checked_out": stats.checked_out,
+                "connects": stats.connects,
+                "invalidations": stats.invalidations,
+                "timeouts": stats.timeouts,
+                "peak_overflow": stats.peak_overflow,
+                "wait_count": stats.wait_count,
+                "wait_avg_ms": round(stats.wait_total_ms / stats.wait_count, 3) if stats.wait_count else 0.0,
+                "wait_histogram": list(stats.wait_histogram),
+            },
+        )
+
+
+async def db_pool_stats_loop(
+        interval_seconds: float | None = None,
+        *,
+        max_runs: int | None = None,
+) -> None:
+    """
+    Loggt periodisch die Pool-Metriken (`db_pool_stats`), z. B. für Sizing und Timeout-Alarme.
+
+    Args:
+        interval_seconds: Pause zwischen zwei Logs (Default: `DB_POOL_STATS_SECONDS`,
+            <= 0 deaktiviert den Loop).
+        max_runs: Optionale Begrenzung der Anzahl Durchläufe (nur Tests).
+    """
+    interval = settings.DB_POOL_STATS_SECONDS if interval_seconds is None else interval_seconds
+    if interval <= 0:
+        return
+
+    runs = 0
+    while True:
+        try:
+            log_pool_stats()
+        except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Metrik-Log darf nicht abbrechen
+            LOG.warning("db_pool_stats_failed", exc_info=exc)
+
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            break
+
+        await asyncio.sleep(interval)
+
+
+async def dispose_async_engine() -> None:
+    """Schließt die Verbindungen der `AsyncEngine` (Shutdown)."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 def init_db() -> None:
     """
-    Initialisiert das Datenbankschema durch Anlegen aller Tabellen.
+    Initialisiert das Datenbankschema über die versionierten Migrationen (`core.migrations`).
     """
-    global engine  # Wir ersetzen die Engine ggf. bei Fallback in Nicht‑Prod
+    global engine, _pool_metrics  # Wir ersetzen die Engine ggf. bei Fallback in Nicht‑Prod
     LOG.info(
         "Initializing database schema",
         extra={"env": settings.ENV, "db_url": settings.DATABASE_URL},
@@ -80,13 +298,13 @@ def init_db() -> None:
                 settings.DATABASE_URL.startswith("sqlite:///") or settings.DATABASE_URL.startswith("sqlite:////")):
             try:
                 with engine.begin() as conn:  # type: ignore[attr-defined]
-                    # Mini-Schreibprobe
+                    # Mini-Schreibprobe: Version unverändert zurückschreiben (führt die Migration)
                     # noinspection SqlDialectInspection,SqlNoDataSourceInspection
                     # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(f"PRAGMA user_version={DB_SCHEMA_VERSION}")
+                    current_version = int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
                     # noinspection SqlDialectInspection,SqlNoDataSourceInspection
                     # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("PRAGMA user_version")
+                    conn.exec_driver_sql(f"PRAGMA user_version={current_version}")
             except Exception as exc:  # noqa: BLE001
                 fallback = "sqlite:////tmp/homewidget-e2e.db"
                 LOG.warning(
@@ -96,6 +314,7 @@ def init_db() -> None:
                 )
                 # Engine neu erstellen und global ersetzen
                 engine = _create_engine_with_fallback(fallback)
+                _pool_metrics = install_pool_metrics(engine)
     except Exception:
         # Schreibprobe ist rein diagnostisch; Fehler hier sollen init nicht verhindern
         LOG.warning("db_sqlite_write_probe_exception", extra={"db_url": settings.DATABASE_URL})
@@ -109,206 +328,25 @@ def init_db() -> None:
             from ..models.widget import Widget, RefreshToken  # noqa: F401
         except Exception as exc:  # pragma: no cover - defensive
             LOG.warning("model_import_failed", extra={"error": str(exc)})
-    SQLModel.metadata.create_all(engine)
-
-    # Leichte Auto‑Migrationen für SQLite in Nicht‑Prod:
-    # Füge fehlende Spalten hinzu, die in älteren lokalen DB‑Dateien fehlen können.
-    try:
-        if settings.ENV != "prod" and settings.DATABASE_URL.startswith("sqlite://"):
-            with engine.begin() as conn:  # type: ignore[attr-defined]
-                # Prüfe bestehende Spalten der Tabelle 'users'
-                res = conn.exec_driver_sql("PRAGMA table_info('users')")
-                cols = {row[1] for row in res.fetchall()}  # row[1] = name
-
-                # users.role
-                if "role" not in cols:
-                    LOG.warning("db_auto_migrate_add_users_role")
-                    # SQLite: ALTER TABLE ADD COLUMN mit Default
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE users ADD COLUMN role TEXT NOT NULL DEFAULT 'common'")
-
-                # users.created_at
-                if "created_at" not in cols:
-                    LOG.warning("db_auto_migrate_add_users_created_at")
-                    # NOT NULL mit Default auf aktuelle Zeit (UTC) für bestehende Zeilen
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "ALTER TABLE users ADD COLUMN created_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP)"
-                    )
-
-                # users.updated_at
-                if "updated_at" not in cols:
-                    LOG.warning("db_auto_migrate_add_users_updated_at")
-                    # NOT NULL mit Default auf aktuelle Zeit (UTC) für bestehende Zeilen
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "ALTER TABLE users ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP)"
-                    )
-
-                # ---- Tabelle 'refresh_tokens' prüfen ----
-                res = conn.exec_driver_sql("PRAGMA table_info('refresh_tokens')")
-                rt_cols = {row[1] for row in res.fetchall()}
-                if "token_digest" not in rt_cols:
-                    LOG.warning("db_auto_migrate_add_refresh_tokens_token_digest")
-                    # TEXT Spalte für Digest; NOT NULL mit leerem Default für bestehende Zeilen
-                    # (Unique-Constraint kann mit ALTER TABLE in SQLite nicht nachgerüstet werden)
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "ALTER TABLE refresh_tokens ADD COLUMN token_digest TEXT NOT NULL DEFAULT ''"
-                    )
-
-                # Legacy-Spalte 'token' entfernen, falls vorhanden (nur Nicht‑Prod):
-                # Ältere lokale DBs können eine NOT NULL Spalte 'token' enthalten, die zu
-                # INSERT-Fehlern führt, wenn nur 'token_digest' verwendet wird. In SQLite
-                # ist das Entfernen einer Spalte nur über Tabellenneuaufbau möglich.
-                res = conn.exec_driver_sql("PRAGMA table_info('refresh_tokens')")
-                rt_info = res.fetchall()
-                rt_cols_now = {row[1] for row in rt_info}
-                has_legacy_token = "token" in rt_cols_now
-                if has_legacy_token:
-                    LOG.warning("db_auto_migrate_rebuild_refresh_tokens_drop_legacy_token")
-                    # Tabelle neu aufbauen ohne 'token'. Unique Index auf token_digest wird
-                    # nach dem Copy angelegt.
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        """
-                        CREATE TABLE IF NOT EXISTS refresh_tokens__new
-                        (
-                            id
-                            INTEGER
-                            PRIMARY
-                            KEY,
-                            user_id
-                            INTEGER
-                            NOT
-                            NULL,
-                            token_digest
-                            TEXT
-                            NOT
-                            NULL,
-                            expires_at
-                            DATETIME
-                            NOT
-                            NULL,
-                            created_at
-                            DATETIME
-                            NOT
-                            NULL,
-                            revoked
-                            BOOLEAN
-                            NOT
-                            NULL
-                            DEFAULT
-                            0,
-                            FOREIGN
-                            KEY
-                        (
-                            user_id
-                        ) REFERENCES users
-                        (
-                            id
-                        )
-                            );
-                        """
-                    )
-                    # Bestehende Daten migrieren; token_digest leer lassen, falls unbekannt
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        """
-                        INSERT INTO refresh_tokens__new (id, user_id, token_digest, expires_at, created_at, revoked)
-                        SELECT id,
-                               user_id,
-                               CASE WHEN token_digest IS NOT NULL AND token_digest != '' THEN token_digest ELSE '' END,
-                               expires_at,
-                               created_at,
-                               revoked
-                        FROM refresh_tokens;
-                        """
-                    )
-                    # Alte Tabelle verwerfen und neue umbenennen
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("DROP TABLE refresh_tokens")
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE refresh_tokens__new RENAME TO refresh_tokens")
-                    # Unique Index auf token_digest absichern (falls nicht vorhanden)
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_digest ON refresh_tokens (token_digest)"
-                    )
+    # Versionierte Migrationen; bei aktuellem Schema nur ein Lesezugriff auf die Version
+    from .migrations import run_migrations  # lokaler Import: migrations importiert dieses Modul
 
-                # ---- Tabelle 'widgets' prüfen ----
-                res = conn.exec_driver_sql("PRAGMA table_info('widgets')")
-                w_cols = {row[1] for row in res.fetchall()}
-                if "product_key" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_product_key")
-                    # Nullable, da Feld optional ist
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "ALTER TABLE widgets ADD COLUMN product_key TEXT"
-                    )
-
-                # Weitere optionale Präsentationsspalten nachrüsten, falls sie fehlen (TEXT, nullable)
-                for col in ("version", "type", "title", "description", "image_url", "cta_label", "cta_target"):
-                    if col not in w_cols:
-                        LOG.warning("db_auto_migrate_add_widgets_col_%s", col)
-                        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                        # language=SQL, dialect=SQLite
-                        conn.exec_driver_sql(f"ALTER TABLE widgets ADD COLUMN {col} TEXT")
-
-                # JSON-ähnliche Felder (als TEXT in SQLite) nachrüsten
-                for col in ("payload", "visibility_rules"):
-                    if col not in w_cols:
-                        LOG.warning("db_auto_migrate_add_widgets_col_%s", col)
-                        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                        # language=SQL, dialect=SQLite
-                        conn.exec_driver_sql(f"ALTER TABLE widgets ADD COLUMN {col} TEXT")
-
-                # Numerische/Flag-Felder mit Defaults nachrüsten
-                if "priority" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_priority")
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE widgets ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
-
-                if "slot" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_slot")
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE widgets ADD COLUMN slot TEXT")
+    # Fehler brechen den Start in jeder Umgebung ab: ein halb migriertes Schema
+    # (z. B. fehlgeschlagenes `create_all`) scheitert sonst erst bei den ersten Requests
+    run_migrations(engine)
+    LOG.info("Database schema ready")
 
-                if "freshness_ttl" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_freshness_ttl")
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE widgets ADD COLUMN freshness_ttl INTEGER NOT NULL DEFAULT 0")
 
-                if "enabled" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_enabled")
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql("ALTER TABLE widgets ADD COLUMN enabled BOOLEAN NOT NULL DEFAULT 1")
+def ensure_indexes(bind) -> None:
+    """
+    Legt fehlende Indizes aller registrierten Tabellen an.
 
-                if "created_at" not in w_cols:
-                    LOG.warning("db_auto_migrate_add_widgets_created_at")
-                    # NOT NULL mit Default auf aktuelle Zeit (UTC) für bestehende Zeilen
-                    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
-                    # language=SQL, dialect=SQLite
-                    conn.exec_driver_sql(
-                        "ALTER TABLE widgets ADD COLUMN created_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP)"
-                    )
-    except Exception as exc:  # pragma: no cover - Migration darf init nicht verhindern
-        LOG.warning("db_sqlite_auto_migrate_failed", exc_info=exc)
-    LOG.info("Database schema ready")
+    `create_all` erzeugt Indizes nur zusammen mit neuen Tabellen; bestehende
+    Datenbanken (SQLite/Postgres) erhalten neu hinzugekommene Indizes erst hierüber.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
 
 
 def get_session():
@@ -317,3 +355,14 @@ def get_session():
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Stellt eine `AsyncSession` als Dependency zur Verfügung.
+
+    Für Async-Routen: DB-Wartezeit belegt keinen Slot des AnyIO-Threadpools.
+    `expire_on_commit=False`, da implizites Nachladen (Lazy-Load) in Async nicht möglich ist.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
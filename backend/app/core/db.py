@@ -11,6 +11,7 @@ from typing import Optional, Union
 from sqlalchemy.engine import Connection, Engine
 from sqlmodel import SQLModel
 from .database import engine as app_engine
+from .database import ensure_indexes
 
 
 EngineLike = Union[Engine, Connection]
@@ -18,7 +19,7 @@ EngineLike = Union[Engine, Connection]
 
 def init_db(engine: Optional[EngineLike] = None) -> None:
     """
-    Erzeugt alle von SQLModel-Modellen definierten Tabellen.
+    Erzeugt alle von SQLModel-Modellen definierten Tabellen und fehlende Indizes.
 
     Args:
         engine: Optional. Falls nicht angegeben, wird die Anwendungs-Engine verwendet.
@@ -26,3 +27,4 @@ def init_db(engine: Optional[EngineLike] = None) -> None:
 
     target: EngineLike = engine or app_engine  # type: ignore[assignment]
     SQLModel.metadata.create_all(target)
+    ensure_indexes(target)
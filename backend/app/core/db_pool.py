@@ -0,0 +1,186 @@
+"""
+Connection-Pool-Konfiguration und -Metriken für die DB-Engine.
+
+Sizing: `DB_POOL_SIZE + DB_MAX_OVERFLOW` sollte die Zahl gleichzeitig DB-nutzender
+Threads (AnyIO-Threadpool, Default 40) abdecken; sonst warten Handler auf eine
+Verbindung. Die `AsyncEngine` hat einen eigenen Pool (`DB_ASYNC_POOL_SIZE`,
+`DB_ASYNC_MAX_OVERFLOW`); je Worker können beide Pools gleichzeitig voll sein, die
+Summe muss unter dem Verbindungslimit der Datenbank bleiben. Genau das machen die
+Metriken sichtbar:
+
+- Event-Listener (`connect`, `checkout`, `checkin`, `invalidate`): Checkouts,
+  aktuell ausgeliehene Verbindungen, Spitzenwert des Overflows, Invalidierungen.
+- `InstrumentedQueuePool`: Wartezeit bis zum Erhalt einer Verbindung (Histogramm)
+  und Pool-Timeouts. Einen "vor dem Checkout"-Event gibt es nicht, daher misst der
+  Pool selbst um `_do_get` herum.
+
+In-Memory-SQLite nutzt weiterhin den SQLAlchemy-Default-Pool (nur Event-Metriken).
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from .config import settings
+from .logging_config import get_logger
+
+LOG = get_logger("infrastructure.db_pool")
+
+# Obergrenzen der Wartezeit-Buckets in Millisekunden (letzter Bucket: darüber)
+WAIT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Momentaufnahme der Pool-Metriken."""
+
+    checkouts: int
+    checked_out: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    peak_overflow: int
+    wait_count: int
+    wait_total_ms: float
+    # Anzahl Wartezeiten je Bucket (<= WAIT_BUCKETS_MS[i]); letzter Eintrag: darüber
+    wait_histogram: tuple[int, ...]
+
+
+class PoolMetrics:
+    """Thread-sichere Zähler, gespeist von Pool-Events und `InstrumentedQueuePool`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._checked_out = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._timeouts = 0
+        self._peak_overflow = 0
+        self._wait_total_ms = 0.0
+        self._wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self._wait_total_ms += wait_ms
+            self._wait_histogram[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def record_checkout(self, overflow: int) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._checked_out += 1
+            self._peak_overflow = max(self._peak_overflow, overflow)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                checkouts=self._checkouts,
+                checked_out=self._checked_out,
+                connects=self._connects,
+                invalidations=self._invalidations,
+                timeouts=self._timeouts,
+                peak_overflow=self._peak_overflow,
+                wait_count=sum(self._wait_histogram),
+                wait_total_ms=round(self._wait_total_ms, 3),
+                wait_histogram=tuple(self._wait_histogram),
+            )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """`QueuePool`, der die Wartezeit je Verbindungsanforderung und Timeouts erfasst."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            LOG.warning(
+                "db_pool_timeout",
+                extra={"pool_size": self.size(), "overflow": self.overflow(), "timeout_s": self._timeout},
+            )
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait((time.perf_counter() - started) * 1000)
+        return entry
+
+    def recreate(self) -> QueuePool:
+        # dispose()/Invalidierung erzeugt einen neuen Pool: Metriken weiterreichen
+        pool = super().recreate()
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Asyncio-Variante (`AsyncEngine`) mit denselben Wartezeit-/Timeout-Metriken."""
+
+
+def pool_options(url: str, *, asyncio: bool = False) -> dict[str, Any]:
+    """
+    Liefert die `create_engine`-Argumente für den Pool gemäß Settings.
+
+    In-Memory-SQLite behält den SQLAlchemy-Default (eine Verbindung je Thread/Prozess),
+    SQLite-Dateien erhalten Größe/Overflow/Timeout, Server-Datenbanken zusätzlich
+    `pool_pre_ping` und `pool_recycle`. `asyncio=True` wählt Pool-Klasse und Größe
+    (`DB_ASYNC_*`) für `create_async_engine`.
+    """
+    if url.startswith("sqlite"):
+        database = url.partition("://")[2].lstrip("/")
+        if database in ("", ":memory:") or "mode=memory" in url:
+            return {}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if asyncio else InstrumentedQueuePool,
+        "pool_size": settings.DB_ASYNC_POOL_SIZE if asyncio else settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW if asyncio else settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if not url.startswith("sqlite"):
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+    return options
+
+
+def install_pool_metrics(engine: Engine) -> PoolMetrics:
+    """Registriert die Pool-Event-Listener der Engine und liefert deren Metriken."""
+    metrics = PoolMetrics()
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics = metrics
+
+    def _overflow() -> int:
+        current = engine.pool
+        return current.overflow() if isinstance(current, QueuePool) else 0
+
+    event.listen(engine, "connect", lambda _dbapi_conn, _record: metrics.record_connect())
+    event.listen(engine, "checkout", lambda _dbapi_conn, _record, _proxy: metrics.record_checkout(_overflow()))
+    event.listen(engine, "checkin", lambda _dbapi_conn, _record: metrics.record_checkin())
+    event.listen(engine, "invalidate", lambda _dbapi_conn, _record, _exc: metrics.record_invalidation())
+    return metrics
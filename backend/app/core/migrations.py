@@ -0,0 +1,332 @@
+"""
+Versionierte Schema-Migrationen.
+
+Die Schema-Version der Datenbank liegt in SQLite in `PRAGMA user_version`, in anderen
+Dialekten in der Tabelle `schema_version`. Beim Start wird nur diese Version gelesen;
+entspricht sie `DB_SCHEMA_VERSION`, entfällt jede weitere Introspektion.
+
+Ist die Datenbank älter, migriert genau ein Prozess unter einem Start-Lock
+(`flock` auf `<db>.migrate.lock` bzw. Postgres-Advisory-Lock); weitere Worker warten,
+lesen die Version erneut und überspringen die bereits erledigten Schritte.
+
+Schema-Änderungen: neuen Eintrag in `MIGRATIONS` anhängen und `DB_SCHEMA_VERSION`
+erhöhen. Migrationen müssen idempotent sein – die Version wird erst nach dem Schritt
+geschrieben, ein abgebrochener Lauf wiederholt ihn beim nächsten Start.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from .config import settings
+from .database import DB_SCHEMA_VERSION, ensure_indexes
+from .logging_config import get_logger
+
+try:  # POSIX; ohne fcntl (Windows) schützt nur der prozesslokale Lock
+    import fcntl
+except ImportError:  # pragma: no cover - plattformabhängig
+    fcntl = None  # type: ignore[assignment]
+
+LOG = get_logger("infrastructure.db_migrations")
+
+# Prozesslokaler Lock (In-Memory-SQLite, Plattformen ohne fcntl)
+_LOCAL_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Ein Migrationsschritt; `apply` läuft in einer Transaktion auf `conn`."""
+
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _create_tables(conn: Connection) -> None:
+    """Legt alle Tabellen der registrierten Modelle an und rüstet alte SQLite-Dateien nach."""
+    SQLModel.metadata.create_all(conn)
+    if conn.dialect.name == "sqlite" and settings.ENV != "prod":
+        _repair_legacy_sqlite_columns(conn)
+
+
+def _feed_indexes(conn: Connection) -> None:
+    """Legt die Feed-Indizes an; fehlende Legacy-Spalten werden vorher nachgerüstet."""
+    _create_tables(conn)
+    ensure_indexes(conn)
+
+
+def _repair_legacy_sqlite_columns(conn: Connection) -> None:
+    """
+    Leichte Auto-Migrationen für SQLite in Nicht-Prod: fehlende Spalten älterer lokaler
+    DB-Dateien nachrüsten und die Legacy-Spalte `refresh_tokens.token` entfernen.
+    """
+    # ---- Tabelle 'users' prüfen ----
+    res = conn.exec_driver_sql("PRAGMA table_info('users')")
+    cols = {row[1] for row in res.fetchall()}  # row[1] = name
+
+    # users.role
+    if "role" not in cols:
+        LOG.warning("db_auto_migrate_add_users_role")
+        # SQLite: ALTER TABLE ADD COLUMN mit Default
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql("ALTER TABLE users ADD COLUMN role TEXT NOT NULL DEFAULT 'common'")
+
+    # users.created_at / users.updated_at: NOT NULL, bestehende Zeilen erhalten die aktuelle Zeit
+    for col in ("created_at", "updated_at"):
+        if col not in cols:
+            LOG.warning("db_auto_migrate_add_users_col_%s", col)
+            _add_timestamp_column(conn, "users", col)
+
+    # ---- Tabelle 'refresh_tokens' prüfen ----
+    res = conn.exec_driver_sql("PRAGMA table_info('refresh_tokens')")
+    rt_cols = {row[1] for row in res.fetchall()}
+    if "token_digest" not in rt_cols:
+        LOG.warning("db_auto_migrate_add_refresh_tokens_token_digest")
+        # TEXT Spalte für Digest; NOT NULL mit leerem Default für bestehende Zeilen
+        # (Unique-Constraint kann mit ALTER TABLE in SQLite nicht nachgerüstet werden)
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql("ALTER TABLE refresh_tokens ADD COLUMN token_digest TEXT NOT NULL DEFAULT ''")
+
+    # Legacy-Spalte 'token' entfernen, falls vorhanden: Ältere lokale DBs können eine
+    # NOT NULL Spalte 'token' enthalten, die zu INSERT-Fehlern führt, wenn nur
+    # 'token_digest' verwendet wird. In SQLite ist das Entfernen einer Spalte nur über
+    # Tabellenneuaufbau möglich.
+    if "token" in rt_cols:
+        LOG.warning("db_auto_migrate_rebuild_refresh_tokens_drop_legacy_token")
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql(
+            """
+            CREATE TABLE IF NOT EXISTS refresh_tokens__new
+            (
+                id           INTEGER PRIMARY KEY,
+                user_id      INTEGER  NOT NULL,
+                token_digest TEXT     NOT NULL,
+                expires_at   DATETIME NOT NULL,
+                created_at   DATETIME NOT NULL,
+                revoked      BOOLEAN  NOT NULL DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            );
+            """
+        )
+        # Bestehende Daten migrieren; token_digest leer lassen, falls unbekannt
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql(
+            """
+            INSERT INTO refresh_tokens__new (id, user_id, token_digest, expires_at, created_at, revoked)
+            SELECT id,
+                   user_id,
+                   CASE WHEN token_digest IS NOT NULL AND token_digest != '' THEN token_digest ELSE '' END,
+                   expires_at,
+                   created_at,
+                   revoked
+            FROM refresh_tokens;
+            """
+        )
+        # Alte Tabelle verwerfen und neue umbenennen; Unique-Index auf token_digest absichern
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql("DROP TABLE refresh_tokens")
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql("ALTER TABLE refresh_tokens__new RENAME TO refresh_tokens")
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        # language=SQL, dialect=SQLite
+        conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_digest ON refresh_tokens (token_digest)"
+        )
+
+    # ---- Tabelle 'widgets' prüfen ----
+    res = conn.exec_driver_sql("PRAGMA table_info('widgets')")
+    w_cols = {row[1] for row in res.fetchall()}
+
+    # Optionale Präsentations- und JSON-ähnliche Felder (TEXT, nullable)
+    for col in (
+            "product_key", "version", "type", "title", "description", "image_url", "cta_label", "cta_target",
+            "payload", "visibility_rules", "slot",
+    ):
+        if col not in w_cols:
+            LOG.warning("db_auto_migrate_add_widgets_col_%s", col)
+            # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+            # language=SQL, dialect=SQLite
+            conn.exec_driver_sql(f"ALTER TABLE widgets ADD COLUMN {col} TEXT")
+
+    # Numerische/Flag-Felder mit Defaults
+    for col, ddl in (
+            ("priority", "INTEGER NOT NULL DEFAULT 0"),
+            ("freshness_ttl", "INTEGER NOT NULL DEFAULT 0"),
+            ("enabled", "BOOLEAN NOT NULL DEFAULT 1"),
+    ):
+        if col not in w_cols:
+            LOG.warning("db_auto_migrate_add_widgets_col_%s", col)
+            # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+            # language=SQL, dialect=SQLite
+            conn.exec_driver_sql(f"ALTER TABLE widgets ADD COLUMN {col} {ddl}")
+
+    if "created_at" not in w_cols:
+        LOG.warning("db_auto_migrate_add_widgets_col_created_at")
+        _add_timestamp_column(conn, "widgets", "created_at")
+
+
+def _add_timestamp_column(conn: Connection, table: str, col: str) -> None:
+    """
+    Fügt eine NOT-NULL-Zeitstempelspalte hinzu und setzt bestehende Zeilen auf die aktuelle Zeit.
+
+    SQLite erlaubt bei `ADD COLUMN` keinen nicht-konstanten Default (`CURRENT_TIMESTAMP`);
+    daher konstanter Platzhalter und anschließendes UPDATE im Speicherformat von SQLAlchemy.
+    """
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    # language=SQL, dialect=SQLite
+    conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {col} TIMESTAMP NOT NULL DEFAULT '1970-01-01 00:00:00.000000'")
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    # language=SQL, dialect=SQLite
+    # Nur Bezeichner aus dem Code (keine Benutzereingaben); Bezeichner sind nicht bindbar
+    conn.exec_driver_sql(f"UPDATE {table} SET {col} = strftime('%Y-%m-%d %H:%M:%f000', 'now')")  # noqa: S608
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "create_tables", _create_tables),
+    # Feed-Index (owner_id, enabled, priority, created_at, id) für bestehende Datenbanken
+    Migration(2, "feed_indexes", _feed_indexes),
+    # Der frühere `init_db` stempelte Nicht-Prod-SQLite-Dateien mit `user_version=1`, ohne
+    # die Spalten nachzurüsten; für diese Dateien die (idempotente) Reparatur nachholen
+    Migration(3, "repair_legacy_sqlite", _create_tables),
+)
+
+if MIGRATIONS[-1].version != DB_SCHEMA_VERSION:  # pragma: no cover - Programmierfehler
+    raise RuntimeError("DB_SCHEMA_VERSION must match the last entry of MIGRATIONS")
+
+
+def _uses_user_version(conn: Connection) -> bool:
+    return conn.dialect.name == "sqlite"
+
+
+def read_schema_version(conn: Connection) -> int:
+    """
+    Liest die Schema-Version (0 = unversionierte bzw. leere Datenbank).
+
+    Reiner Lesezugriff (kein DDL): Fehlt die Tabelle `schema_version`, gilt Version 0;
+    angelegt wird sie erst unter dem Start-Lock (`_ensure_version_table`).
+    """
+    if _uses_user_version(conn):
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    return int(conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").scalar() or 0)
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    if _uses_user_version(conn):
+        return
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+
+
+def _write_schema_version(conn: Connection, version: int) -> None:
+    if _uses_user_version(conn):
+        # PRAGMA akzeptiert keine Bind-Parameter; `version` ist stets ein int
+        # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+        conn.exec_driver_sql(f"PRAGMA user_version={int(version)}")
+        return
+
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    conn.exec_driver_sql("DELETE FROM schema_version")
+    # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+    conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": version})
+
+
+@contextmanager
+def _migration_lock(engine: Engine) -> Iterator[None]:
+    """
+    Start-Lock, damit genau ein Worker migriert.
+
+    SQLite-Datei: `flock` auf `<db>.migrate.lock` (Worker desselben Hosts).
+    Postgres: Session-Advisory-Lock (auch über Hosts hinweg).
+    Sonst (In-Memory-SQLite, ohne fcntl): prozesslokaler Lock.
+    """
+    database = engine.url.database or ""
+    if engine.dialect.name == "sqlite" and database not in ("", ":memory:") and fcntl is not None:
+        lock_path = Path(f"{database}.migrate.lock")
+        with lock_path.open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        return
+
+    if engine.dialect.name == "postgresql":
+        key = int.from_bytes(hashlib.sha256(b"homewidget:migrate").digest()[:8], "big", signed=True)
+        with engine.connect() as lock_conn:
+            # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+            lock_conn.exec_driver_sql(f"SELECT pg_advisory_lock({key})")
+            try:
+                yield
+            finally:
+                # noinspection SqlDialectInspection,SqlNoDataSourceInspection
+                lock_conn.exec_driver_sql(f"SELECT pg_advisory_unlock({key})")
+        return
+
+    with _LOCAL_LOCK:
+        yield
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Bringt das Schema auf `DB_SCHEMA_VERSION`.
+
+    Fast Path: Ist die Datenbank aktuell, wird nur die Version gelesen – ohne Lock und
+    ohne Tabellen-Introspektion. Sonst werden die ausstehenden Schritte unter dem
+    Start-Lock ausgeführt, je Schritt in einer eigenen Transaktion inkl. Versionsstand.
+
+    Returns:
+        Anzahl ausgeführter Migrationsschritte (0 = Schema war aktuell).
+    """
+    with engine.connect() as conn:
+        current = read_schema_version(conn)
+        conn.commit()
+    if current >= DB_SCHEMA_VERSION:
+        if current > DB_SCHEMA_VERSION:
+            LOG.warning("db_schema_newer_than_code", extra={"db_version": current, "code_version": DB_SCHEMA_VERSION})
+        return 0
+
+    started = time.monotonic()
+    applied = 0
+    with _migration_lock(engine):
+        with engine.begin() as conn:
+            _ensure_version_table(conn)
+        for migration in MIGRATIONS:
+            with engine.begin() as conn:
+                # Erneut lesen: ein anderer Worker kann während des Wartens migriert haben
+                if read_schema_version(conn) >= migration.version:
+                    continue
+                migration.apply(conn)
+                _write_schema_version(conn, migration.version)
+            applied += 1
+            LOG.info("db_migration_applied", extra={"version": migration.version, "migration": migration.name})
+
+    LOG.info(
+        "db_migrations_done",
+        extra={
+            "from_version": current,
+            "to_version": DB_SCHEMA_VERSION,
+            "applied": applied,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2),
+        },
+    )
+    return applied
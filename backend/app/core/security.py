@@ -22,16 +22,18 @@ from argon2.exceptions import VerifyMismatchError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.services.token.blacklist import is_access_token_blacklisted
+from app.services.token.claims_cache import get_claims_cache
 from .config import settings
-from .database import get_session
+from .database import get_async_session
 from .logging_config import user_id_var
 from .types.token import ACCESS, REFRESH
 
 if TYPE_CHECKING:  # pragma: no cover
-    from ..models.user import User
+    from ..services.identity_cache import UserIdentity
 
 ph = PasswordHasher()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -108,16 +110,28 @@ def compute_refresh_token_digest(token: str) -> str:
     return hmac.new(key, msg=msg, digestmod=hashlib.sha256).hexdigest()
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        session: Session = Depends(get_session),
-) -> "User":
-    # Strikte Ablehnung von Tokens mit führenden/trailing Leerzeichen
-    if token != token.strip():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
+async def _verified_access_claims(token: str) -> dict[str, Any]:
+    """
+    Liefert die verifizierten Claims eines Access-Tokens (Signatur, Typ, Payload, Blacklist).
+
+    Treffer im Claims-Cache überspringen die Dekodierung; Logout entfernt den Eintrag
+    sofort (siehe `blacklist_access_token`).
+
+    Raises:
+        HTTPException: 401 bei ungültigem oder gesperrtem Token.
+    """
+    cache = get_claims_cache()
+    cached = cache.get(token)
+    if cached is not None:
+        # Blacklist trotzdem prüfen (Logout in anderem Worker); kostet dank Negativ-Filter
+        # im Regelfall keinen Backend-Lookup
+        if await is_access_token_blacklisted(cached["jti"]):
+            cache.revoke_jti(cached["jti"])
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+        return cached
 
     payload = decode_jwt(token)
     if not payload or payload.get("type") != ACCESS:
@@ -142,10 +156,42 @@ async def get_current_user(
             detail="Invalid token",
         )
 
+    cache.put(token, payload)
+    return payload
+
+
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        session: AsyncSession = Depends(get_async_session),
+) -> "UserIdentity":
+    """
+    Liefert den authentifizierten Benutzer als unveränderlichen Snapshot.
+
+    Der Snapshot kommt bevorzugt aus dem Identity-Cache; nur bei Miss wird die
+    `users`-Zeile gelesen – über die `AsyncSession`, ohne den Event-Loop zu blockieren.
+    Routen, die den Benutzer ändern, laden die Zeile selbst.
+    """
+    # Strikte Ablehnung von Tokens mit führenden/trailing Leerzeichen
+    if token != token.strip():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    email = (await _verified_access_claims(token))["sub"]
+
     # Lokaler Import, um Importreihenfolge-/Mapping-Probleme zu vermeiden
     from ..models.user import User  # type: ignore
+    from ..services.identity_cache import UserIdentity, get_identity_cache
+
+    identity_cache = get_identity_cache()
+    user = identity_cache.get(email)
+    if user is None:
+        db_user = (await session.exec(select(User).where(User.email == email))).first()
+        if db_user is not None:
+            user = UserIdentity.from_user(db_user)
+            identity_cache.put(user)
 
-    user = session.exec(select(User).where(User.email == email)).first()
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
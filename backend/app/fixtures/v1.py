@@ -3,11 +3,17 @@ Deterministische v1-Demo-Daten (Feed + Detail) als In-Memory-Fixtures.
 
 Diese Fixtures dienen als stabile Grundlage für Frontend/Swift/Deploy.
 Keine Random-/Zeitabhängigkeit; feste IDs, Zeiten und Reihenfolge.
+
+Da sich die Fixtures nie ändern, gibt es zusätzlich vorserialisierte JSON-Bytes
+(`get_feed_page_json`, `get_detail_json`) für Routen, die ohne Pydantic-Serialisierung
+direkt eine `Response` ausliefern.
 """
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 
+from ..homewidget.contracts.v1.cursor import FeedCursorV1, decode_cursor, seek_index, slice_page
 from ..homewidget.contracts.v1.widget_contracts import (
     ContentBlockV1,
     ContentSpecV1,
@@ -97,21 +103,50 @@ FIXTURE_DETAILS: dict[int, WidgetDetailV1] = {
 }
 
 
-def get_feed_page(cursor: int = 0, limit: int = 20) -> FeedPageV1:
-    if limit < 1:
-        limit = 1
-    if limit > 100:
-        limit = 100
-    if cursor < 0:
-        cursor = 0
+# Vorserialisierte Details (unveränderlich, daher einmalig beim Import)
+FIXTURE_DETAILS_JSON: dict[int, bytes] = {
+    widget_id: detail.model_dump_json().encode("utf-8") for widget_id, detail in FIXTURE_DETAILS.items()
+}
+
+
+def _clamp_limit(limit: int) -> int:
+    return min(max(limit, 1), 100)
 
+
+def get_feed_page(cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> FeedPageV1:
     # FIXTURE_FEED ist bereits in Zielreihenfolge
-    rows = FIXTURE_FEED[cursor: cursor + limit + 1]
-    has_more = len(rows) > limit
-    items = rows[:limit]
-    next_cursor = cursor + limit if has_more else None
-    return FeedPageV1(items=items, next_cursor=next_cursor)
+    return slice_page(FIXTURE_FEED, decode_cursor(cursor), _clamp_limit(limit))
+
+
+def get_feed_page_json(cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> bytes:
+    """
+    Liefert die Feed-Seite als fertige JSON-Bytes (identisch zu `get_feed_page`).
+
+    Cursor werden auf die Startposition in `FIXTURE_FEED` normalisiert; damit ist die
+    Menge möglicher Seiten endlich ((len + 1) × 100) und der Cache begrenzt, egal
+    welche Cursor Clients senden.
+
+    Raises:
+        ValueError: Bei ungültigem Cursor (siehe `decode_cursor`).
+    """
+    page_cursor = decode_cursor(cursor)
+    if page_cursor.after is None:
+        start = min(page_cursor.offset, len(FIXTURE_FEED))
+    else:
+        start = seek_index(FIXTURE_FEED, page_cursor.after)
+    return _feed_page_json(start, _clamp_limit(limit))
+
+
+@lru_cache(maxsize=None)
+def _feed_page_json(start: int, limit: int) -> bytes:
+    page = slice_page(FIXTURE_FEED, FeedCursorV1(offset=start), limit)
+    return page.model_dump_json().encode("utf-8")
 
 
 def get_detail(widget_id: int) -> WidgetDetailV1 | None:
     return FIXTURE_DETAILS.get(widget_id)
+
+
+def get_detail_json(widget_id: int) -> bytes | None:
+    """Liefert das vorserialisierte Detail oder None."""
+    return FIXTURE_DETAILS_JSON.get(widget_id)
@@ -0,0 +1,210 @@
+"""Cursor-Format für die Pagination des Feed v1.
+
+Der Feed ist nach (priority desc, created_at desc, id desc) sortiert. Ein Keyset-Cursor
+kodiert diesen Sortierschlüssel des letzten ausgelieferten Items; die nächste Seite
+beginnt beim ersten Item mit kleinerem Schlüssel. Damit kostet Seite N genauso viel
+wie Seite 1 und bleibt stabil, wenn zwischenzeitlich Items eingefügt werden.
+
+Format (opak für Clients): ``k1.<base64url(json[priority, created_at_iso, id])>``
+
+Kompatibilität: numerische Cursor (``"0"``, ``"20"`` bzw. int) werden weiterhin als
+Offset interpretiert. Ausgegeben wird ausschließlich das Keyset-Format.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Final
+
+from .widget_contracts import FeedPageV1, WidgetContractV1
+
+_KEYSET_PREFIX: Final[str] = "k1."
+
+SortKey = tuple[int, datetime, int]
+
+
+@dataclass(frozen=True)
+class FeedCursorV1:
+    """Dekodierter Cursor: entweder Offset oder Keyset (Sortierschlüssel des letzten Items)."""
+
+    offset: int = 0
+    after: SortKey | None = None
+
+
+def contract_sort_key(item: WidgetContractV1) -> SortKey:
+    """Sortierschlüssel gemäß Contract; naive Zeitstempel werden als UTC interpretiert."""
+    created_at = item.created_at.replace(tzinfo=UTC) if item.created_at.tzinfo is None else item.created_at
+    return item.priority, created_at, item.id
+
+
+def encode_cursor(item: WidgetContractV1) -> str:
+    """Erzeugt einen opaken Keyset-Cursor, der direkt hinter `item` fortsetzt."""
+    priority, created_at, item_id = contract_sort_key(item)
+    raw = json.dumps([priority, created_at.isoformat(), item_id], separators=(",", ":"))
+    return _KEYSET_PREFIX + base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(raw: FeedCursorV1 | str | int | None) -> FeedCursorV1:
+    """
+    Dekodiert einen Cursor aus dem Query-Parameter.
+
+    Args:
+        raw: Keyset-Cursor, numerischer Offset (int/str) oder None (Anfang).
+
+    Returns:
+        FeedCursorV1; negative Offsets werden auf 0 normalisiert.
+
+    Raises:
+        ValueError: Falls der Cursor weder Offset noch gültiger Keyset-Cursor ist.
+    """
+    if isinstance(raw, FeedCursorV1):
+        return raw
+    if raw is None or raw == "":
+        return FeedCursorV1()
+    if isinstance(raw, int):
+        return FeedCursorV1(offset=max(0, raw))
+
+    text = raw.strip()
+    if text.lstrip("-").isdigit():
+        return FeedCursorV1(offset=max(0, int(text)))
+
+    if not text.startswith(_KEYSET_PREFIX):
+        raise ValueError("invalid cursor")
+
+    payload = text.removeprefix(_KEYSET_PREFIX)
+    try:
+        decoded = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        priority, created_at_raw, item_id = json.loads(decoded)
+        created_at = datetime.fromisoformat(created_at_raw)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+    if not isinstance(priority, int) or not isinstance(item_id, int):
+        raise ValueError("invalid cursor")
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+
+    return FeedCursorV1(after=(priority, created_at, item_id))
+
+
+def seek_index(items_desc: Sequence[WidgetContractV1], after: SortKey) -> int:
+    """
+    Binäre Suche: Index des ersten Items, dessen Sortierschlüssel echt kleiner als `after` ist.
+
+    Args:
+        items_desc: Gemäß Contract absteigend sortierte Items.
+        after: Schlüssel des zuletzt ausgelieferten Items.
+    """
+    lo, hi = 0, len(items_desc)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if contract_sort_key(items_desc[mid]) < after:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def slice_page(items_desc: Sequence[WidgetContractV1], cursor: FeedCursorV1, limit: int) -> FeedPageV1:
+    """
+    Schneidet eine Seite aus einer bereits sortierten Folge.
+
+    Offset-Cursor springen per Index, Keyset-Cursor per binärer Suche. `next_cursor`
+    ist immer ein Keyset-Cursor auf das letzte Item der Seite.
+    """
+    start = cursor.offset if cursor.after is None else seek_index(items_desc, cursor.after)
+    return _build_page(items_desc[start: start + limit + 1], limit)
+
+
+def duplicate_best_keys(streams_desc: Sequence[Sequence[WidgetContractV1]]) -> dict[int, SortKey]:
+    """
+    Höchster Sortierschlüssel je ID, die mehrfach vorkommt (einmal je Provider-Snapshot).
+
+    Für eindeutige IDs entsteht kein Eintrag; `merge_page` prüft damit bei Keyset-Cursorn,
+    ob die gewinnende Kopie einer ID bereits auf einer früheren Seite lag.
+    """
+    best: dict[int, SortKey] = {}
+    duplicates: set[int] = set()
+    for stream in streams_desc:
+        for item in stream:
+            key = contract_sort_key(item)
+            kept = best.get(item.id)
+            if kept is None:
+                best[item.id] = key
+                continue
+            duplicates.add(item.id)
+            if key > kept:
+                best[item.id] = key
+    return {item_id: best[item_id] for item_id in duplicates}
+
+
+def merge_page(
+        streams_desc: Sequence[Sequence[WidgetContractV1]],
+        cursor: FeedCursorV1,
+        limit: int,
+        duplicates: Mapping[int, SortKey] | None = None,
+) -> FeedPageV1:
+    """
+    K-Wege-Merge mehrerer bereits sortierter Folgen (Heap) bis zur benötigten Seite.
+
+    Keyset-Cursor positionieren jede Folge per binärer Suche, Offset-Cursor überspringen
+    `offset` Items des Merges. Der Merge stoppt nach `offset + limit + 1` eindeutigen
+    Items; bei Keyset-Cursorn wachsen die Kosten mit der Seitengröße, nicht mit der
+    Position des Cursors. Duplikate (gleiche ID) werden übersprungen – es gewinnt das
+    Item, das in Contract-Reihenfolge zuerst kommt (höchster Schlüssel). Liegt diese
+    Kopie am bzw. vor dem Cursor (`duplicates[id] >= cursor.after`), wurde die ID auf
+    einer früheren Seite ausgeliefert und wird nicht erneut geliefert.
+
+    Args:
+        streams_desc: Je Provider gemäß Contract absteigend sortierte Items.
+        cursor: Dekodierter Cursor.
+        limit: Seitengröße.
+        duplicates: Ergebnis von `duplicate_best_keys` für dieselben Folgen; der Aufrufer
+            sollte es je Snapshot zwischenspeichern. None = bei Bedarf hier berechnen.
+    """
+    seen: set[int] = set()
+    after = cursor.after
+    if after is None:
+        iterators = [iter(stream) for stream in streams_desc]
+        to_skip = cursor.offset
+        delivered: Mapping[int, SortKey] = {}
+    else:
+        iterators = [_iter_from(stream, seek_index(stream, after)) for stream in streams_desc]
+        to_skip = 0
+        delivered = duplicates if duplicates is not None else duplicate_best_keys(streams_desc)
+
+    rows: list[WidgetContractV1] = []
+    for item in heapq.merge(*iterators, key=contract_sort_key, reverse=True):
+        if item.id in seen:
+            continue
+        seen.add(item.id)
+        best = delivered.get(item.id)
+        if best is not None and after is not None and best >= after:
+            # Gewinnende Kopie lag vor dem Cursor, also auf einer früheren Seite
+            continue
+        if to_skip > 0:
+            to_skip -= 1
+            continue
+        rows.append(item)
+        if len(rows) > limit:
+            break
+
+    return _build_page(rows, limit)
+
+
+def _iter_from(items: Sequence[WidgetContractV1], start: int) -> Iterator[WidgetContractV1]:
+    """Iteriert ab `start`, ohne die Folge zu kopieren."""
+    return (items[i] for i in range(start, len(items)))
+
+
+def _build_page(rows: Sequence[WidgetContractV1], limit: int) -> FeedPageV1:
+    """Baut eine Seite aus bis zu `limit + 1` Kandidaten (das Extra-Item signalisiert `has_more`)."""
+    has_more = len(rows) > limit
+    items_page = list(rows[:limit])
+    next_cursor = encode_cursor(items_page[-1]) if has_more else None
+    return FeedPageV1(items=items_page, next_cursor=next_cursor)
@@ -127,4 +127,5 @@ class FeedPageV1(BaseModel):
     """Seitenergebnis für den Feed v1."""
 
     items: list[WidgetContractV1]
-    next_cursor: int | None = None
+    # Opaker Keyset-Cursor (siehe contracts.v1.cursor); None = keine weitere Seite
+    next_cursor: str | None = None
@@ -3,6 +3,7 @@
 Ordner enthält:
 - base: Basisschnittstelle für Provider
 - aggregator: Aggregator, der mehrere Provider zusammenführt (fail-open)
+- result_cache: Ergebnis-Cache je Provider (Stale-While-Revalidate)
 - demo provider: einfache Demo-Provider, die stabile Widgets liefern
 """
 
@@ -10,5 +11,6 @@ from __future__ import annotations
 
 from .aggregator import ProvidersAggregator
 from .base import ProviderBase
+from .result_cache import ProviderResultCache
 
-__all__ = ["ProviderBase", "ProvidersAggregator"]
+__all__ = ["ProviderBase", "ProviderResultCache", "ProvidersAggregator"]
@@ -1,63 +1,394 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+import asyncio
+import contextvars
+import itertools
+import time
+from collections.abc import Awaitable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Annotated, Any, List
+
+from pydantic import Field, TypeAdapter, ValidationError
 
 from .base import ProviderBase
+from .result_cache import ProviderResultCache
+from ...core.config import settings
 from ...core.logging_config import get_logger
+from ..contracts.v1.cursor import (
+    FeedCursorV1,
+    SortKey,
+    contract_sort_key,
+    decode_cursor,
+    duplicate_best_keys,
+    merge_page,
+    slice_page,
+)
 from ..contracts.v1.widget_contracts import FeedPageV1, WidgetContractV1
 
 LOG = get_logger("providers.aggregator")
 
+# Eigener Pool für synchrone Provider: Ein hängender Provider belegt nur einen dieser
+# Threads und blockiert weder den AnyIO-Threadpool noch das Beenden des Event-Loops.
+_PROVIDER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.PROVIDER_MAX_WORKERS,
+    thread_name_prefix="feed-provider",
+)
+
+
+# Batch-Validierung einer kompletten Provider-Ausgabe in einem Aufruf; ungültige Items
+# bleiben als Rohwert erhalten (statt den ganzen Batch scheitern zu lassen)
+_CONTRACT_LIST: TypeAdapter[list[WidgetContractV1 | Any]] = TypeAdapter(
+    list[Annotated[WidgetContractV1 | Any, Field(union_mode="left_to_right")]]
+)
+
+
+class _ProviderTimeout(Exception):
+    """Provider hat Timeout bzw. Seiten-Deadline überschritten."""
+
+
+class _PageDeadline(_ProviderTimeout):
+    """Seiten-Deadline abgelaufen, bevor der Provider geliefert hat."""
+
 
 @dataclass
 class ProvidersAggregator:
     providers: List[ProviderBase]
+    # Default-Timeout je Provider und Gesamt-Deadline für das Laden einer Seite (Sekunden)
+    provider_timeout_seconds: float = field(default_factory=lambda: settings.PROVIDER_TIMEOUT_SECONDS)
+    page_deadline_seconds: float = field(default_factory=lambda: settings.FEED_PAGE_DEADLINE_SECONDS)
+    # Optionaler Ergebnis-Cache (Stale-While-Revalidate); None = Provider bei jedem Aufruf laden
+    result_cache: ProviderResultCache | None = None
+    # Duplikat-Index (`duplicate_best_keys`) des zuletzt gemergten Snapshots; die Folgen
+    # werden per Identität verglichen (Cache-Einträge bleiben bis zum Refresh dieselben Listen)
+    _duplicates: tuple[tuple[list[WidgetContractV1], ...], dict[int, SortKey]] | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def load_page(self, cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> FeedPageV1:
+        """
+        Synchroner Einstieg (Sync-Routen, Tests); Gegenstück zu `aload_page` ohne Event-Loop.
+
+        Provider ohne Cache-Treffer laufen als Aufträge im Provider-Pool (async Provider mit
+        eigenem Loop im Pool-Thread). Gewartet wird per `concurrent.futures.wait` bis zum
+        jeweils nächsten Provider-Timeout bzw. zur Seiten-Deadline; Überschreitungen sind
+        fail-open wie im async Pfad.
+        """
+        page_cursor, limit = _normalize_page_args(cursor, limit)
+        started = time.monotonic()
+        # Platzhalter; jeder Eintrag wird unten durch Cache, Ergebnis oder Timeout ersetzt
+        outcomes: list[list[WidgetContractV1] | Exception] = [_PageDeadline()] * len(self.providers)
+        futures: dict[Future[list[Any]], int] = {}
+        deadlines: dict[Future[list[Any]], float] = {}
+        for index, p in enumerate(self.providers):
+            cached = self._cached_items(p)
+            if cached is not None:
+                outcomes[index] = cached
+                continue
+            try:
+                future = self._submit_provider(p)
+            except RuntimeError as exc:  # Pool bereits heruntergefahren (Shutdown)
+                outcomes[index] = exc
+                continue
+            futures[future] = index
+            deadlines[future] = started + min(self._timeout_for(p), self.page_deadline_seconds)
+
+        pending = set(futures)
+        while pending:
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[futures[future]] = self._settle(self.providers[futures[future]], future)
+
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[f] <= now]:
+                pending.discard(future)
+                # Noch nicht gestartete Aufträge verwerfen; ein laufender endet im Hintergrund
+                future.cancel()
+                p = self.providers[futures[future]]
+                if self._timeout_for(p) < self.page_deadline_seconds:
+                    outcomes[futures[future]] = _ProviderTimeout(p.name)
+                else:
+                    outcomes[futures[future]] = _PageDeadline()
+
+        return self._assemble_page(outcomes, page_cursor, limit, started)
 
-    def load_page(self, cursor: int = 0, limit: int = 20) -> FeedPageV1:
-        # Parameter normalisieren
-        if limit < 1:
-            limit = 1
-        if limit > 100:
-            limit = 100
-        if cursor < 0:
-            cursor = 0
-
-        all_items: list[WidgetContractV1] = []
-        for p in self.providers:
+    async def aload_page(self, cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> FeedPageV1:
+        """
+        Lädt alle Provider nebenläufig und liefert eine Seite gemäß Contract-Sortierung.
+
+        Fail-open: Fehler, Timeouts (`provider_timeout`) und das Überschreiten der
+        Seiten-Deadline betreffen nur den jeweiligen Provider. Mit `result_cache` werden
+        zwischengespeicherte Ergebnisse ohne Provider-Aufruf übernommen.
+
+        Deklarieren alle gelieferten Provider `sorted_output`, wird per K-Wege-Merge nur
+        bis zur angefragten Seite gemischt; sonst global dedupliziert und sortiert.
+        """
+        page_cursor, limit = _normalize_page_args(cursor, limit)
+
+        started = time.monotonic()
+        tasks = [asyncio.create_task(self._provider_items(p)) for p in self.providers]
+        _done, pending = await asyncio.wait(tasks, timeout=self.page_deadline_seconds) if tasks else (set(), set())
+
+        for task in pending:
+            task.cancel()
+
+        outcomes: list[list[WidgetContractV1] | Exception] = []
+        for task in tasks:
+            if task in pending:
+                outcomes.append(_PageDeadline())
+                continue
             try:
-                raw_items = p.load_items()
-                # Strenge Validierung gegen den Contract: Ungültige Widgets droppen
-                valid_items = []
-                for raw in raw_items:
-                    try:
-                        valid_items.append(WidgetContractV1.model_validate(raw))
-                    except Exception as ve:
-                        LOG.error("widget_validation_failed", extra={"provider": p.name, "error": str(ve)})
-
-                LOG.info("provider_ok", extra={"provider": p.name, "count": len(valid_items), "dropped": len(raw_items) - len(valid_items)})
-                all_items.extend(valid_items)
-            except Exception as exc:  # noqa: BLE001
-                LOG.warning("provider_failed", extra={"provider": p.name, "error": str(exc)})
-
-        # Deduplizieren nach ID (letzter gewinnt)
-        by_id: dict[int, WidgetContractV1] = {}
-        for it in all_items:
-            by_id[it.id] = it
-
-        merged: list[WidgetContractV1] = list(by_id.values())
-
-        # Sortierung analog Contract: priority desc, created_at desc, id desc
-        merged.sort(key=lambda x: (x.priority, x.created_at, x.id), reverse=True)
-
-        rows = merged[cursor: cursor + limit + 1]
-        has_more = len(rows) > limit
-        items_page = rows[:limit]
-        next_cursor = cursor + limit if has_more else None
+                outcomes.append(task.result())
+            except Exception as exc:  # noqa: BLE001  # Auswertung in `_assemble_page`
+                outcomes.append(exc)
+
+        return self._assemble_page(outcomes, page_cursor, limit, started)
+
+    def _assemble_page(
+            self,
+            outcomes: list[list[WidgetContractV1] | Exception],
+            page_cursor: FeedCursorV1,
+            limit: int,
+            started: float,
+    ) -> FeedPageV1:
+        """Protokolliert Provider-Fehler und baut die Seite aus den Ergebnissen (Provider-Reihenfolge)."""
+        streams: list[list[WidgetContractV1]] = []
+        all_sorted = True
+        # Ergebnisse in Provider-Reihenfolge übernehmen (deterministische Deduplizierung)
+        for p, outcome in zip(self.providers, outcomes):
+            if isinstance(outcome, _PageDeadline):
+                LOG.warning(
+                    "provider_timeout",
+                    extra={"provider": p.name, "reason": "page_deadline", "deadline_s": self.page_deadline_seconds},
+                )
+            elif isinstance(outcome, _ProviderTimeout):
+                LOG.warning(
+                    "provider_timeout",
+                    extra={"provider": p.name, "reason": "provider_timeout", "timeout_s": self._timeout_for(p)},
+                )
+            elif isinstance(outcome, Exception):
+                LOG.warning("provider_failed", extra={"provider": p.name, "error": str(outcome)})
+            else:
+                streams.append(outcome)
+                all_sorted = all_sorted and p.sorted_output
+
+        stats: dict[str, Any]
+        if all_sorted:
+            # Alle Provider liefern in Contract-Reihenfolge: K-Wege-Merge nur bis zur Seite
+            duplicates = self._duplicates_for(streams) if page_cursor.after is not None else None
+            page = merge_page(streams, page_cursor, limit, duplicates)
+            stats = {"mode": "merge"}
+        else:
+            # Deduplizieren nach ID wie im Merge: die Kopie mit dem höchsten Sortierschlüssel
+            # gewinnt, bei Gleichstand die des früheren Providers
+            by_id: dict[int, WidgetContractV1] = {}
+            for stream in streams:
+                for it in stream:
+                    kept = by_id.get(it.id)
+                    if kept is None or contract_sort_key(it) > contract_sort_key(kept):
+                        by_id[it.id] = it
+
+            merged: list[WidgetContractV1] = list(by_id.values())
+
+            # Sortierung analog Contract: priority desc, created_at desc, id desc
+            merged.sort(key=contract_sort_key, reverse=True)
+
+            page = slice_page(merged, page_cursor, limit)
+            stats = {"mode": "sort", "total": len(merged)}
 
         LOG.info(
             "aggregator_delivered",
-            extra={"providers": [p.name for p in self.providers], "total": len(merged), "page_count": len(items_page)},
+            extra={
+                "providers": [p.name for p in self.providers],
+                **stats,
+                "page_count": len(page.items),
+                "duration_ms": round((time.monotonic() - started) * 1000, 2),
+            },
         )
 
-        return FeedPageV1(items=items_page, next_cursor=next_cursor)
+        return page
+
+    def _duplicates_for(self, streams: list[list[WidgetContractV1]]) -> dict[int, SortKey]:
+        """Duplikat-Index je Provider-Snapshot; wird nur bei geänderten Folgen neu berechnet."""
+        cached = self._duplicates
+        if cached is not None and len(cached[0]) == len(streams) and all(a is b for a, b in zip(cached[0], streams)):
+            return cached[1]
+        duplicates = duplicate_best_keys(streams)
+        self._duplicates = (tuple(streams), duplicates)
+        return duplicates
+
+    def _timeout_for(self, provider: ProviderBase) -> float:
+        return provider.timeout_seconds if provider.timeout_seconds is not None else self.provider_timeout_seconds
+
+    async def _provider_items(self, provider: ProviderBase) -> list[WidgetContractV1]:
+        """
+        Liefert die validierten Items eines Providers, bevorzugt aus dem Ergebnis-Cache.
+
+        Veraltete Einträge werden sofort ausgeliefert und im Hintergrund erneuert; nur
+        ohne Cache-Eintrag liegt der Provider-Aufruf auf dem Request-Pfad.
+        """
+        cached = self._cached_items(provider)
+        if cached is not None:
+            return cached
+
+        items = self._validate(provider, await self._load_provider(provider))
+        if self.result_cache is not None:
+            self.result_cache.store(provider.name, items)
+        return items
+
+    def _cached_items(self, provider: ProviderBase) -> list[WidgetContractV1] | None:
+        """Cache-Treffer (frisch oder veraltet, dann mit Hintergrund-Refresh) oder None."""
+        cache = self.result_cache
+        entry = cache.get(provider.name) if cache is not None else None
+        if cache is None or entry is None:
+            return None
+
+        stale = not cache.is_fresh(entry)
+        if stale:
+            self._schedule_refresh(provider, cache)
+        LOG.debug("provider_cache_hit", extra={"provider": provider.name, "stale": stale})
+        return entry.items
+
+    def _submit_provider(self, provider: ProviderBase) -> Future[list[Any]]:
+        """Startet einen Provider im Provider-Pool (async Provider mit Timeout im eigenen Loop)."""
+        ctx = contextvars.copy_context()
+        if provider.is_async:
+            return _PROVIDER_EXECUTOR.submit(ctx.run, _run_async_provider, provider, self._timeout_for(provider))
+        return _PROVIDER_EXECUTOR.submit(ctx.run, provider.load_items)
+
+    def _settle(self, provider: ProviderBase, future: Future[list[Any]]) -> list[WidgetContractV1] | Exception:
+        """Validiert das Ergebnis eines abgeschlossenen Pool-Auftrags und legt es im Cache ab."""
+        try:
+            items = self._validate(provider, future.result())
+        except TimeoutError:
+            return _ProviderTimeout(provider.name)
+        except Exception as exc:  # noqa: BLE001  # Auswertung in `_assemble_page`
+            return exc
+        if self.result_cache is not None:
+            self.result_cache.store(provider.name, items)
+        return items
+
+    def _schedule_refresh(self, provider: ProviderBase, cache: ProviderResultCache) -> None:
+        """Startet höchstens einen Hintergrund-Refresh je Provider im Provider-Pool."""
+        if not cache.try_begin_refresh(provider.name):
+            return
+
+        ctx = contextvars.copy_context()
+        try:
+            _PROVIDER_EXECUTOR.submit(ctx.run, self._refresh_blocking, provider, cache)
+        except RuntimeError:
+            # Pool bereits heruntergefahren (Shutdown) – Reservierung freigeben
+            cache.end_refresh(provider.name)
+
+    def _refresh_blocking(self, provider: ProviderBase, cache: ProviderResultCache) -> None:
+        """
+        Lädt einen Provider neu; bei Fehlern bleibt der letzte gute Stand im Cache.
+
+        Beide Provider-Arten unterliegen `_timeout_for`: Sync-Provider laufen als eigener
+        Auftrag im Provider-Pool, auf den hier mit Timeout gewartet wird. Ein hängender
+        Provider gibt damit die Refresh-Reservierung frei, statt sie dauerhaft zu halten.
+        """
+        started = time.monotonic()
+        timeout = self._timeout_for(provider)
+        try:
+            if provider.is_async:
+                raw_items = _run_async_provider(provider, timeout)
+            else:
+                ctx = contextvars.copy_context()
+                future = _PROVIDER_EXECUTOR.submit(ctx.run, provider.load_items)
+                try:
+                    raw_items = future.result(timeout=timeout)
+                except TimeoutError:
+                    # Noch nicht gestartete Aufträge verwerfen; ein laufender endet im Hintergrund
+                    future.cancel()
+                    raise
+            cache.store(provider.name, self._validate(provider, raw_items))
+            LOG.info(
+                "provider_refreshed",
+                extra={"provider": provider.name, "duration_ms": round((time.monotonic() - started) * 1000, 2)},
+            )
+        except TimeoutError:
+            LOG.warning("provider_timeout", extra={"provider": provider.name, "reason": "refresh", "timeout_s": timeout})
+        except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: letzter guter Stand bleibt aktiv
+            LOG.warning("provider_refresh_failed", extra={"provider": provider.name, "error": str(exc)})
+        finally:
+            cache.end_refresh(provider.name)
+
+    async def _load_provider(self, provider: ProviderBase) -> list[Any]:
+        """Lädt einen Provider mit eigenem Timeout (async direkt, sync im Provider-Pool)."""
+        call: Awaitable[list[Any]]
+        if provider.is_async:
+            call = provider.aload_items()
+        else:
+            ctx = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(_PROVIDER_EXECUTOR, ctx.run, provider.load_items)
+
+        try:
+            return await asyncio.wait_for(call, timeout=self._timeout_for(provider))
+        except TimeoutError as exc:
+            raise _ProviderTimeout(provider.name) from exc
+
+    @staticmethod
+    def _validate(provider: ProviderBase, raw_items: list[Any]) -> list[WidgetContractV1]:
+        # Strenge Validierung gegen den Contract: Ungültige Widgets droppen
+        valid_items, errors = _validate_batch(raw_items)
+        for index, error in errors:
+            LOG.error("widget_validation_failed", extra={"provider": provider.name, "index": index, "error": error})
+
+        if provider.sorted_output and not _is_sorted_desc(valid_items):
+            # Zusage verletzt: einmalig beim Laden sortieren, damit der Merge korrekt bleibt
+            LOG.warning("provider_unsorted", extra={"provider": provider.name})
+            valid_items.sort(key=contract_sort_key, reverse=True)
+
+        LOG.info("provider_ok", extra={"provider": provider.name, "count": len(valid_items), "dropped": len(raw_items) - len(valid_items)})
+        return valid_items
+
+
+def _normalize_page_args(cursor: FeedCursorV1 | str | int | None, limit: int) -> tuple[FeedCursorV1, int]:
+    """Dekodiert den Cursor und begrenzt `limit` auf 1..100."""
+    return decode_cursor(cursor), max(1, min(limit, 100))
+
+
+def _run_async_provider(provider: ProviderBase, timeout: float) -> list[Any]:
+    """Führt einen async Provider in einem Pool-Thread mit eigenem Event-Loop aus."""
+    return asyncio.run(asyncio.wait_for(provider.aload_items(), timeout=timeout))
+
+
+def _validate_batch(raw_items: list[Any]) -> tuple[list[WidgetContractV1], list[tuple[int, str]]]:
+    """
+    Validiert eine Provider-Ausgabe en bloc über einen Listen-`TypeAdapter`.
+
+    Der Adapter versucht je Item den Contract und fällt bei Fehlern auf den Rohwert
+    zurück (`left_to_right`-Union mit `Any`), sodass ein einziger Aufruf genügt.
+    Bereits konstruierte `WidgetContractV1`-Instanzen werden nicht revalidiert. Nur
+    für die (seltenen) ungültigen Items wird die Fehlermeldung einzeln ermittelt.
+
+    Returns:
+        (gültige Items in Eingangsreihenfolge, [(Index, Fehlertext)] der verworfenen Items)
+    """
+    if not isinstance(raw_items, (list, tuple)):
+        raise TypeError(f"Provider lieferte {type(raw_items).__name__} statt list")
+
+    validated = _CONTRACT_LIST.validate_python(raw_items)
+    valid_items = [it for it in validated if isinstance(it, WidgetContractV1)]
+    if len(valid_items) == len(validated):
+        return valid_items, []
+
+    errors: list[tuple[int, str]] = []
+    for index, it in enumerate(validated):
+        if isinstance(it, WidgetContractV1):
+            continue
+        try:
+            WidgetContractV1.model_validate(it)
+            errors.append((index, "invalid widget"))
+        except ValidationError as ve:
+            errors.append((index, str(ve)))
+    return valid_items, errors
+
+
+def _is_sorted_desc(items: list[WidgetContractV1]) -> bool:
+    """Prüft die Contract-Reihenfolge (absteigend) in O(n)."""
+    keys = [contract_sort_key(it) for it in items]
+    return all(a >= b for a, b in itertools.pairwise(keys))
@@ -11,8 +11,20 @@ class ProviderBase(ABC):
 
     Provider liefern eine Liste von ``WidgetContractV1`` Items. Der Aggregator
     übernimmt Sortierung und Pagination.
+
+    Synchrone Provider implementieren ``load_items``; der Aggregator führt sie in
+    einem eigenen Thread-Pool parallel aus. Provider mit echter (async) I/O
+    überschreiben zusätzlich ``aload_items`` und laufen dann direkt im Event-Loop.
     """
 
+    # Optionales Timeout (Sekunden) je Provider; None = Aggregator-Default
+    timeout_seconds: float | None = None
+
+    # True: ``load_items`` liefert bereits in Contract-Reihenfolge
+    # (priority desc, created_at desc, id desc). Der Aggregator mischt dann per
+    # K-Wege-Merge statt global zu sortieren.
+    sorted_output: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str:  # pragma: no cover - trivial
@@ -26,3 +38,12 @@ class ProviderBase(ABC):
         fail-open ab und loggt.
         """
         raise NotImplementedError
+
+    @property
+    def is_async(self) -> bool:
+        """True, wenn der Provider eine eigene async-Implementierung mitbringt."""
+        return type(self).aload_items is not ProviderBase.aload_items
+
+    async def aload_items(self) -> List[WidgetContractV1]:
+        """Async-Variante von ``load_items`` (Default: synchron, vom Aggregator im Thread-Pool ausgeführt)."""
+        return self.load_items()
@@ -8,6 +8,9 @@ from ..contracts.v1.widget_contracts import WidgetContractV1
 
 
 class MobilePlansProvider(ProviderBase):
+    # Items werden bereits in Contract-Reihenfolge geliefert
+    sorted_output = True
+
     @property
     def name(self) -> str:  # pragma: no cover - trivial
         return "mobile_plans"
@@ -15,6 +18,6 @@ class MobilePlansProvider(ProviderBase):
     def load_items(self) -> List[WidgetContractV1]:
         base = datetime(2024, 2, 1, 8, 0, 0, tzinfo=timezone.utc)
         return [
-            WidgetContractV1(id=2001, name="Tarif M", priority=20, created_at=base + timedelta(days=2)),
             WidgetContractV1(id=2002, name="Tarif L", priority=25, created_at=base + timedelta(days=3)),
+            WidgetContractV1(id=2001, name="Tarif M", priority=20, created_at=base + timedelta(days=2)),
         ]
@@ -0,0 +1,75 @@
+"""Provider-Ergebnis-Cache mit Stale-While-Revalidate.
+
+Einträge werden je Provider-Name gehalten und enthalten bereits validierte
+``WidgetContractV1`` Items.
+
+- frisch (Alter < ``fresh_seconds``): direkt ausliefern, kein Provider-Aufruf.
+- veraltet: trotzdem ausliefern; genau ein Hintergrund-Refresh pro Provider läuft.
+- Refresh-Fehler: der letzte gute Stand bleibt erhalten und wird weiter ausgeliefert.
+
+Der Cache ist prozesslokal und thread-sicher (Zugriffe aus Request-Threads und dem
+Provider-Pool).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from ..contracts.v1.widget_contracts import WidgetContractV1
+
+
+@dataclass(frozen=True)
+class CachedProviderResult:
+    """Letztes gutes Ergebnis eines Providers inkl. Ladezeitpunkt (monotonic)."""
+
+    items: list[WidgetContractV1]
+    fetched_at: float
+
+
+class ProviderResultCache:
+    """
+    Thread-sicherer Cache für Provider-Ergebnisse, Schlüssel ist ``ProviderBase.name``.
+
+    Args:
+        fresh_seconds: Frischefenster in Sekunden.
+        clock: Zeitquelle (für Tests übersteuerbar). Default: ``time.monotonic``.
+    """
+
+    def __init__(self, fresh_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.fresh_seconds = fresh_seconds
+        self._clock = clock
+        self._entries: dict[str, CachedProviderResult] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CachedProviderResult | None:
+        """Liefert den letzten guten Stand (frisch oder veraltet) oder None."""
+        with self._lock:
+            return self._entries.get(name)
+
+    def is_fresh(self, entry: CachedProviderResult) -> bool:
+        return self._clock() - entry.fetched_at < self.fresh_seconds
+
+    def store(self, name: str, items: list[WidgetContractV1]) -> None:
+        """Speichert ein erfolgreich geladenes und validiertes Ergebnis."""
+        with self._lock:
+            self._entries[name] = CachedProviderResult(items=list(items), fetched_at=self._clock())
+
+    def try_begin_refresh(self, name: str) -> bool:
+        """Reserviert den Hintergrund-Refresh für `name`; False, falls bereits einer läuft."""
+        with self._lock:
+            if name in self._refreshing:
+                return False
+            self._refreshing.add(name)
+            return True
+
+    def end_refresh(self, name: str) -> None:
+        with self._lock:
+            self._refreshing.discard(name)
+
+    def clear(self) -> None:
+        """Verwirft alle Einträge (z. B. in Tests)."""
+        with self._lock:
+            self._entries.clear()
@@ -7,17 +7,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
 
 from .api.routes import auth as auth_routes
 from .api.routes import home as home_routes
 from .api.routes import home_demo as home_demo_routes
 from .api.routes import widgets as widget_routes
 from .core.config import settings
-from .core.database import init_db
+from .core.database import db_pool_stats_loop, dispose_async_engine, init_db
 from .core.logging_config import get_logger, setup_logging
 from .middleware.logging_middleware import RequestLoggingMiddleware
-from .services.token import cleanup_loop
+from .services.demo_feed_real_source import PROVIDER_RESULT_CACHE
+from .services.home_feed_cache import clear_home_feed_cache
+from .services.identity_cache import get_identity_cache
+from .services.rate_limit import rate_limit_sweep_loop
+from .services.shared_state import create_cache_backend
+from .services.token import blacklist_filter_loop, cleanup_loop
 
 """
 Einstiegspunkt für die FastAPI-Anwendung.
@@ -49,7 +53,7 @@ def create_app() -> FastAPI:
     async def lifespan(_: FastAPI):
         # DB & Cache initialisieren
         init_db()
-        FastAPICache.init(InMemoryBackend(), prefix="homewidget")
+        FastAPICache.init(create_cache_backend(), prefix="homewidget")
 
         # E2E/Contract-Tests benötigen deterministische Seed-Daten (Demo/Common/Premium Benutzer + Widgets).
         # Führe das idempotente Seeding automatisch aus, wenn wir in Test-Umgebung laufen
@@ -66,20 +70,44 @@ def create_app() -> FastAPI:
         except Exception:  # pragma: no cover - Seeding darf den Start nicht verhindern
             LOG.exception("e2e_seed_failed")
 
+        # Cache-Einträge aus früheren App-Instanzen verwerfen (Seed/Schema können abweichen)
+        await clear_home_feed_cache()
+        PROVIDER_RESULT_CACHE.clear()
+        get_identity_cache().clear()
+
         # Hintergrundtask für Token-Cleanup starten
         cleanup_task = asyncio.create_task(cleanup_loop())
         LOG.info("cleanup_loop_started")
 
+        # Rebuild/Worker-Sync des Blacklist-Negativ-Filters
+        filter_task = asyncio.create_task(blacklist_filter_loop())
+
+        # Leere Rate-Limit-Fenster der In-Memory-Limiter verwerfen
+        sweep_task = asyncio.create_task(rate_limit_sweep_loop())
+
+        # Periodisches Log der DB-Pool-Metriken (db_pool_stats)
+        pool_stats_task = asyncio.create_task(db_pool_stats_loop())
+
         try:
             yield
         finally:
-            # Task sauber beenden
+            # Tasks sauber beenden
+            for task in (pool_stats_task, sweep_task, filter_task):
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
             cleanup_task.cancel()
             try:
                 await cleanup_task
             except asyncio.CancelledError:
                 LOG.info("cleanup_loop_stopped")
 
+            # Async-Verbindungen gehören zum Event-Loop dieses Lifespans
+            await dispose_async_engine()
+
     app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
     app.add_middleware(
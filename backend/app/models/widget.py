@@ -4,11 +4,11 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 from pydantic import model_validator
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy import JSON as SA_JSON
 from sqlalchemy import event
 from sqlalchemy.orm import relationship
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Relationship, SQLModel, col
 
 from ..core.logging_config import get_logger
 
@@ -70,6 +70,18 @@ class Widget(SQLModel, table=True):
     )
 
 
+# Composite-Index für die Feed-Selektion (HomeFeedService): Gleichheit auf owner_id/enabled
+# und Sortierung priority desc, created_at desc, id desc direkt aus dem Index (kein Sort-Schritt).
+Index(
+    "ix_widgets_feed_selection",
+    col(Widget.owner_id),
+    col(Widget.enabled),
+    col(Widget.priority).desc(),
+    col(Widget.created_at).desc(),
+    col(Widget.id).desc(),
+)
+
+
 class RefreshToken(SQLModel, table=True):
     """
     Refresh-Token zur Ausstellung neuer Access-Tokens nach Ablauf.
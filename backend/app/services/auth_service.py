@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import secrets
+from collections.abc import Callable
 from datetime import UTC, datetime
-from typing import Any, cast
+from typing import Any, TypeVar, cast
 
 from fastapi import HTTPException, status
-from sqlmodel import Session, select
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, col, select, update
 
+from .identity_cache import invalidate_identity
+from .password_pool import PasswordPoolReservation, PasswordPoolSaturatedError, get_password_pool
 from .token.refresh_lock import get_refresh_lock_manager
 from ..config.timing_server_loader import (
     get_access_token_ttl,
@@ -23,6 +27,8 @@ from ..core.types.token import ACCESS
 from ..models.user import User
 from ..models.widget import RefreshToken
 
+T = TypeVar("T")
+
 
 def ensure_utc_aware(dt: datetime) -> datetime:
     """
@@ -42,6 +48,14 @@ def ensure_utc_aware(dt: datetime) -> datetime:
     return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt
 
 
+def _password_pool_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication temporarily overloaded",
+        headers={"Retry-After": "1"},
+    )
+
+
 class AuthService:
     def __init__(self, session: Session):
         self.session = session
@@ -62,34 +76,99 @@ class AuthService:
             HTTPException: Falls E-Mail bereits registriert ist.
         """
         normalized_email = email.strip().lower()
-        existing = self.session.exec(select(User).where(User.email == normalized_email)).first()
-        if existing:
+        self._ensure_email_available(normalized_email)
+        return self._create_user(normalized_email, self._run_password_op(hash_password, password))
+
+    async def signup_async(self, email: str, password: str) -> User:
+        """
+        Async-Variante von `signup` für Async-Routen.
+
+        Der Passwort-Pool wird vor jeder Threadpool-Arbeit reserviert (503 ohne Thread);
+        Argon2 läuft im Passwort-Pool, nur die DB-Zugriffe im AnyIO-Threadpool.
+        """
+        normalized_email = email.strip().lower()
+        with self._reserve_password_slot() as slot:
+            await run_in_threadpool(self._ensure_email_available, normalized_email)
+            password_hash = await slot.run(hash_password, password)
+        return await run_in_threadpool(self._create_user, normalized_email, password_hash)
+
+    def authenticate(self, email: str, password: str) -> User:
+        normalized_email = email.strip().lower()
+        user = self._find_user(normalized_email)
+
+        if not user or not self._run_password_op(verify_password, password, user.password_hash):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+        return self._ensure_active(user)
+
+    async def authenticate_async(self, email: str, password: str) -> User:
+        """
+        Async-Variante von `authenticate` (Reservierung wie bei `signup_async`).
+
+        Raises:
+            HTTPException: 401 bei falschen Zugangsdaten, 403 bei inaktivem Benutzer,
+                503 bei vollem Passwort-Pool.
+        """
+        normalized_email = email.strip().lower()
+        with self._reserve_password_slot() as slot:
+            user = await run_in_threadpool(self._find_user, normalized_email)
+            if not user or not await slot.run(verify_password, password, user.password_hash):
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+        return self._ensure_active(user)
+
+    def _find_user(self, normalized_email: str) -> User | None:
+        return self.session.exec(select(User).where(User.email == normalized_email)).first()
+
+    def _ensure_email_available(self, normalized_email: str) -> None:
+        if self._find_user(normalized_email):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered",
             )
 
-        user = User(email=normalized_email, password_hash=hash_password(password))
+    def _create_user(self, normalized_email: str, password_hash: str) -> User:
+        user = User(email=normalized_email, password_hash=password_hash)
         self.session.add(user)
         self.session.commit()
         self.session.refresh(user)
+        invalidate_identity(user.email)
         self.log.info("user_created", extra={"user_id": user.id})
 
         return user
 
-    def authenticate(self, email: str, password: str) -> User:
-        normalized_email = email.strip().lower()
-        user = self.session.exec(select(User).where(User.email == normalized_email)).first()
-
-        if not user or not verify_password(password, user.password_hash):
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-
+    def _ensure_active(self, user: User) -> User:
         if not user.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
 
         self.log.debug("user_authenticated", extra={"user_id": user.id})
         return user
 
+    def _run_password_op(self, fn: Callable[..., T], *args: str) -> T:
+        """
+        Führt Argon2-Hashing/-Verifikation im begrenzten Passwort-Pool aus.
+
+        Raises:
+            HTTPException: 503, falls die Warteschlange des Pools voll ist.
+        """
+        try:
+            return get_password_pool().run(fn, *args)
+        except PasswordPoolSaturatedError:
+            raise _password_pool_overloaded() from None
+
+    @staticmethod
+    def _reserve_password_slot() -> PasswordPoolReservation:
+        """
+        Reserviert einen Platz im Passwort-Pool, ohne einen Thread zu belegen.
+
+        Raises:
+            HTTPException: 503, falls die Warteschlange des Pools voll ist.
+        """
+        try:
+            return get_password_pool().reserve()
+        except PasswordPoolSaturatedError:
+            raise _password_pool_overloaded() from None
+
     def issue_tokens(self, user: User) -> tuple[str, str, int]:
         """
         Stellt Access- und Refresh-Token für einen Benutzer aus.
@@ -100,6 +179,13 @@ class AuthService:
         Returns:
             Tuple aus (access_token, refresh_token, expires_in_seconds).
         """
+        tokens = self._stage_tokens(user)
+        self.session.commit()
+        self.log.info("tokens_issued", extra={"user_id": user.id})
+        return tokens
+
+    def _stage_tokens(self, user: User) -> tuple[str, str, int]:
+        """Erzeugt ein Token-Paar und fügt den Refresh-Token der Session hinzu (ohne Commit)."""
         # Security‑Timings kommen autoritativ aus timing.server.json
         access_ttl = get_access_token_ttl()
         refresh_ttl = get_refresh_token_ttl()
@@ -112,8 +198,6 @@ class AuthService:
             expires_at=expires_at,
         )
         self.session.add(rt)
-        self.session.commit()
-        self.log.info("tokens_issued", extra={"user_id": user.id})
         return (
             access,
             refresh_token_plain,
@@ -126,7 +210,13 @@ class AuthService:
 
         Diese Methode ist durch einen Token-spezifischen Mutex geschützt, um Race-Conditions
         bei parallelen Refresh-Anfragen zu verhindern. Nur eine Refresh-Operation pro Token
-        kann gleichzeitig ausgeführt werden.
+        kann gleichzeitig ausgeführt werden. Prozessübergreifend (mehrere Worker) entscheidet
+        ein bedingtes `UPDATE ... WHERE revoked = false`: genau ein Aufrufer rotiert. Die Route
+        `/api/auth/refresh` bündelt parallele Anfragen zusätzlich per asyncio-Single-Flight.
+
+        Widerruf und Ausstellung des Nachfolgers laufen in einer Transaktion (ein Commit);
+        unterstützt der Dialekt `UPDATE ... RETURNING` (SQLite >= 3.35, Postgres), entfallen
+        zudem das vorgelagerte SELECT und der zweite Roundtrip.
 
         Args:
             token: Aktuelles Refresh-Token.
@@ -142,30 +232,61 @@ class AuthService:
         # Lock für diesen spezifischen Token-Digest erwerben.
         # Dies verhindert parallele Refresh-Operationen für denselben Token
         with lock_manager.acquire(token_digest):
-            now = datetime.now(tz=UTC)
-            rt = self.session.exec(
-                select(RefreshToken).where(
-                    RefreshToken.token_digest == token_digest,
-                    cast(Any, RefreshToken.revoked).is_(False),
-                )
-            ).first()
-
-            if not rt:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+            try:
+                claimed = self._claim_refresh_token(token_digest)
+                if claimed is None:
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-            expires_at = ensure_utc_aware(rt.expires_at)
+                user_id, expires_at = claimed
+                if ensure_utc_aware(expires_at) < datetime.now(tz=UTC):
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-            if expires_at < now:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+                user: User | None = self.session.get(User, user_id)
 
-            user: User | None = self.session.get(User, rt.user_id)
+                if not user or not user.is_active:
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
 
-            if not user or not user.is_active:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
+                access, refresh, expires_in = self._stage_tokens(user)
+                self.session.commit()
+            except BaseException:
+                # Widerruf verwerfen: abgelehnte Rotationen verändern den Token nicht
+                self.session.rollback()
+                raise
 
-            rt.revoked = True
-            self.session.add(rt)
-            self.session.commit()
             self.log.info("refresh_rotated", extra={"user_id": user.id})
-            access, refresh, expires_in = self.issue_tokens(user)
             return access, refresh, expires_in, user
+
+    def _claim_refresh_token(self, token_digest: str) -> tuple[int, datetime] | None:
+        """
+        Widerruft den Token per Compare-and-set (ohne Commit) und liefert (user_id, expires_at).
+
+        Nur der Aufrufer, dessen UPDATE die Zeile noch unwiderrufen vorfindet, erhält ein
+        Ergebnis – das schützt auch über Worker-Prozesse hinweg. None: unbekannt, bereits
+        widerrufen oder das Rennen verloren.
+        """
+        not_revoked = cast(Any, RefreshToken.revoked).is_(False)
+
+        if self.session.get_bind().dialect.update_returning:
+            row = self.session.exec(  # type: ignore[call-overload]
+                update(RefreshToken)
+                .where(col(RefreshToken.token_digest) == token_digest, not_revoked)
+                .values(revoked=True)
+                .returning(col(RefreshToken.user_id), col(RefreshToken.expires_at))
+            ).first()
+            return (row[0], row[1]) if row else None
+
+        rt = self.session.exec(
+            select(RefreshToken).where(RefreshToken.token_digest == token_digest, not_revoked)
+        ).first()
+        if not rt:
+            return None
+
+        revoked = self.session.exec(  # type: ignore[call-overload]
+            update(RefreshToken)
+            .where(col(RefreshToken.id) == rt.id, not_revoked)
+            .values(revoked=True)
+        )
+        if revoked.rowcount != 1:
+            self.log.info("refresh_rotation_lost_race", extra={"user_id": rt.user_id})
+            return None
+        return rt.user_id, rt.expires_at
@@ -8,23 +8,32 @@ from __future__ import annotations
 
 from typing import Optional
 
+from ..core.config import settings
 from ..homewidget.providers.aggregator import ProvidersAggregator
 from ..homewidget.providers.furniture_provider import FurnitureProvider
 from ..homewidget.providers.mobile_plans_provider import MobilePlansProvider
+from ..homewidget.providers.result_cache import ProviderResultCache
+from ..homewidget.contracts.v1.cursor import FeedCursorV1
 from ..homewidget.contracts.v1.widget_contracts import FeedPageV1, WidgetDetailV1
 
+# Prozessweiter Ergebnis-Cache der Demo-Provider (überlebt die Aggregator-Instanz je Request)
+PROVIDER_RESULT_CACHE = ProviderResultCache(fresh_seconds=settings.PROVIDER_CACHE_FRESH_SECONDS)
 
-def load_real_demo_feed_v1(cursor: int = 0, limit: int = 20) -> FeedPageV1:
+
+def load_real_demo_feed_v1(cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> FeedPageV1:
     """
     Liefert echte Demo‑Widgets (v1 Contract) mit Cursor/Limit über den Aggregator.
 
     Fail‑open: Fehler einzelner Provider werden geloggt und führen nicht zu 500.
+    Provider-Ergebnisse kommen aus `PROVIDER_RESULT_CACHE` (Stale-While-Revalidate),
+    sofern `PROVIDER_CACHE_FRESH_SECONDS` > 0.
     """
     aggregator = ProvidersAggregator(
         providers=[
             MobilePlansProvider(),
             FurnitureProvider(),
-        ]
+        ],
+        result_cache=PROVIDER_RESULT_CACHE if settings.PROVIDER_CACHE_FRESH_SECONDS > 0 else None,
     )
     return aggregator.load_page(cursor=cursor, limit=limit)
 
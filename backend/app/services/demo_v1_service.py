@@ -4,6 +4,9 @@ Zentralisierte Demo-v1-Policy (Feed & Detail) mit konsistentem Logging.
 Policy:
 - Feed: real-first; invalid drop; wenn leer/Exception -> deterministische Fixtures
 - Detail: Fixtures nur in reservierter Range; sonst Real; invalid -> None
+
+Die `*_json`-Varianten liefern fertige JSON-Bytes für Routen mit roher `Response`;
+Fixtures kommen dabei aus dem vorserialisierten Cache (ohne Pydantic).
 """
 from __future__ import annotations
 
@@ -11,14 +14,37 @@ from typing import Optional
 
 from . import demo_feed_real_source as real_src
 from ..core.logging_config import get_logger
-from ..fixtures.v1 import get_detail, get_feed_page, is_fixture_id
+from ..fixtures.v1 import get_detail, get_detail_json, get_feed_page, get_feed_page_json, is_fixture_id
+from ..homewidget.contracts.v1.cursor import FeedCursorV1
 from ..homewidget.contracts.v1.widget_contracts import FeedPageV1, WidgetDetailV1
 
 LOG = get_logger("service.demo_v1")
 
 
-def build_demo_feed_page_v1(cursor: int = 0, limit: int = 20) -> FeedPageV1:
+def build_demo_feed_page_v1(cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> FeedPageV1:
     """Baut die Demo-Feed-Seite gemäß real-first Policy."""
+    real_page = _load_real_feed_page(cursor, limit)
+    if real_page is not None:
+        return real_page
+
+    page = get_feed_page(cursor=cursor, limit=limit)
+    LOG.info("demo_feed_v1_fixture_delivered", extra={"count": len(page.items)})
+    return page
+
+
+def build_demo_feed_page_v1_json(cursor: FeedCursorV1 | str | int | None = 0, limit: int = 20) -> bytes:
+    """Wie `build_demo_feed_page_v1`, aber als JSON-Bytes (Fixture-Fallback vorserialisiert)."""
+    real_page = _load_real_feed_page(cursor, limit)
+    if real_page is not None:
+        return real_page.model_dump_json().encode("utf-8")
+
+    body = get_feed_page_json(cursor=cursor, limit=limit)
+    LOG.info("demo_feed_v1_fixture_delivered", extra={"cached": True})
+    return body
+
+
+def _load_real_feed_page(cursor: FeedCursorV1 | str | int | None, limit: int) -> FeedPageV1 | None:
+    """Real-Quelle abfragen; None bedeutet Fallback auf Fixtures."""
     try:
         real_page = real_src.load_real_demo_feed_v1(cursor=cursor, limit=limit)
         # Strikte Validierung ist bereits über Pydantic-Models gewährleistet; dennoch sicherstellen
@@ -28,10 +54,7 @@ def build_demo_feed_page_v1(cursor: int = 0, limit: int = 20) -> FeedPageV1:
         LOG.info("demo_feed_v1_real_empty_fallback_to_fixtures")
     except Exception as exc:  # noqa: BLE001
         LOG.warning("demo_feed_v1_real_exception_fallback_to_fixtures", extra={"error": str(exc)})
-
-    page = get_feed_page(cursor=cursor, limit=limit)
-    LOG.info("demo_feed_v1_fixture_delivered", extra={"count": len(page.items)})
-    return page
+    return None
 
 
 def resolve_demo_detail_v1(widget_id: int) -> Optional[WidgetDetailV1]:
@@ -45,6 +68,22 @@ def resolve_demo_detail_v1(widget_id: int) -> Optional[WidgetDetailV1]:
         return None
 
     # 2) Real versuchen, invalid -> None
+    return _resolve_real_detail(widget_id)
+
+
+def resolve_demo_detail_v1_json(widget_id: int) -> Optional[bytes]:
+    """Wie `resolve_demo_detail_v1`, aber als JSON-Bytes (Fixtures vorserialisiert)."""
+    if is_fixture_id(widget_id):
+        body = get_detail_json(widget_id)
+        if body is not None:
+            LOG.info("demo_detail_v1_fixture_delivered", extra={"widget_id": widget_id})
+        return body
+
+    detail = _resolve_real_detail(widget_id)
+    return detail.model_dump_json().encode("utf-8") if detail is not None else None
+
+
+def _resolve_real_detail(widget_id: int) -> Optional[WidgetDetailV1]:
     try:
         real_detail = real_src.load_real_demo_widget_detail_v1(widget_id)
     except Exception as exc:  # noqa: BLE001
@@ -0,0 +1,232 @@
+"""
+Per-User Ergebnis-Cache für `GET /api/home/feed`.
+
+Einträge liegen im konfigurierten fastapi-cache2-Backend (InMemory in Dev) und
+enthalten die bereits serialisierte JSON-Antwort (`list[WidgetRead]`), sodass ein
+Treffer weder DB-Query noch Pydantic-Validierung benötigt.
+
+Schlüssel: `home_feed:{user_id}:{role}:{generation}`
+- `role` trennt Einträge nach Sichtbarkeitskontext (demo/common/premium).
+- `generation` ist ein Zähler je Benutzer. Invalidierung erhöht ihn synchron (auch aus
+  Sync-Services heraus); alte Einträge werden nicht mehr adressiert und laufen per TTL aus.
+  Der Zähler liegt dort, wo auch die Einträge liegen: bei `SHARED_STATE_BACKEND=sqlite`
+  in der geteilten Datei (`SQLiteGenerations`, Read-your-writes über Worker hinweg),
+  sonst prozesslokal. Zähler laufen nach der maximalen Eintrags-TTL ab; neue Werte
+  (`max(alt + 1, time_ns())`) werden nie wiederverwendet.
+
+TTL: Standard aus `settings.HOME_FEED_CACHE_TTL_SECONDS`, zusätzlich begrenzt durch den
+frühesten `freshness_ttl`-Ablauf der enthaltenen Widgets. Der exakte Ablaufzeitpunkt
+wird im Eintrag mitgespeichert, da das Backend nur sekundengenau abläuft.
+
+Verhalten: Fail-open – Cache-Fehler führen zu einem normalen DB-Read.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Final, Protocol
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache import FastAPICache
+
+from ..core.config import settings
+from ..core.logging_config import get_logger
+from ..models.widget import Widget
+
+LOG = get_logger("services.home_feed_cache")
+
+_KEY_PREFIX: Final[str] = "home_feed"
+_GENERATION_PREFIX: Final[str] = "home_feed_gen"
+
+
+class _Generations(Protocol):
+    blocking: bool
+
+    def current(self, key: str) -> int: ...
+
+    def bump(self, key: str, ttl_seconds: float) -> int: ...
+
+
+class InMemoryGenerations:
+    """
+    Prozesslokale Generationszähler mit Ablauf (Gegenstück zu `SQLiteGenerations`).
+
+    Jeder `bump` verlängert den Ablauf um dieselbe TTL und verschiebt den Key ans Ende;
+    die Reihenfolge entspricht damit dem Ablaufzeitpunkt und abgelaufene Zähler werden
+    vorne in O(1) amortisiert entfernt – der Speicher wächst nicht mit allen je
+    invalidierten Benutzern.
+    """
+
+    blocking = False
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def current(self, key: str) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return 0
+        return entry[0]
+
+    def bump(self, key: str, ttl_seconds: float) -> int:
+        now = time.time()
+        with self._lock:
+            while self._entries:
+                oldest_key, (_gen, expires_at) = next(iter(self._entries.items()))
+                if expires_at > now:
+                    break
+                del self._entries[oldest_key]
+            previous = self._entries.pop(key, (0, 0.0))[0]
+            generation = max(previous + 1, time.time_ns())
+            self._entries[key] = (generation, now + ttl_seconds)
+            return generation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_memory_generations = InMemoryGenerations()
+
+
+def _generations() -> _Generations:
+    if settings.SHARED_STATE_BACKEND == "sqlite":
+        from .shared_state import SQLiteGenerations, get_shared_state_store
+
+        return SQLiteGenerations(get_shared_state_store())
+    return _memory_generations
+
+
+def _generation_key(user_id: int) -> str:
+    return f"{_GENERATION_PREFIX}:{user_id}"
+
+
+def _generation_ttl() -> float:
+    # Muss jeden Eintrag überdauern (Backend-Ablauf ist auf ganze Sekunden aufgerundet)
+    return max(1, settings.HOME_FEED_CACHE_TTL_SECONDS) + 1
+
+
+async def _current_generation(user_id: int) -> int:
+    generations = _generations()
+    if generations.blocking:
+        return await run_in_threadpool(generations.current, _generation_key(user_id))
+    return generations.current(_generation_key(user_id))
+
+
+def _role_value(role: object) -> str:
+    return str(getattr(role, "value", role) or "common")
+
+
+def _key_for(user_id: int, role: object, generation: int) -> str:
+    return f"{_KEY_PREFIX}:{user_id}:{_role_value(role)}:{generation}"
+
+
+def invalidate_home_feed(user_id: int | None) -> None:
+    """
+    Invalidiert alle gecachten Feed-Einträge eines Benutzers (alle Rollen).
+
+    Synchron (ein Upsert bzw. Dict-Zugriff), damit Sync-Routen und -Services ohne
+    Event-Loop aufrufen können.
+    """
+    if user_id is None:
+        return
+    try:
+        _generations().bump(_generation_key(user_id), _generation_ttl())
+    except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Cache-Fehler darf Schreibpfad nicht abbrechen (Rest per TTL)
+        LOG.warning("home_feed_cache_invalidate_failed", extra={"user_id": user_id}, exc_info=exc)
+        return
+    LOG.debug("home_feed_cache_invalidated", extra={"user_id": user_id})
+
+
+def feed_cache_ttl(widgets: Sequence[Widget], *, now: datetime | None = None) -> float:
+    """
+    Berechnet die Lebensdauer (Sekunden) eines Feed-Eintrags.
+
+    Begrenzung durch den frühesten TTL-Ablauf (`created_at + freshness_ttl`) aller
+    enthaltenen Widgets, damit abgelaufene Widgets pünktlich aus dem Feed fallen.
+
+    Returns:
+        Lebensdauer in Sekunden; <= 0 bedeutet: nicht cachen.
+    """
+    ref_now = now or datetime.now(tz=UTC)
+    ttl = float(settings.HOME_FEED_CACHE_TTL_SECONDS)
+
+    for w in widgets:
+        ttl_sec = w.freshness_ttl or 0
+        if ttl_sec <= 0:
+            continue
+        created_at = w.created_at.replace(tzinfo=UTC) if w.created_at.tzinfo is None else w.created_at
+        remaining = (created_at + timedelta(seconds=int(ttl_sec)) - ref_now).total_seconds()
+        ttl = min(ttl, remaining)
+
+    return ttl
+
+
+async def get_cached_feed(user_id: int, role: object) -> bytes | None:
+    """Liefert die serialisierte Feed-Antwort aus dem Cache oder None."""
+    if settings.HOME_FEED_CACHE_TTL_SECONDS <= 0:
+        return None
+
+    try:
+        generation = await _current_generation(user_id)
+        backend = FastAPICache.get_backend()
+        raw = await backend.get(_key_for(user_id, role, generation))
+
+    except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Cache-Ausfall → Fail‑open (DB-Read)
+        LOG.warning("home_feed_cache_get_failed", extra={"user_id": user_id}, exc_info=exc)
+        return None
+
+    if not raw:
+        return None
+
+    deadline_raw, _, body = raw.partition(b"\n")
+    try:
+        if float(deadline_raw) <= time.time():
+            return None
+    except ValueError:
+        return None
+
+    return body
+
+
+async def store_feed(user_id: int, role: object, body: bytes, ttl_seconds: float) -> None:
+    """
+    Legt die serialisierte Feed-Antwort mit begrenzter Lebensdauer im Cache ab.
+
+    Args:
+        user_id: Benutzer-ID.
+        role: Rolle/Sichtbarkeitskontext des Benutzers.
+        body: JSON-Bytes der Antwort.
+        ttl_seconds: Lebensdauer (siehe `feed_cache_ttl`); <= 0 wird nicht gecacht.
+    """
+    if settings.HOME_FEED_CACHE_TTL_SECONDS <= 0 or ttl_seconds <= 0:
+        return
+
+    deadline = time.time() + ttl_seconds
+    try:
+        generation = await _current_generation(user_id)
+        backend = FastAPICache.get_backend()
+        await backend.set(
+            _key_for(user_id, role, generation),
+            f"{deadline:.6f}\n".encode() + body,
+            expire=max(1, math.ceil(ttl_seconds)),
+        )
+
+    except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Cache-Schreibfehler → Fail‑open, nur warnen
+        LOG.warning("home_feed_cache_set_failed", extra={"user_id": user_id}, exc_info=exc)
+
+
+async def clear_home_feed_cache() -> None:
+    """Verwirft alle Feed-Einträge (z. B. beim App-Start nach Seeding)."""
+    try:
+        backend = FastAPICache.get_backend()
+        await backend.clear(namespace=f"{_KEY_PREFIX}:")
+
+    except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Cache-Fehler darf den Start nicht verhindern
+        LOG.warning("home_feed_cache_clear_failed", exc_info=exc)
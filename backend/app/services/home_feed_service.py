@@ -7,17 +7,92 @@ Selektion (HW-NEXT-01D):
   - freshness_ttl abgelaufen => ausschließen (ttl <= 0 bedeutet: kein Ablauf)
 - Sortierung: priority desc, created_at desc, id desc
 Die Logik ist deterministisch; Zeitabhängigkeit kann in Tests per Time‑Freeze gesteuert werden.
+
+Ausführung:
+- `enabled`, TTL‑Ablauf und Sortierung laufen in der Datenbank (SQLite/Postgres),
+  damit nicht alle Widgets eines Benutzers geladen und in Python sortiert werden müssen.
+- `visibility_rules` (JSON) werden weiterhin in Python geprüft; der Filter erhält die
+  Reihenfolge der DB‑Sortierung.
+- Unbekannte Dialekte fallen auf die reine Python‑Selektion zurück.
+- `AsyncHomeFeedService` führt dieselbe Selektion über eine `AsyncSession` aus
+  (Async-Routen ohne Threadpool-Slot).
 """
 from __future__ import annotations
 
 from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
+from typing import Any, cast
 
-from sqlmodel import Session, select
+from sqlalchemy import String, func, literal, or_, type_coerce
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.user import User
 from ..models.widget import Widget
 
+# SQLAlchemy speichert DATETIME in SQLite als Text mit fixem Format
+# ("YYYY-MM-DD HH:MM:SS.ffffff"); Vergleiche erfolgen lexikografisch auf diesem Format.
+_SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+_SQL_DIALECTS = frozenset({"sqlite", "postgresql"})
+
+
+def _to_naive_utc(dt: datetime) -> datetime:
+    """Normalisiert auf naive UTC‑Zeit (Speicherformat der `created_at`‑Spalte)."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(UTC).replace(tzinfo=None)
+
+
+def _not_expired_clause(dialect: str, now: datetime) -> ColumnElement[bool]:
+    """
+    Baut das TTL‑Prädikat `ttl <= 0 OR created_at + ttl > now` für den Dialekt.
+
+    SQLite: Sekunden werden per `strftime(..., '+N seconds')` addiert; der Bruchteil
+    (".ffffff") ändert sich dabei nicht und wird unverändert angehängt, sodass der
+    Vergleich mikrosekundengenau wie in Python bleibt.
+    Postgres: native Intervall‑Arithmetik über `make_interval(secs => ttl)`.
+    """
+    ttl = col(Widget.freshness_ttl)
+    created = col(Widget.created_at)
+    ref_now = _to_naive_utc(now)
+
+    if dialect == "sqlite":
+        modifier = literal("+").concat(type_coerce(ttl, String)).concat(" seconds")
+        expires_at = func.strftime("%Y-%m-%d %H:%M:%S", created, modifier).concat(func.substr(created, 20))
+        not_expired = type_coerce(expires_at, String) > ref_now.strftime(_SQLITE_DATETIME_FORMAT)
+    else:
+        not_expired = created + func.make_interval(0, 0, 0, 0, 0, 0, ttl) > ref_now
+
+    return or_(ttl <= 0, not_expired)
+
+
+def _context_of(user: User, context: str | None) -> str:
+    """Sichtbarkeitskontext: explizit übergeben, sonst `user.role` (Enum → Wert)."""
+    ctx = (context or getattr(user, "role", None) or "common")
+    if hasattr(ctx, "value"):
+        # Enum UserRole -> String nehmen
+        ctx = getattr(ctx, "value")
+    return str(ctx)
+
+
+def _feed_statement(user: User, dialect: str, ref_now: datetime):  # noqa: ANN202
+    """SQL-Selektion: eigene, aktive, nicht abgelaufene Widgets in Feed-Reihenfolge."""
+    return (
+        select(Widget)
+        .where(
+            Widget.owner_id == user.id,
+            cast(Any, Widget.enabled).is_(True),
+            _not_expired_clause(dialect, ref_now),
+        )
+        .order_by(
+            col(Widget.priority).desc(),
+            col(Widget.created_at).desc(),
+            col(Widget.id).desc(),
+        )
+    )
+
 
 class HomeFeedService:
     """
@@ -40,48 +115,85 @@ class HomeFeedService:
             Deterministisch gefilterte und sortierte Folge von Widgets.
         """
         ref_now = now or datetime.now(tz=UTC)
-        ctx = (context or getattr(user, "role", None) or "common")
-        if hasattr(ctx, "value"):
-            # Enum UserRole -> String nehmen
-            ctx = getattr(ctx, "value")  # type: ignore[assignment]
+        ctx = _context_of(user, context)
 
-        # Rohdaten laden (nur Besitzer einschränken); restliche Regeln in Python anwenden,
-        # um DB‑Dialektunterschiede (JSON, Zeitarithmetik) in Tests zu vermeiden.
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in _SQL_DIALECTS:
+            return self._select_in_python(user, ref_now=ref_now, ctx=ctx)
+
+        rows: Sequence[Widget] = self.session.exec(_feed_statement(user, dialect, ref_now)).all()
+        return [w for w in rows if _matches_visibility(w, ctx)]
+
+    def _select_in_python(self, user: User, *, ref_now: datetime, ctx: str) -> list[Widget]:
+        """Referenz‑Selektion komplett in Python (Fallback für Dialekte ohne SQL‑Pfad)."""
         candidates: Sequence[Widget] = self.session.exec(
             select(Widget).where(Widget.owner_id == user.id)
         ).all()
+        return _filter_and_sort(candidates, ref_now=ref_now, ctx=ctx)
 
-        def is_visible(w: Widget) -> bool:
-            if not w.enabled:
-                return False
 
-            # Sichtbarkeit: leere Liste => sichtbar für alle
-            rules = w.visibility_rules or []
-            if rules and str(ctx) not in {str(r) for r in rules}:
-                return False
+class AsyncHomeFeedService:
+    """
+    Async-Variante von `HomeFeedService` (gleiche Selektion/Sortierung) für `AsyncSession`.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_user_widgets(
+            self, user: User, *, now: datetime | None = None, context: str | None = None
+    ) -> Sequence[Widget]:
+        """Siehe `HomeFeedService.get_user_widgets`."""
+        ref_now = now or datetime.now(tz=UTC)
+        ctx = _context_of(user, context)
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in _SQL_DIALECTS:
+            candidates = (await self.session.exec(select(Widget).where(Widget.owner_id == user.id))).all()
+            return _filter_and_sort(candidates, ref_now=ref_now, ctx=ctx)
+
+        rows: Sequence[Widget] = (await self.session.exec(_feed_statement(user, dialect, ref_now))).all()
+        return [w for w in rows if _matches_visibility(w, ctx)]
 
-            # TTL: nur anwenden, wenn ttl > 0
-            ttl_sec = getattr(w, "freshness_ttl", 0) or 0
-            if ttl_sec > 0:
-                try:
-                    expires_at = w.created_at + timedelta(seconds=int(ttl_sec))
-                    if expires_at <= ref_now:
-                        return False
-                except (TypeError, ValueError, OverflowError):
-                    # Bei unerwarteten Datumswerten defensiv: Widget ausschließen
+
+def _filter_and_sort(candidates: Sequence[Widget], *, ref_now: datetime, ctx: str) -> list[Widget]:
+    """Filtert (enabled, Sichtbarkeit, TTL) und sortiert Kandidaten in Python."""
+
+    def is_visible(w: Widget) -> bool:
+        if not w.enabled:
+            return False
+
+        if not _matches_visibility(w, ctx):
+            return False
+
+        # TTL: nur anwenden, wenn ttl > 0
+        ttl_sec = getattr(w, "freshness_ttl", 0) or 0
+        if ttl_sec > 0:
+            try:
+                expires_at = _to_naive_utc(w.created_at) + timedelta(seconds=int(ttl_sec))
+                if expires_at <= _to_naive_utc(ref_now):
                     return False
+            except (TypeError, ValueError, OverflowError):
+                # Bei unerwarteten Datumswerten defensiv: Widget ausschließen
+                return False
 
-            return True
+        return True
 
-        visible = [w for w in candidates if is_visible(w)]
+    visible = [w for w in candidates if is_visible(w)]
 
-        # Deterministische Sortierung
-        visible.sort(
-            key=lambda w: (
-                int(w.priority or 0),
-                w.created_at,
-                int(w.id or 0),
-            ),
-            reverse=True,
-        )
-        return visible
+    # Deterministische Sortierung
+    visible.sort(
+        key=lambda w: (
+            int(w.priority or 0),
+            _to_naive_utc(w.created_at),
+            int(w.id or 0),
+        ),
+        reverse=True,
+    )
+    return visible
+
+
+def _matches_visibility(w: Widget, ctx: str) -> bool:
+    """Sichtbarkeit: leere Liste => sichtbar für alle, sonst muss der Kontext enthalten sein."""
+    rules = w.visibility_rules or []
+    return not rules or ctx in {str(r) for r in rules}
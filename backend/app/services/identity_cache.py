@@ -0,0 +1,151 @@
+"""
+Prozesslokaler Identity-Cache für `get_current_user`.
+
+Hält unveränderliche Snapshots `(id, email, role, is_active, created_at)` je E-Mail,
+damit Hot-Routen (Feed, Widgets, /me) nicht bei jedem Request die `users`-Zeile lesen.
+
+Invalidierung:
+- explizit nach Commit in `upgrade_to_premium` und `signup` (`invalidate_identity`),
+- automatisch bei jedem UPDATE/DELETE einer `User`-Zeile über den ORM (z. B.
+  Deaktivierung), siehe `_invalidate_on_user_change`.
+
+Die kurze TTL (`IDENTITY_CACHE_TTL_SECONDS`) begrenzt Staleness bei Änderungen, die am
+ORM vorbei (z. B. per Raw-SQL oder in einem anderen Worker-Prozess) erfolgen.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import event
+
+from ..core.config import settings
+from ..core.logging_config import get_logger
+from ..models.user import User, UserRole
+
+LOG = get_logger("services.identity_cache")
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """Unveränderlicher Snapshot der für Auth/Routing benötigten Benutzerfelder."""
+
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserIdentity":
+        return cls(
+            id=int(user.id or 0),
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+            created_at=user.created_at,
+        )
+
+
+@dataclass(frozen=True)
+class IdentityCacheStats:
+    size: int
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class IdentityCache:
+    """Thread-sicherer TTL-Cache (LRU-begrenzt) für `UserIdentity`-Snapshots je E-Mail."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(0, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[UserIdentity, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, email: str) -> UserIdentity | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            cached = self._entries.get(email)
+            if cached is None or cached[1] <= self._clock():
+                if cached is not None:
+                    del self._entries[email]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self._hits += 1
+            return cached[0]
+
+    def put(self, identity: UserIdentity) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[identity.email] = (identity, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(identity.email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str | None) -> None:
+        if not email:
+            return
+        with self._lock:
+            if self._entries.pop(email, None) is not None:
+                self._invalidations += 1
+        LOG.debug("identity_cache_invalidated", extra={"user_email": email})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> IdentityCacheStats:
+        with self._lock:
+            return IdentityCacheStats(
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+            )
+
+
+# Globale Singleton-Instanz für die gesamte Anwendung
+_global_identity_cache = IdentityCache(
+    ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+)
+
+
+def get_identity_cache() -> IdentityCache:
+    """
+    Gibt die globale Singleton-Instanz des Identity-Caches zurück.
+
+    Returns:
+        Die globale IdentityCache-Instanz.
+    """
+    return _global_identity_cache
+
+
+def invalidate_identity(email: str | None) -> None:
+    """Verwirft den Snapshot eines Benutzers (nach Rollen-/Statusänderung oder Signup)."""
+    _global_identity_cache.invalidate(email)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(_mapper: Any, _connection: Any, target: User) -> None:
+    # Greift für jede ORM-Änderung (z. B. Deaktivierung); ein zwischenzeitlich erneut
+    # gecachter alter Stand läuft spätestens nach der TTL aus.
+    invalidate_identity(target.email)
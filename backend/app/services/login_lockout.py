@@ -0,0 +1,119 @@
+"""
+Login-Lockout vor der Passwortprüfung (Brute-Force-Schutz).
+
+Quelle der Schwellwerte: `security.lockout` aus `timing.server.json`
+(`maxAttempts`, `cooldownMs`). Gezählt werden fehlgeschlagene Logins:
+- je Konto (normalisierte E-Mail): gesperrt ab `maxAttempts` Fehlversuchen
+  innerhalb von `cooldown`;
+- je Client-IP: gesperrt ab `maxAttempts * LOGIN_LOCKOUT_IP_FACTOR` Fehlversuchen
+  (höhere Schwelle, da sich viele Benutzer eine IP teilen können).
+
+Jeder Versuch wird vor der Passwortprüfung atomar gezählt (`try_acquire`, ein
+`allow` je Schlüssel); gesperrte Anfragen werden abgelehnt, bevor der Passwort-Hasher
+läuft – Angriffe kosten damit keine Argon2-Rechenzeit, und parallele Versuche können
+die Schwelle nicht gemeinsam überschreiten. Ein erfolgreicher Login setzt den
+Kontozähler zurück und erstattet den IP-Versuch; andere Fehler als 401 erstatten beide.
+
+Die Zähler liegen im Rate-Limiter (`create_rate_limiter`), d. h. sie sind bei
+`SHARED_STATE_BACKEND=sqlite` über Worker geteilt und In-Memory begrenzt/gesweept.
+"""
+from __future__ import annotations
+
+import math
+
+from fastapi import HTTPException, status
+
+from ..config.timing_server_loader import get_lockout_policy
+from ..core.config import settings
+from ..core.logging_config import get_logger
+from .rate_limit import RateLimiter, RateRule, create_rate_limiter
+
+LOG = get_logger("services.login_lockout")
+
+
+class LoginLockout:
+    """
+    Fehlversuchszähler je Konto und je IP auf Basis eines Rate-Limiters.
+
+    Args:
+        limiter: Zustandsspeicher der Fehlversuche (Sliding-Window über `cooldown`).
+        max_attempts: Fehlversuche je Konto bis zur Sperre.
+        cooldown_seconds: Sperrdauer bzw. Zählfenster in Sekunden; <= 0 deaktiviert den Lockout.
+        ip_factor: Multiplikator der Schwelle für Fehlversuche je IP.
+    """
+
+    def __init__(self, limiter: RateLimiter, max_attempts: int, cooldown_seconds: int, ip_factor: int = 1) -> None:
+        self._limiter = limiter
+        self.cooldown_seconds = cooldown_seconds
+        self.enabled = cooldown_seconds > 0 and max_attempts > 0
+        self._account_rule = RateRule(count=max(1, max_attempts), window_seconds=max(1, cooldown_seconds))
+        self._ip_rule = RateRule(count=max(1, max_attempts * ip_factor), window_seconds=max(1, cooldown_seconds))
+
+    @property
+    def blocking(self) -> bool:
+        """True, falls der Limiter synchrone I/O macht (siehe `rate_limit.call_limiter`)."""
+        return self._limiter.blocking
+
+    def try_acquire(self, email: str, ip: str) -> None:
+        """
+        Zählt einen Login-Versuch für Konto und IP vor der Passwortprüfung.
+
+        Ist eine Schwelle erreicht, werden bereits gezählte Schlüssel erstattet.
+
+        Raises:
+            HTTPException: 429 mit `Retry-After` (Obergrenze: Cooldown).
+        """
+        if not self.enabled:
+            return
+
+        acquired: list[tuple[str, RateRule]] = []
+        for scope, key, rule in self._keys(email, ip):
+            if not self._limiter.allow(key, rule):
+                for taken_key, taken_rule in acquired:
+                    self._limiter.refund(taken_key, taken_rule)
+                LOG.warning("login_locked_out", extra={"scope": scope, "client": ip})
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many failed login attempts",
+                    headers={"Retry-After": str(self.cooldown_seconds)},
+                )
+            acquired.append((key, rule))
+
+    def record_success(self, email: str, ip: str) -> None:
+        """Setzt den Kontozähler nach erfolgreichem Login zurück und erstattet den IP-Versuch."""
+        if not self.enabled:
+            return
+        self._limiter.reset(self._account_key(email))
+        self._limiter.refund(self._ip_key(ip), self._ip_rule)
+
+    def release(self, email: str, ip: str) -> None:
+        """Erstattet einen Versuch, der nicht als Fehlversuch zählt (z. B. 403/503)."""
+        if not self.enabled:
+            return
+        for _scope, key, rule in self._keys(email, ip):
+            self._limiter.refund(key, rule)
+
+    def _keys(self, email: str, ip: str) -> list[tuple[str, str, RateRule]]:
+        return [
+            ("account", self._account_key(email), self._account_rule),
+            ("ip", self._ip_key(ip), self._ip_rule),
+        ]
+
+    @staticmethod
+    def _account_key(email: str) -> str:
+        return f"lockout:account:{email.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"lockout:ip:{ip}"
+
+
+def create_login_lockout() -> LoginLockout:
+    """Erzeugt den Lockout gemäß aktivem Timing-Profil (`HW_PROFILE`)."""
+    max_attempts, cooldown = get_lockout_policy()
+    return LoginLockout(
+        create_rate_limiter(),
+        max_attempts=max_attempts,
+        cooldown_seconds=math.ceil(cooldown.total_seconds()),
+        ip_factor=settings.LOGIN_LOCKOUT_IP_FACTOR,
+    )
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Self, TypeVar
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+LOG = get_logger("services.password_pool")
+
+T = TypeVar("T")
+
+
+class PasswordPoolSaturatedError(RuntimeError):
+    """Warteschlange des Passwort-Pools ist voll; Anfrage wird abgewiesen."""
+
+
+@dataclass(frozen=True)
+class PasswordPoolStats:
+    """Momentaufnahme der Pool-Auslastung (für Logging/Monitoring)."""
+
+    workers: int
+    queue_limit: int
+    active: int
+    queued: int
+    completed_total: int
+    rejected_total: int
+
+
+class BoundedPasswordExecutor:
+    """
+    Eigener, größenbegrenzter Thread-Pool für Argon2-Hashing und -Verifikation.
+
+    Argon2 ist absichtlich CPU- und speicherintensiv. Ohne eigenen Pool belegt ein
+    Login-Burst den AnyIO-Threadpool, den alle Sync-Routen teilen, und verdrängt
+    z. B. Feed-Requests.
+
+    - Höchstens `max_workers` Hash-Operationen laufen gleichzeitig.
+    - Höchstens `queue_limit` weitere warten; darüber hinaus wird sofort
+      `PasswordPoolSaturatedError` geworfen (API: 503), statt Worker zu blockieren.
+    - `stats()` liefert Queue-Tiefe und Zähler.
+    - Async-Routen nutzen `reserve()`/`arun()`: Die Admission läuft im Event-Loop und
+      auf das Ergebnis wird gewartet, ohne einen Threadpool-Thread zu blockieren.
+
+    Thread-Safety: Zähler werden unter einem `threading.Lock` gepflegt.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int) -> None:
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def run(self, fn: Callable[..., T], *args: object) -> T:
+        """
+        Führt `fn(*args)` im Pool aus und wartet (blockierend) auf das Ergebnis.
+
+        Raises:
+            PasswordPoolSaturatedError: Falls bereits `max_workers + queue_limit` Aufgaben anstehen.
+        """
+        self._admit()
+        return self._submit(fn, *args).result()
+
+    async def arun(self, fn: Callable[..., T], *args: object) -> T:
+        """
+        Async-Variante von `run`: wartet im Event-Loop, ohne einen Thread zu belegen.
+
+        Raises:
+            PasswordPoolSaturatedError: Falls bereits `max_workers + queue_limit` Aufgaben anstehen.
+        """
+        self._admit()
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def reserve(self) -> PasswordPoolReservation:
+        """
+        Reserviert vorab einen Platz (Admission), z. B. vor dem DB-Lookup eines Logins.
+
+        Ein voller Pool wird so abgewiesen, bevor irgendein Thread belegt wird.
+
+        Raises:
+            PasswordPoolSaturatedError: Falls bereits `max_workers + queue_limit` Aufgaben anstehen.
+        """
+        self._admit()
+        return PasswordPoolReservation(self)
+
+    def _admit(self) -> None:
+        """Zählt eine Aufgabe ein oder wirft sofort `PasswordPoolSaturatedError`."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.queue_limit:
+                self._rejected += 1
+                queued = self._in_flight - self._active
+                LOG.warning(
+                    "password_pool_saturated",
+                    extra={"queued": queued, "queue_limit": self.queue_limit, "rejected_total": self._rejected},
+                )
+                raise PasswordPoolSaturatedError("password hashing queue is full")
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _submit(self, fn: Callable[..., T], *args: object) -> Future[T]:
+        """Übergibt eine bereits eingezählte Aufgabe an den Executor."""
+        try:
+            future = self._executor.submit(self._invoke, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Vor dem Start abgebrochene Aufgaben (z. B. abgebrochener Request) geben ihren Platz frei
+        future.add_done_callback(lambda f: self._release() if f.cancelled() else None)
+        return future
+
+    def _invoke(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._in_flight -= 1
+                self._completed += 1
+
+    def stats(self) -> PasswordPoolStats:
+        with self._lock:
+            return PasswordPoolStats(
+                workers=self.max_workers,
+                queue_limit=self.queue_limit,
+                active=self._active,
+                queued=self._in_flight - self._active,
+                completed_total=self._completed,
+                rejected_total=self._rejected,
+            )
+
+
+class PasswordPoolReservation:
+    """
+    Vorab reservierter Platz im Passwort-Pool.
+
+    Als Context-Manager: Wird der Platz nicht per `run` genutzt (z. B. unbekannter
+    Benutzer, Fehler im DB-Lookup), gibt `__exit__` ihn wieder frei.
+    """
+
+    def __init__(self, pool: BoundedPasswordExecutor) -> None:
+        self._pool = pool
+        self._held = True
+
+    async def run(self, fn: Callable[..., T], *args: object) -> T:
+        """Führt `fn(*args)` auf dem reservierten Platz aus (einmalig)."""
+        if not self._held:
+            raise RuntimeError("password pool reservation already used")
+        self._held = False
+        return await asyncio.wrap_future(self._pool._submit(fn, *args))
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            self._pool._release()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.release()
+
+
+# Globale Singleton-Instanz für die gesamte Anwendung
+_global_password_pool = BoundedPasswordExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+
+
+def get_password_pool() -> BoundedPasswordExecutor:
+    """
+    Gibt die globale Singleton-Instanz des Passwort-Pools zurück.
+
+    Returns:
+        Die globale BoundedPasswordExecutor-Instanz.
+    """
+    return _global_password_pool
@@ -1,9 +1,40 @@
-"""In-Memory Rate-Limiting für API-Endpunkte."""
+"""In-Memory Rate-Limiting für API-Endpunkte.
+
+Algorithmen (je Regel über `RateRule.algorithm` wählbar):
+- ``sliding_window`` (Default): exaktes gleitendes Fenster; speichert jeden
+  Zeitstempel im Fenster (Speicher O(count) je Key).
+- ``gcra``: Generic Cell Rate Algorithm (Token-Bucket-Äquivalent); speichert nur die
+  "theoretical arrival time" (TAT) je Key (Speicher O(1)). Erlaubt einen Burst von
+  `count` Anfragen und füllt danach gleichmäßig mit `count / window_seconds` auf.
+"""
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import asyncio
+import math
+import threading
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from time import time
+from typing import TYPE_CHECKING, Any, Final, Literal, Protocol
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from ..config.timing_server_loader import RateRuleView
+
+RateAlgorithm = Literal["sliding_window", "gcra"]
+
+SLIDING_WINDOW: Final[RateAlgorithm] = "sliding_window"
+GCRA: Final[RateAlgorithm] = "gcra"
+
+LOG = get_logger("services.rate_limit")
+
+# Toleranz für Gleitkomma-Rundung bei der TAT-Arithmetik (Sekunden)
+_GCRA_EPSILON = 1e-9
 
 
 @dataclass
@@ -11,13 +42,102 @@ class RateRule:
     """Rate-Limit-Regel: Maximalanzahl von Anfragen pro Zeitfenster."""
     count: int
     window_seconds: int
+    algorithm: RateAlgorithm = SLIDING_WINDOW
+
+    @classmethod
+    def from_view(cls, view: RateRuleView) -> RateRule:
+        """Übernimmt eine Regel aus der Timing-Konfiguration (`timing.server.json`)."""
+        algorithm: RateAlgorithm = GCRA if view.algorithm == GCRA else SLIDING_WINDOW
+        return cls(count=view.count, window_seconds=view.window_seconds, algorithm=algorithm)
+
+
+class RateLimiter(Protocol):
+    """
+    Gemeinsame Schnittstelle der Rate-Limiter (In-Memory bzw. Shared State).
+
+    `blocking` kennzeichnet Limiter mit synchroner I/O (SQLite); Async-Routen rufen sie
+    über `call_limiter` auf.
+    """
+
+    blocking: bool
+
+    def allow(self, key: str, rule: RateRule) -> bool: ...
+
+    def remaining(self, key: str, rule: RateRule) -> int: ...
+
+    def reset(self, key: str) -> None: ...
+
+    def refund(self, key: str, rule: RateRule) -> None: ...
+
+
+def gcra_next_tat(tat: float | None, now: float, rule: RateRule) -> float | None:
+    """
+    GCRA-Entscheidung für eine Anfrage.
+
+    Args:
+        tat: Gespeicherte TAT des Keys (None = unbekannter Key).
+        now: Aktueller Zeitpunkt (Sekunden).
+        rule: Rate-Limit-Regel.
+
+    Returns:
+        Neue TAT, falls die Anfrage erlaubt ist, sonst None (Zustand unverändert lassen).
+    """
+    interval = rule.window_seconds / rule.count
+    new_tat = max(tat or now, now) + interval
+    if new_tat - now > rule.window_seconds + _GCRA_EPSILON:
+        return None
+    return new_tat
+
+
+def gcra_remaining(tat: float | None, now: float, rule: RateRule) -> int:
+    """Verbleibende Anfragen (sofort verfügbarer Burst) für eine gespeicherte TAT."""
+    if tat is None or tat <= now:
+        return rule.count
+    interval = rule.window_seconds / rule.count
+    free = math.floor((rule.window_seconds - (tat - now)) / interval + _GCRA_EPSILON)
+    return max(0, min(rule.count, free))
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    """Momentaufnahme eines Limiters; `keys` ist der aktuelle Gauge-Wert (`max_keys=0`: ohne Obergrenze)."""
+
+    keys: int
+    max_keys: int
+    evictions: int
+    swept: int
 
 
 class InMemoryRateLimiter:
-    """Einfacher In-Memory-Rate-Limiter basierend auf Sliding-Window."""
+    """
+    Einfacher In-Memory-Rate-Limiter (Sliding-Window bzw. GCRA je Regel).
 
-    def __init__(self) -> None:
-        self._events: dict[str, deque[float]] = defaultdict(deque)
+    Beide Algorithmen halten getrennten Zustand; ein Key sollte daher stets mit
+    Regeln desselben Algorithmus geprüft werden.
+
+    Speichergrenze: Je Algorithmus werden höchstens `max_keys` Keys gehalten (LRU-Reihenfolge;
+    `max_keys <= 0`: ohne Obergrenze).
+    Beim Überschreiten wird der am längsten unbenutzte Key verworfen; `sweep()` entfernt
+    zusätzlich Keys, deren Fenster bereits leer ist. `remaining()` legt keine Keys an.
+
+    Args:
+        max_keys: Obergrenze je Algorithmus (Default: `RATE_LIMIT_MAX_KEYS`).
+    """
+
+    # Reiner Speicherzugriff unter Lock: direkt im Event-Loop aufrufbar
+    blocking = False
+
+    def __init__(self, max_keys: int | None = None) -> None:
+        from ..core.config import settings
+
+        self.max_keys = settings.RATE_LIMIT_MAX_KEYS if max_keys is None else max_keys
+        self._events: OrderedDict[str, deque[float]] = OrderedDict()
+        self._tat: OrderedDict[str, float] = OrderedDict()
+        # Größtes bisher gesehenes Fenster: Sliding-Window-Keys ohne Event darin sind leer
+        self._max_window = 0
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._swept = 0
 
     def allow(self, key: str, rule: RateRule) -> bool:
         """
@@ -31,17 +151,30 @@ class InMemoryRateLimiter:
             True falls erlaubt, False falls Limit überschritten.
         """
         now = time()
-        window_start = now - rule.window_seconds
-        q = self._events[key]
+        with self._lock:
+            if rule.algorithm == GCRA:
+                new_tat = gcra_next_tat(self._tat.get(key), now, rule)
+                if new_tat is None:
+                    return False
+                self._tat[key] = new_tat
+                self._touch(self._tat, key)
+                return True
+
+            self._max_window = max(self._max_window, rule.window_seconds)
+            window_start = now - rule.window_seconds
+            q = self._events.get(key)
+            if q is None:
+                q = self._events[key] = deque()
 
-        while q and q[0] < window_start:
-            q.popleft()
+            while q and q[0] < window_start:
+                q.popleft()
 
-        if len(q) >= rule.count:
-            return False
+            self._touch(self._events, key)
+            if len(q) >= rule.count:
+                return False
 
-        q.append(now)
-        return True
+            q.append(now)
+            return True
 
     def remaining(self, key: str, rule: RateRule) -> int:
         """
@@ -55,13 +188,84 @@ class InMemoryRateLimiter:
             Anzahl verbleibender erlaubter Anfragen.
         """
         now = time()
-        window_start = now - rule.window_seconds
-        q = self._events[key]
+        with self._lock:
+            if rule.algorithm == GCRA:
+                return gcra_remaining(self._tat.get(key), now, rule)
+
+            q = self._events.get(key)
+            if not q:
+                return rule.count
+
+            window_start = now - rule.window_seconds
+            while q and q[0] < window_start:
+                q.popleft()
+
+            return max(0, rule.count - len(q))
+
+    def reset(self, key: str) -> None:
+        """Verwirft den Zustand eines Keys (z. B. Fehlversuche nach erfolgreichem Login)."""
+        with self._lock:
+            self._events.pop(key, None)
+            self._tat.pop(key, None)
+
+    def refund(self, key: str, rule: RateRule) -> None:
+        """Gibt eine zuvor per `allow` gezählte Anfrage zurück (jüngstes Event bzw. ein GCRA-Intervall)."""
+        now = time()
+        with self._lock:
+            if rule.algorithm == GCRA:
+                tat = self._tat.get(key)
+                if tat is None:
+                    return
+                tat -= rule.window_seconds / rule.count
+                if tat <= now:
+                    del self._tat[key]
+                else:
+                    self._tat[key] = tat
+                return
+
+            q = self._events.get(key)
+            if q:
+                q.pop()
+
+    def sweep(self) -> int:
+        """
+        Entfernt Keys, deren Fenster leer ist (Sliding-Window) bzw. deren Burst voll ist (GCRA).
+
+        Returns:
+            Anzahl entfernter Keys.
+        """
+        now = time()
+        with self._lock:
+            window_start = now - self._max_window
+            idle_events = [k for k, q in self._events.items() if not q or q[-1] < window_start]
+            for k in idle_events:
+                del self._events[k]
 
-        while q and q[0] < window_start:
-            q.popleft()
+            idle_tat = [k for k, tat in self._tat.items() if tat <= now]
+            for k in idle_tat:
+                del self._tat[k]
 
-        return max(0, rule.count - len(q))
+            removed = len(idle_events) + len(idle_tat)
+            self._swept += removed
+            return removed
+
+    def stats(self) -> RateLimiterStats:
+        with self._lock:
+            return RateLimiterStats(
+                keys=len(self._events) + len(self._tat),
+                max_keys=self.max_keys,
+                evictions=self._evictions,
+                swept=self._swept,
+            )
+
+    def _touch(self, entries: OrderedDict[str, Any], key: str) -> None:
+        """Markiert `key` als zuletzt benutzt und erzwingt die Obergrenze (Lock gehalten)."""
+        entries.move_to_end(key)
+        if self.max_keys <= 0:
+            return  # ohne Obergrenze
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
+            self._evictions += 1
 
 
 def parse_rule(expr: str) -> RateRule:
@@ -82,3 +286,89 @@ def parse_rule(expr: str) -> RateRule:
         raise ValueError("Invalid rate limit expression, expected 'N/W'")
 
     return RateRule(count=int(parts[0]), window_seconds=int(parts[1]))
+
+
+def create_rate_limiter() -> RateLimiter:
+    """
+    Erzeugt den Rate-Limiter gemäß `SHARED_STATE_BACKEND`.
+
+    ``sqlite``: Zustand wird von allen Workern des Hosts geteilt; sonst In-Memory je Prozess.
+    """
+    from ..core.config import settings
+
+    if settings.SHARED_STATE_BACKEND == "sqlite":
+        # Lokaler Import: shared_state importiert RateRule aus diesem Modul
+        from .shared_state import SQLiteRateLimiter, get_shared_state_store
+
+        limiter: _SweepableLimiter = SQLiteRateLimiter(get_shared_state_store())
+    else:
+        limiter = InMemoryRateLimiter()
+    _sweepable.add(limiter)
+    return limiter
+
+
+async def call_limiter[T](blocking: bool, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Ruft eine Limiter-Operation aus Async-Code auf.
+
+    Blockierende Limiter (SQLite, `blocking=True`) laufen im Threadpool, damit der Event-Loop
+    nicht auf Datei-I/O bzw. `busy_timeout` wartet; In-Memory-Limiter werden direkt aufgerufen.
+    """
+    if blocking:
+        return await run_in_threadpool(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
+
+
+class _SweepableLimiter(RateLimiter, Protocol):
+    def sweep(self) -> int: ...
+
+    def stats(self) -> RateLimiterStats: ...
+
+
+def _sweep_once(limiter: _SweepableLimiter) -> tuple[int, RateLimiterStats]:
+    return limiter.sweep(), limiter.stats()
+
+
+# Von `create_rate_limiter` erzeugte Limiter (Routen-Module) für den Sweeper
+_sweepable: weakref.WeakSet[_SweepableLimiter] = weakref.WeakSet()
+
+
+async def rate_limit_sweep_loop(
+        interval_seconds: float | None = None,
+        *,
+        max_runs: int | None = None,
+) -> None:
+    """
+    Entfernt periodisch leere Fenster aus allen Limitern und loggt den Key-Gauge.
+
+    SQLite-Limiter löschen dabei global abgelaufene Zeilen aus `rate_events`/`rate_tat`
+    (im Threadpool).
+
+    Args:
+        interval_seconds: Pause zwischen zwei Durchläufen (Default: `RATE_LIMIT_SWEEP_SECONDS`,
+            <= 0 deaktiviert den Sweeper).
+        max_runs: Optionale Begrenzung der Anzahl Durchläufe (nur Tests).
+    """
+    from ..core.config import settings
+
+    interval = settings.RATE_LIMIT_SWEEP_SECONDS if interval_seconds is None else interval_seconds
+    if interval <= 0:
+        return
+
+    runs = 0
+    while True:
+        for limiter in list(_sweepable):
+            try:
+                removed, stats = await call_limiter(limiter.blocking, _sweep_once, limiter)
+                LOG.info(
+                    "rate_limiter_swept",
+                    extra={"removed": removed, "keys": stats.keys, "evictions": stats.evictions},
+                )
+            except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Sweeper darf nicht abbrechen
+                LOG.warning("rate_limiter_sweep_failed", exc_info=exc)
+
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            break
+
+        await asyncio.sleep(interval)
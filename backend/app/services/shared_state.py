@@ -0,0 +1,338 @@
+"""
+Prozessübergreifender Shared State (Token-Blacklist, Rate-Limits) auf SQLite-WAL-Basis.
+
+Mehrere Uvicorn-Worker eines Hosts teilen sich eine SQLite-Datei im WAL-Modus; es wird
+kein externer Dienst benötigt. Auswahl über `SHARED_STATE_BACKEND`:
+
+- ``memory`` (Default): bisheriges Verhalten (`InMemoryBackend`, `InMemoryRateLimiter`),
+  Zustand je Prozess.
+- ``sqlite``: `SQLiteCacheBackend` (fastapi-cache2-Backend) und `SQLiteRateLimiter`
+  auf `SHARED_STATE_PATH`.
+
+Jede Hot-Path-Operation ist genau ein Roundtrip: `get` ist ein einzelnes SELECT,
+`SQLiteRateLimiter.allow` eine einzige Transaktion (Aufräumen, Zählen, Eintragen).
+Für mehrere Schlüssel gibt es `get_many` (ein SELECT ... IN).
+
+Hinweis: sqlite3 blockiert (bis `busy_timeout` bei Schreibkonflikten). Die async-Methoden
+des Cache-Backends laufen daher im Threadpool; `SQLiteRateLimiter` und `SQLiteGenerations`
+sind synchron und markieren sich mit `blocking = True`, Async-Aufrufer lagern sie aus
+(`rate_limit.call_limiter`).
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi_cache.types import Backend
+
+from ..core.config import settings
+from ..core.logging_config import get_logger
+from .rate_limit import GCRA, RateLimiterStats, RateRule, gcra_next_tat, gcra_remaining
+
+LOG = get_logger("services.shared_state")
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS kv ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL) WITHOUT ROWID"
+    ),
+    "CREATE TABLE IF NOT EXISTS rate_events (key TEXT NOT NULL, ts REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_rate_events_key_ts ON rate_events (key, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_rate_events_ts ON rate_events (ts)",
+    "CREATE TABLE IF NOT EXISTS rate_tat (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID",
+    # Größtes Sliding-Window aller Worker: Grenze für das globale Aufräumen von rate_events
+    "CREATE TABLE IF NOT EXISTS rate_meta (key TEXT PRIMARY KEY, value REAL NOT NULL) WITHOUT ROWID",
+)
+
+_MAX_WINDOW_KEY = "max_window"
+
+# Abgelaufene kv-Zeilen werden opportunistisch alle N Schreibvorgänge gelöscht
+_PURGE_EVERY_WRITES = 1000
+
+
+class SQLiteStateStore:
+    """
+    Verbindungsverwaltung für die Shared-State-Datei (eine Verbindung je Thread).
+
+    Args:
+        path: Pfad der SQLite-Datei (wird bei Bedarf angelegt).
+        busy_timeout_ms: Maximale Wartezeit bei gesperrter Datenbank.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 2000) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; Transaktionen werden explizit per BEGIN gesteuert
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for ddl in _SCHEMA:
+                conn.execute(ddl)
+            self._local.conn = conn
+        return conn
+
+
+class SQLiteCacheBackend(Backend):
+    """
+    fastapi-cache2-Backend auf SQLite-WAL, geteilt von allen Workern eines Hosts.
+
+    `expire=None` bedeutet "ohne Ablauf" (wie beim Redis-Backend).
+    """
+
+    def __init__(self, store: SQLiteStateStore) -> None:
+        self._store = store
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        return await run_in_threadpool(self._get_with_ttl, key)
+
+    async def get(self, key: str) -> bytes | None:
+        return await run_in_threadpool(self._get, key)
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Liest mehrere Schlüssel in einem Roundtrip; Reihenfolge wie `keys`."""
+        if not keys:
+            return []
+        return await run_in_threadpool(self._get_many, keys)
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        await run_in_threadpool(self._set, key, value, expire)
+
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        return await run_in_threadpool(self._clear, namespace, key)
+
+    def _get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        now = time.time()
+        row = self._store.connection().execute(
+            "SELECT value, expires_at FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return 0, None
+        value, expires_at = row
+        return (-1 if expires_at is None else int(expires_at - now)), value
+
+    def _get(self, key: str) -> bytes | None:
+        row = self._store.connection().execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        placeholders = ",".join("?" for _ in keys)
+        rows = self._store.connection().execute(
+            # Nur "?"-Platzhalter werden eingesetzt; Werte laufen als Parameter
+            f"SELECT key, value FROM kv WHERE key IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)",  # noqa: S608
+            (*keys, time.time()),
+        ).fetchall()
+        found = dict(rows)
+        return [found.get(k) for k in keys]
+
+    def _set(self, key: str, value: bytes, expire: int | None) -> None:
+        now = time.time()
+        conn = self._store.connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, None if expire is None else now + expire),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            purge = self._writes % _PURGE_EVERY_WRITES == 0
+        if purge:
+            conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+    def _clear(self, namespace: str | None, key: str | None) -> int:
+        conn = self._store.connection()
+        if namespace:
+            pattern = namespace.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            cur = conn.execute("DELETE FROM kv WHERE key LIKE ? ESCAPE '\\'", (pattern,))
+        elif key:
+            cur = conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+        else:
+            return 0
+        return cur.rowcount or 0
+
+
+class SQLiteRateLimiter:
+    """
+    Rate-Limiter mit geteiltem Zustand (gleiche API wie `InMemoryRateLimiter`).
+
+    `allow` läuft als eine `BEGIN IMMEDIATE`-Transaktion, damit parallele Worker das
+    Limit nicht gemeinsam überschreiten. GCRA-Regeln nutzen eine Zeile je Key
+    (`rate_tat`) statt einer Zeile je Anfrage.
+
+    `sweep()` räumt beide Tabellen global auf (nicht nur je Key beim nächsten `allow`);
+    der Sweeper (`rate_limit_sweep_loop`) ruft ihn periodisch im Threadpool auf.
+    """
+
+    # Synchrone Datei-I/O: Async-Aufrufer lagern Aufrufe in den Threadpool aus
+    blocking = True
+
+    def __init__(self, store: SQLiteStateStore) -> None:
+        self._store = store
+        # Bereits in rate_meta eingetragenes Fenster (vermeidet Schreibzugriffe je Anfrage)
+        self._known_window = 0
+        self._swept = 0
+
+    def allow(self, key: str, rule: RateRule) -> bool:
+        now = time.time()
+        if rule.algorithm == GCRA:
+            return self._allow_gcra(key, rule, now)
+
+        window_start = now - rule.window_seconds
+        conn = self._store.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if rule.window_seconds > self._known_window:
+                conn.execute(
+                    "INSERT INTO rate_meta (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (_MAX_WINDOW_KEY, rule.window_seconds),
+                )
+            conn.execute("DELETE FROM rate_events WHERE key = ? AND ts < ?", (key, window_start))
+            (count,) = conn.execute("SELECT COUNT(*) FROM rate_events WHERE key = ?", (key,)).fetchone()
+            allowed = count < rule.count
+            if allowed:
+                conn.execute("INSERT INTO rate_events (key, ts) VALUES (?, ?)", (key, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._known_window = max(self._known_window, rule.window_seconds)
+        return allowed
+
+    def remaining(self, key: str, rule: RateRule) -> int:
+        if rule.algorithm == GCRA:
+            row = self._store.connection().execute("SELECT tat FROM rate_tat WHERE key = ?", (key,)).fetchone()
+            return gcra_remaining(row[0] if row else None, time.time(), rule)
+
+        window_start = time.time() - rule.window_seconds
+        (count,) = self._store.connection().execute(
+            "SELECT COUNT(*) FROM rate_events WHERE key = ? AND ts >= ?", (key, window_start)
+        ).fetchone()
+        return max(0, rule.count - count)
+
+    def reset(self, key: str) -> None:
+        conn = self._store.connection()
+        conn.execute("DELETE FROM rate_events WHERE key = ?", (key,))
+        conn.execute("DELETE FROM rate_tat WHERE key = ?", (key,))
+
+    def refund(self, key: str, rule: RateRule) -> None:
+        conn = self._store.connection()
+        if rule.algorithm == GCRA:
+            conn.execute(
+                "UPDATE rate_tat SET tat = tat - ? WHERE key = ?", (rule.window_seconds / rule.count, key)
+            )
+            return
+        conn.execute(
+            "DELETE FROM rate_events WHERE rowid = "
+            "(SELECT rowid FROM rate_events WHERE key = ? ORDER BY ts DESC LIMIT 1)",
+            (key,),
+        )
+
+    def sweep(self) -> int:
+        """
+        Löscht Events außerhalb des größten bekannten Fensters und GCRA-Keys mit vollem Burst.
+
+        Returns:
+            Anzahl gelöschter Zeilen.
+        """
+        now = time.time()
+        conn = self._store.connection()
+        removed = 0
+        row = conn.execute("SELECT value FROM rate_meta WHERE key = ?", (_MAX_WINDOW_KEY,)).fetchone()
+        if row is not None:
+            removed += conn.execute("DELETE FROM rate_events WHERE ts < ?", (now - row[0],)).rowcount or 0
+        removed += conn.execute("DELETE FROM rate_tat WHERE tat <= ?", (now,)).rowcount or 0
+        self._swept += removed
+        return removed
+
+    def stats(self) -> RateLimiterStats:
+        conn = self._store.connection()
+        (events_keys,) = conn.execute("SELECT COUNT(DISTINCT key) FROM rate_events").fetchone()
+        (tat_keys,) = conn.execute("SELECT COUNT(*) FROM rate_tat").fetchone()
+        # Keine Key-Obergrenze/LRU-Verdrängung: Größe wird allein über `sweep` begrenzt
+        return RateLimiterStats(keys=events_keys + tat_keys, max_keys=0, evictions=0, swept=self._swept)
+
+    def _allow_gcra(self, key: str, rule: RateRule, now: float) -> bool:
+        conn = self._store.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_tat WHERE key = ?", (key,)).fetchone()
+            new_tat = gcra_next_tat(row[0] if row else None, now, rule)
+            if new_tat is not None:
+                conn.execute(
+                    "INSERT INTO rate_tat (key, tat) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                    (key, new_tat),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return new_tat is not None
+
+
+class SQLiteGenerations:
+    """
+    Geteilte Generationszähler (z. B. Invalidierung des Feed-Caches über Worker hinweg).
+
+    Zähler liegen als kv-Zeilen mit Ablaufzeit. `bump` setzt atomar
+    `max(alt + 1, time_ns())`: Werte steigen streng und werden auch nach Ablauf einer
+    Zeile nie wiederverwendet, sodass alte Einträge nie erneut adressiert werden.
+    """
+
+    # Synchrone Datei-I/O: Async-Aufrufer lagern Aufrufe in den Threadpool aus
+    blocking = True
+
+    def __init__(self, store: SQLiteStateStore) -> None:
+        self._store = store
+
+    def current(self, key: str) -> int:
+        row = self._store.connection().execute(
+            "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def bump(self, key: str, ttl_seconds: float) -> int:
+        (generation,) = self._store.connection().execute(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = MAX(value + 1, excluded.value), "
+            "expires_at = excluded.expires_at RETURNING value",
+            (key, time.time_ns(), time.time() + ttl_seconds),
+        ).fetchone()
+        return int(generation)
+
+
+_store_lock = threading.Lock()
+_global_store: SQLiteStateStore | None = None
+
+
+def get_shared_state_store() -> SQLiteStateStore:
+    """Gibt die globale Shared-State-Datei (lazy) zurück."""
+    global _global_store
+    with _store_lock:
+        if _global_store is None:
+            _global_store = SQLiteStateStore(settings.SHARED_STATE_PATH)
+            LOG.info("shared_state_opened", extra={"path": settings.SHARED_STATE_PATH})
+        return _global_store
+
+
+def create_cache_backend() -> Backend:
+    """Erzeugt das Cache-Backend gemäß `SHARED_STATE_BACKEND`."""
+    if settings.SHARED_STATE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(get_shared_state_store())
+
+    from fastapi_cache.backends.inmemory import InMemoryBackend
+
+    return InMemoryBackend()
@@ -1,9 +1,20 @@
 from .blacklist import is_access_token_blacklisted, blacklist_access_token
-from .maintance import cleanup_loop, purge_expired_refresh_tokens
+from .blacklist_filter import blacklist_filter_loop, get_blacklist_filter
+from .claims_cache import VerifiedClaimsCache, get_claims_cache
+from .maintance import PurgeReport, cleanup_loop, purge_expired_refresh_tokens, purge_expired_refresh_tokens_batched
+from .refresh_single_flight import RefreshSingleFlight, get_refresh_single_flight
 
 __all__ = [
     "is_access_token_blacklisted",
     "blacklist_access_token",
+    "blacklist_filter_loop",
+    "get_blacklist_filter",
+    "VerifiedClaimsCache",
+    "get_claims_cache",
     "cleanup_loop",
     "purge_expired_refresh_tokens",
+    "purge_expired_refresh_tokens_batched",
+    "PurgeReport",
+    "RefreshSingleFlight",
+    "get_refresh_single_flight",
 ]
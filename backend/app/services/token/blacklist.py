@@ -4,9 +4,14 @@ from datetime import UTC, datetime
 from typing import Final
 
 from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.types import Backend
 
 from app.core.logging_config import get_logger
 
+from .blacklist_filter import get_blacklist_filter
+from .claims_cache import get_claims_cache
+
 LOG = get_logger("services.token_blacklist")
 
 _KEY_PREFIX: Final[str] = "token_blacklist"
@@ -16,6 +21,18 @@ def _key_for_jti(jti: str) -> str:
     return f"{_KEY_PREFIX}:{jti}"
 
 
+def _filter_is_authoritative(backend: Backend) -> bool:
+    """
+    True, falls ein "nicht enthalten" des lokalen Filters verbindlich ist.
+
+    Nur bei prozesslokalem Backend: Jeder Blacklist-Eintrag wird dann in diesem Prozess
+    geschrieben und synchron in den Filter übernommen. Bei geteiltem Backend (SQLite,
+    Redis) kann ein anderer Worker seit dem letzten Sync gesperrt haben – dort wird
+    immer das Backend gefragt.
+    """
+    return isinstance(backend, InMemoryBackend)
+
+
 async def blacklist_access_token(jti: str, expires_at: datetime) -> None:
     """
     Fügt den gegebenen Access-Token (jti) zur Blacklist bis expires_at hinzu.
@@ -31,6 +48,9 @@ async def blacklist_access_token(jti: str, expires_at: datetime) -> None:
         jti: JWT-ID des Tokens.
         expires_at: Ablaufzeitpunkt des Tokens.
     """
+    # Verifizierte Claims sofort verwerfen, damit der Token nicht mehr aus dem Cache akzeptiert wird
+    get_claims_cache().revoke_jti(jti)
+
     try:
         backend = FastAPICache.get_backend()
 
@@ -55,13 +75,23 @@ async def blacklist_access_token(jti: str, expires_at: datetime) -> None:
     except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Cache-Schreibfehler → Fail‑open, nur warnen
         LOG.warning("blacklist_set_failed", extra={"jti": jti}, exc_info=exc)
 
+    # Negativ-Filter lokal füttern und den betroffenen Bucket für andere Worker veröffentlichen
+    flt = get_blacklist_filter()
+    if flt is not None:
+        bucket = flt.add(jti, exp_at.timestamp())
+        try:
+            await flt.sync([bucket])
+        except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: andere Worker holen den Stand beim nächsten Sync
+            LOG.warning("blacklist_filter_publish_failed", extra={"jti": jti}, exc_info=exc)
+
 
 async def is_access_token_blacklisted(jti: str) -> bool:
     """
     Prüft, ob die gegebene jti auf der Blacklist steht.
 
     Fail-open bei Cache-Fehlern (behandelt als nicht blacklisted), um Verfügbarkeit
-    zu erhalten.
+    zu erhalten. Meldet der lokale Negativ-Filter "nicht enthalten" und ist das Backend
+    prozesslokal (`_filter_is_authoritative`), entfällt der Backend-Lookup.
 
     Args:
         jti: JWT-ID des zu prüfenden Tokens.
@@ -76,11 +106,17 @@ async def is_access_token_blacklisted(jti: str) -> bool:
         LOG.warning("blacklist_no_cache_backend", exc_info=exc)
         return False
 
+    flt = get_blacklist_filter() if _filter_is_authoritative(backend) else None
+    if flt is not None and flt.ready and not flt.might_contain(jti):
+        return False
+
     try:
         value = await backend.get(_key_for_jti(jti))
         hit = bool(value)
         if hit:
             LOG.info("token_blacklist_hit", extra={"jti": jti})
+        elif flt is not None and flt.ready:
+            flt.record_false_positive()
 
         return hit
 
@@ -0,0 +1,251 @@
+"""
+Lokaler Bloom-Filter als Negativ-Filter vor der Access-Token-Blacklist.
+
+Fast alle JTIs sind nicht gesperrt. Meldet der Filter "sicher nicht enthalten", spart
+`is_access_token_blacklisted` den Backend-Lookup; nur bei einem (möglichen) Treffer
+wird das Cache-Backend gefragt. False Positives kosten also nur den bisherigen Lookup.
+
+Alterung: JTIs werden nach ihrem Ablaufzeitpunkt in Buckets (`bucket_seconds`)
+einsortiert. Ein Bucket, dessen Ende vorbei ist, enthält nur abgelaufene Tokens und
+wird beim periodischen Rebuild (`prune`) komplett verworfen.
+
+Worker-Sync: Jeder Bucket liegt zusätzlich unter `token_blacklist:bloom:{bucket}` im
+Cache-Backend. `sync` verodert lokale und geteilte Bits und schreibt das Ergebnis
+zurück; Bloom-Filter gleicher Größe lassen sich so verlustfrei vereinigen.
+Bis zum ersten erfolgreichen Sync (`ready`) wird immer das Backend gefragt.
+
+Verbindlich ist ein "nicht enthalten" nur bei prozesslokalem Backend; bei geteiltem
+Backend kennt der Filter fremde Sperren erst nach dem nächsten Sync, daher fragt
+`is_access_token_blacklisted` dort stets das Backend (siehe `_filter_is_authoritative`).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Final, Iterable
+
+from fastapi_cache import FastAPICache
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+LOG = get_logger("services.token_blacklist_filter")
+
+_SHARED_KEY_PREFIX: Final[str] = "token_blacklist:bloom"
+
+
+class JtiBloomFilter:
+    """Einfacher Bloom-Filter (Double Hashing über BLAKE2b) mit Byte-Serialisierung."""
+
+    def __init__(self, size_bits: int, num_hashes: int, bits: bytes | None = None) -> None:
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self._bits = bytearray(bits) if bits is not None else bytearray(math.ceil(size_bits / 8))
+
+    def _positions(self, jti: str) -> Iterable[int]:
+        digest = hashlib.blake2b(jti.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.num_hashes))
+
+    def add(self, jti: str) -> None:
+        for pos in self._positions(jti):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, jti: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(jti))
+
+    def merge(self, other_bits: bytes) -> bool:
+        """Verodert fremde Bits; True, falls sich der lokale Filter dadurch geändert hat."""
+        if len(other_bits) != len(self._bits):
+            return False
+        merged = (int.from_bytes(self._bits, "big") | int.from_bytes(other_bits, "big")).to_bytes(len(self._bits), "big")
+        changed = merged != self._bits
+        self._bits = bytearray(merged)
+        return changed
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+
+@dataclass(frozen=True)
+class BlacklistFilterStats:
+    buckets: int
+    ready: bool
+    negatives: int
+    positives: int
+    false_positives: int
+
+
+class BlacklistNegativeFilter:
+    """
+    Zeitlich gebucketete Bloom-Filter für gesperrte JTIs inkl. Rebuild und Worker-Sync.
+
+    Thread-Safety: Bucket-Zugriffe sind per `threading.Lock` geschützt.
+    """
+
+    def __init__(self, *, size_bits: int, num_hashes: int, bucket_seconds: int) -> None:
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self.bucket_seconds = max(1, bucket_seconds)
+        self._buckets: dict[int, JtiBloomFilter] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self._negatives = 0
+        self._positives = 0
+        self._false_positives = 0
+
+    def _bucket_for(self, expires_at: float) -> int:
+        # Bucket-Ende (bucket * bucket_seconds) liegt nie vor dem Token-Ablauf
+        return math.ceil(expires_at / self.bucket_seconds)
+
+    def _bucket_end(self, bucket: int) -> float:
+        return float(bucket * self.bucket_seconds)
+
+    def add(self, jti: str, expires_at: float) -> int:
+        """Nimmt eine gesperrte JTI auf; liefert den Bucket (für gezielten Sync)."""
+        bucket = self._bucket_for(expires_at)
+        with self._lock:
+            flt = self._buckets.get(bucket)
+            if flt is None:
+                flt = self._buckets[bucket] = JtiBloomFilter(self.size_bits, self.num_hashes)
+            flt.add(jti)
+        return bucket
+
+    def might_contain(self, jti: str) -> bool:
+        """False: sicher nicht gesperrt. True: möglicherweise gesperrt (Backend fragen)."""
+        now = time.time()
+        with self._lock:
+            hit = any(
+                self._bucket_end(bucket) > now and flt.might_contain(jti) for bucket, flt in self._buckets.items()
+            )
+            if hit:
+                self._positives += 1
+            else:
+                self._negatives += 1
+        return hit
+
+    def record_false_positive(self) -> None:
+        with self._lock:
+            self._false_positives += 1
+
+    def prune(self, now: float | None = None) -> int:
+        """Rebuild: verwirft Buckets, deren Tokens alle abgelaufen sind. Liefert die Anzahl."""
+        ref_now = time.time() if now is None else now
+        with self._lock:
+            expired = [b for b in self._buckets if self._bucket_end(b) <= ref_now]
+            for bucket in expired:
+                del self._buckets[bucket]
+        return len(expired)
+
+    async def sync(self, buckets: Iterable[int] | None = None) -> None:
+        """
+        Gleicht Buckets mit dem geteilten Stand im Cache-Backend ab (Vereinigung per OR).
+
+        Ohne Angabe werden alle lokal bekannten sowie alle für aktuell gültige Tokens
+        möglichen Buckets abgeglichen.
+        """
+        now = time.time()
+        if buckets is None:
+            # Lazy import, um Zyklen zu vermeiden
+            from app.config.timing_server_loader import get_access_token_ttl
+
+            first = self._bucket_for(now)
+            last = self._bucket_for(now + get_access_token_ttl().total_seconds())
+            with self._lock:
+                candidates = set(range(first, last + 1)) | set(self._buckets)
+        else:
+            candidates = set(buckets)
+
+        live = sorted(b for b in candidates if self._bucket_end(b) > now)
+        backend = FastAPICache.get_backend()
+        keys = [f"{_SHARED_KEY_PREFIX}:{bucket}" for bucket in live]
+        get_many = getattr(backend, "get_many", None)
+        # Geteilte Backends lesen alle Buckets in einem Roundtrip
+        remotes = await get_many(keys) if get_many is not None else [await backend.get(k) for k in keys]
+
+        for bucket, key, remote in zip(live, keys, remotes):
+            with self._lock:
+                local = self._buckets.get(bucket)
+                if remote and local is None:
+                    local = self._buckets[bucket] = JtiBloomFilter(self.size_bits, self.num_hashes, remote)
+                    continue
+                if local is None:
+                    continue
+                if remote:
+                    local.merge(remote)
+                payload = local.to_bytes()
+
+            if payload != remote:
+                await backend.set(key, payload, expire=int(self._bucket_end(bucket) - now) + 1)
+
+        self.ready = True
+
+    def stats(self) -> BlacklistFilterStats:
+        with self._lock:
+            return BlacklistFilterStats(
+                buckets=len(self._buckets),
+                ready=self.ready,
+                negatives=self._negatives,
+                positives=self._positives,
+                false_positives=self._false_positives,
+            )
+
+
+# Globale Singleton-Instanz für die gesamte Anwendung
+_global_blacklist_filter = BlacklistNegativeFilter(
+    size_bits=settings.BLACKLIST_FILTER_BITS,
+    num_hashes=settings.BLACKLIST_FILTER_HASHES,
+    bucket_seconds=settings.BLACKLIST_FILTER_BUCKET_SECONDS,
+)
+
+
+def get_blacklist_filter() -> BlacklistNegativeFilter | None:
+    """
+    Gibt den globalen Negativ-Filter zurück; None, falls deaktiviert.
+
+    Returns:
+        Die globale BlacklistNegativeFilter-Instanz oder None.
+    """
+    if settings.BLACKLIST_FILTER_SYNC_SECONDS <= 0:
+        return None
+    return _global_blacklist_filter
+
+
+async def blacklist_filter_loop(
+        interval_seconds: float | None = None,
+        *,
+        max_runs: int | None = None,
+) -> None:
+    """
+    Periodischer Rebuild (abgelaufene Buckets verwerfen) und Worker-Sync des Filters.
+
+    Args:
+        interval_seconds: Pause zwischen zwei Durchläufen (Default: Settings).
+        max_runs: Optionale Begrenzung der Anzahl Durchläufe (nur Tests).
+    """
+    flt = get_blacklist_filter()
+    if flt is None:
+        return
+
+    interval = settings.BLACKLIST_FILTER_SYNC_SECONDS if interval_seconds is None else interval_seconds
+    runs = 0
+
+    while True:
+        try:
+            pruned = flt.prune()
+            await flt.sync()
+            if pruned:
+                LOG.info("blacklist_filter_pruned", extra={"buckets": pruned})
+        except Exception as exc:  # noqa: BLE001  # bewusstes Catch-All: Filter bleibt im Fallback-Modus (Backend-Lookup)
+            LOG.warning("blacklist_filter_sync_failed", exc_info=exc)
+
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            break
+
+        await asyncio.sleep(interval)
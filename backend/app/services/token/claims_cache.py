@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+LOG = get_logger("services.token_claims_cache")
+
+
+@dataclass(frozen=True)
+class ClaimsCacheStats:
+    """Momentaufnahme der Cache-Zähler."""
+
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    expired: int
+    revoked: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    claims: dict[str, Any]
+    jti: str
+    expires_at: float
+
+
+class VerifiedClaimsCache:
+    """
+    Begrenzter LRU/TTL-Cache bereits verifizierter Access-Token-Claims.
+
+    - Schlüssel ist der SHA-256-Digest des Tokens (kein Klartext-Token im Speicher).
+    - Einträge laufen exakt zum `exp` des Tokens ab.
+    - Ein Eintrag bedeutet: Signatur und Payload geprüft. Die Blacklist wird weiterhin
+      je Request geprüft (Negativ-Filter); `revoke_jti` (Logout) entfernt ihn sofort.
+    - Bei Überschreiten von `max_entries` wird der am längsten unbenutzte Eintrag verdrängt.
+
+    Prozesslokal; ein Logout in einem anderen Worker greift über die (geteilte) Blacklist.
+    """
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] | None = None) -> None:
+        self.max_entries = max(0, max_entries)
+        # time.time() zur Laufzeit auflösen, damit Time-Freeze in Tests greift
+        self._clock = clock if clock is not None else (lambda: time.time())
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._digests_by_jti: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._revoked = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Liefert die verifizierten Claims oder None (Miss/abgelaufen)."""
+        if self.max_entries == 0:
+            return None
+
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                self._drop(digest, entry)
+                self._expired += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return entry.claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """Legt verifizierte Claims ab; benötigt `jti` und `exp` (Unix-Sekunden)."""
+        jti = claims.get("jti")
+        exp = claims.get("exp")
+        if self.max_entries == 0 or not isinstance(jti, str) or not isinstance(exp, int):
+            return
+        if exp <= self._clock():
+            return
+
+        digest = self._digest(token)
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self._digests_by_jti.pop(old.jti, None)
+            self._entries[digest] = _Entry(claims=claims, jti=jti, expires_at=float(exp))
+            self._digests_by_jti[jti] = digest
+            while len(self._entries) > self.max_entries:
+                lru_digest, lru_entry = next(iter(self._entries.items()))
+                self._drop(lru_digest, lru_entry)
+
+    def revoke_jti(self, jti: str) -> None:
+        """Entfernt den Eintrag zu `jti` sofort (z. B. nach Logout/Blacklisting)."""
+        with self._lock:
+            digest = self._digests_by_jti.get(jti)
+            entry = self._entries.get(digest) if digest else None
+            if digest and entry is not None:
+                self._drop(digest, entry)
+                self._revoked += 1
+        LOG.debug("claims_cache_revoked", extra={"jti": jti})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_jti.clear()
+
+    def stats(self) -> ClaimsCacheStats:
+        with self._lock:
+            return ClaimsCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                expired=self._expired,
+                revoked=self._revoked,
+            )
+
+    def _drop(self, digest: str, entry: _Entry) -> None:
+        # Aufrufer hält self._lock
+        self._entries.pop(digest, None)
+        if self._digests_by_jti.get(entry.jti) == digest:
+            del self._digests_by_jti[entry.jti]
+
+
+# Globale Singleton-Instanz für die gesamte Anwendung
+_global_claims_cache = VerifiedClaimsCache(max_entries=settings.JWT_CLAIMS_CACHE_SIZE)
+
+
+def get_claims_cache() -> VerifiedClaimsCache:
+    """
+    Gibt die globale Singleton-Instanz des Claims-Caches zurück.
+
+    Returns:
+        Die globale VerifiedClaimsCache-Instanz.
+    """
+    return _global_claims_cache
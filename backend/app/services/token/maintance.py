@@ -1,19 +1,33 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Optional
 
 from sqlalchemy import or_
-from sqlmodel import Session, delete
+from sqlmodel import Session, col, delete, select
 
-from app.core.database import engine
+from app.core import database
+from app.core.config import settings
 from app.core.logging_config import get_logger
 from app.models.widget import RefreshToken
 
 LOG = get_logger("services.maintenance")
 
 
+@dataclass(frozen=True)
+class PurgeReport:
+    """Ergebnis eines Cleanup-Durchlaufs."""
+
+    rows: int
+    batches: int
+    duration_ms: float
+
+
 def purge_expired_refresh_tokens(
         session: Session,
         *,
@@ -29,22 +43,70 @@ def purge_expired_refresh_tokens(
     Returns:
         Anzahl gelöschter Datensätze.
     """
+    return purge_expired_refresh_tokens_batched(session, now=now).rows
+
+
+def purge_expired_refresh_tokens_batched(
+        session: Session,
+        *,
+        now: datetime | None = None,
+        batch_size: int | None = None,
+        pause_seconds: float | None = None,
+        should_stop: Callable[[], bool] | None = None,
+) -> PurgeReport:
+    """
+    Löscht abgelaufene oder widerrufene Refresh-Tokens in begrenzten Batches.
+
+    Jeder Batch ist eine eigene Transaktion (`DELETE ... WHERE id IN (SELECT ... LIMIT n)`),
+    zwischen den Batches wird kurz pausiert, damit andere Schreiber (Login/Refresh) die
+    Datenbank-Sperre erhalten. Ein großer Rückstand hält die Sperre so nie lange am Stück.
+
+    Args:
+        session: Aktive DB-Session.
+        now: Optional fixer Zeitpunkt für Tests (Default: aktuelles UTC-Datum).
+        batch_size: Zeilen je Transaktion (Default: `TOKEN_PURGE_BATCH_SIZE`).
+        pause_seconds: Pause zwischen Batches (Default: `TOKEN_PURGE_PAUSE_SECONDS`).
+        should_stop: Optionaler Abbruch-Check vor jedem Batch (z. B. beim Shutdown).
+
+    Returns:
+        PurgeReport mit gelöschten Zeilen, Anzahl Batches und Dauer.
+
+    Raises:
+        ValueError: Falls die Batch-Größe < 1 ist (sonst endlose Leer-Batches).
+    """
+    size = settings.TOKEN_PURGE_BATCH_SIZE if batch_size is None else batch_size
+    if size < 1:
+        raise ValueError(f"token purge batch size must be >= 1, got {size}")
     if now is None:
         now = datetime.now(tz=UTC)
+    pause = settings.TOKEN_PURGE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
 
-    stmt = delete(RefreshToken).where(
+    purgeable = select(RefreshToken.id).where(
         or_(
             RefreshToken.expires_at < now,  # type: ignore[arg-type]
             RefreshToken.revoked.is_(True),  # type: ignore[attr-defined]  # noqa: E712
         )
     )
 
-    result = session.exec(stmt)
-    session.commit()
-    deleted = result.rowcount or 0
+    started = time.monotonic()
+    rows = batches = 0
+    while should_stop is None or not should_stop():
+        stmt = delete(RefreshToken).where(col(RefreshToken.id).in_(purgeable.limit(size)))
+        result = session.exec(stmt)
+        session.commit()
+        deleted = result.rowcount or 0
+        rows += deleted
+        batches += 1
+        if deleted < size:
+            break
+        time.sleep(pause)
 
-    LOG.info("purged_refresh_tokens", extra={"count": deleted})
-    return deleted
+    report = PurgeReport(rows=rows, batches=batches, duration_ms=round((time.monotonic() - started) * 1000, 2))
+    LOG.info(
+        "purged_refresh_tokens",
+        extra={"count": report.rows, "batches": report.batches, "duration_ms": report.duration_ms},
+    )
+    return report
 
 
 async def cleanup_loop(
@@ -55,6 +117,10 @@ async def cleanup_loop(
     """
     Periodischer Cleanup-Loop für Refresh-Tokens.
 
+    Der Purge läuft in einem Worker-Thread (`asyncio.to_thread`), damit synchrone
+    DB-Arbeit den Event-Loop nicht blockiert. Wird der Task abgebrochen, endet der
+    laufende Purge nach dem aktuellen Batch.
+
     In Produktion ohne `max_runs` verwenden (endloser Loop).
     In Tests `max_runs` setzen, damit der Task terminieren kann.
 
@@ -63,11 +129,19 @@ async def cleanup_loop(
         max_runs: Optionale Begrenzung der Anzahl Durchläufe (nur Tests).
     """
     runs = 0
+    stop = threading.Event()
+
+    def _purge_blocking() -> PurgeReport:
+        # Engine zur Laufzeit auflösen: init_db kann sie (Nicht-Prod-Fallback) ersetzen
+        with Session(database.engine) as session:
+            return purge_expired_refresh_tokens_batched(session, should_stop=stop.is_set)
 
     while True:
         try:
-            with Session(engine) as session:
-                purge_expired_refresh_tokens(session)
+            await asyncio.to_thread(_purge_blocking)
+        except asyncio.CancelledError:
+            stop.set()
+            raise
         except Exception as exc:  # noqa: BLE001
             LOG.warning("purge_failed", exc_info=exc)
 
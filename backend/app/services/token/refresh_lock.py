@@ -20,10 +20,9 @@ class RefreshTokenLockManager:
     für die Synchronisation zwischen parallelen Requests im selben Prozess.
 
     Bei Multi-Process-Deployments (z.B. mehrere Uvicorn-Worker) bietet dies
-    keinen prozessübergreifenden Schutz. Für solche Szenarien ist ein verteilter Lock
-    (z.B. via Redis) erforderlich. FastAPI-Deployments laufen typischerweise mit einem
-    Worker pro Prozess und asynchroner Verarbeitung, daher genügt thread-basierte
-    Synchronisation in den meisten Fällen.
+    keinen prozessübergreifenden Schutz. Diesen übernimmt `AuthService.rotate_refresh`
+    per Compare-and-set in der Datenbank (`UPDATE ... WHERE revoked = false`); der Lock
+    erspart im Prozess lediglich die unnötigen, verlorenen Versuche.
     """
 
     def __init__(self) -> None:
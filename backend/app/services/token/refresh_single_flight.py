@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+LOG = get_logger("services.token_refresh_single_flight")
+
+
+class RefreshSingleFlight[T]:
+    """
+    Asyncio-natives Single-Flight für die Rotation von Refresh-Tokens.
+
+    Der erste Aufrufer je Token-Digest führt die Rotation aus (als eigener Task, damit ein
+    Verbindungsabbruch des Aufrufers die Rotation nicht abbricht). Gleichzeitige Aufrufer
+    warten auf dasselbe Ergebnis, ohne einen Worker-Thread zu belegen, und erhalten das
+    identische neue Token-Paar bzw. denselben Fehler. Nach Abschluss wird ein erfolgreiches
+    Ergebnis noch `grace_seconds` lang ausgeliefert (Clients, die kurz danach mit dem alten
+    Token nachziehen), ohne erneuten DB-Zugriff.
+
+    Gültigkeit: je Event-Loop/Prozess; prozessübergreifend schützt die Datenbank-Rotation.
+
+    Args:
+        grace_seconds: Nachlaufzeit für abgeschlossene Rotationen (0 = nur gleichzeitige Aufrufer).
+        clock: Monotone Zeitquelle (Sekunden), für Tests übersteuerbar.
+    """
+
+    def __init__(self, grace_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.grace_seconds = grace_seconds
+        self._clock = clock
+        self._inflight: dict[str, asyncio.Task[T]] = {}
+        # digest -> (Ablaufzeitpunkt, Ergebnis); Einfügereihenfolge = Ablaufreihenfolge
+        self._recent: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    async def run(self, token_digest: str, rotate: Callable[[], Awaitable[T]]) -> T:
+        """
+        Führt `rotate` höchstens einmal je Digest aus und teilt das Ergebnis.
+
+        Args:
+            token_digest: Digest des präsentierten Refresh-Tokens.
+            rotate: Coroutine-Factory für die eigentliche Rotation.
+
+        Returns:
+            Ergebnis der (ggf. von einem anderen Aufrufer ausgeführten) Rotation.
+        """
+        self._prune()
+        recent = self._recent.get(token_digest)
+        if recent is not None:
+            LOG.debug("refresh_single_flight_shared", extra={"token_digest_prefix": token_digest[:10], "source": "grace"})
+            return recent[1]
+
+        task = self._inflight.get(token_digest)
+        if task is None:
+            task = asyncio.ensure_future(rotate())
+            self._inflight[token_digest] = task
+            task.add_done_callback(lambda t: self._finish(token_digest, t))
+        else:
+            LOG.debug("refresh_single_flight_shared", extra={"token_digest_prefix": token_digest[:10], "source": "inflight"})
+
+        # shield: Abbruch eines wartenden Aufrufers bricht die gemeinsame Rotation nicht ab
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._recent.clear()
+
+    def _finish(self, token_digest: str, task: asyncio.Task[T]) -> None:
+        self._inflight.pop(token_digest, None)
+        if task.cancelled() or task.exception() is not None:
+            # Fehler werden nicht nachgeliefert; task.exception() markiert sie als abgerufen
+            return
+        if self.grace_seconds > 0:
+            self._recent[token_digest] = (self._clock() + self.grace_seconds, task.result())
+
+    def _prune(self) -> None:
+        now = self._clock()
+        while self._recent:
+            _digest, (expires_at, _result) = next(iter(self._recent.items()))
+            if expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+
+# Globale Singleton-Instanz für die gesamte Anwendung
+_global_refresh_single_flight: RefreshSingleFlight = RefreshSingleFlight(settings.REFRESH_REUSE_GRACE_SECONDS)
+
+
+def get_refresh_single_flight() -> RefreshSingleFlight:
+    """
+    Gibt die globale Singleton-Instanz des RefreshSingleFlight zurück.
+
+    Returns:
+        Die globale RefreshSingleFlight-Instanz.
+    """
+    return _global_refresh_single_flight
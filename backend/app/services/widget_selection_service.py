@@ -7,6 +7,7 @@ from sqlmodel import Session, select
 
 from ..models.user import User
 from ..models.widget import Widget
+from .home_feed_cache import invalidate_home_feed
 
 
 class WidgetSelectionService:
@@ -43,6 +44,7 @@ class WidgetSelectionService:
         self.session.add(widget)
         self.session.commit()
         self.session.refresh(widget)
+        invalidate_home_feed(user.id)
         return widget
 
     def delete_widget(self, user: User, widget_id: int) -> bool:
@@ -62,5 +64,6 @@ class WidgetSelectionService:
 
         self.session.delete(widget)
         self.session.commit()
+        invalidate_home_feed(user.id)
 
         return True
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import time
 from datetime import UTC, datetime, timedelta
 
 import pytest
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
 
+from app.services.token import get_refresh_single_flight
 from tests.utils import auth as auth_utils
 from tests.utils import timing as timing_utils
 
@@ -52,7 +54,7 @@ def test_refresh_token_invalid(client: TestClient) -> None:
     assert response.status_code == 401
 
 
-def test_refresh_token_reuse_denied(client: TestClient) -> None:
+def test_refresh_token_reuse_denied(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
     """
     Stellt sicher, dass ein alter Refresh-Token nach Rotation
     nicht erneut verwendet werden kann (401).
@@ -71,7 +73,14 @@ def test_refresh_token_reuse_denied(client: TestClient) -> None:
     new_refresh = data1["refresh_token"]
     assert new_refresh != old_refresh
 
-    # Wiederverwendung des alten (revokierten) Tokens muss fehlschlagen
+    # Innerhalb der Nachlaufzeit erhält ein verspäteter Retry dasselbe Token-Paar
+    retry = client.post("/api/auth/refresh", json={"refresh_token": old_refresh})
+    assert retry.status_code == 200
+    assert retry.json()["refresh_token"] == new_refresh
+
+    # Nach Ablauf der Nachlaufzeit muss die Wiederverwendung des alten (revokierten) Tokens fehlschlagen
+    flight = get_refresh_single_flight()
+    monkeypatch.setattr(flight, "_clock", lambda: time.monotonic() + flight.grace_seconds + 1)
     response2 = client.post(
         "/api/auth/refresh",
         json={"refresh_token": old_refresh},
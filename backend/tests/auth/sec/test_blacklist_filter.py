@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+
+from app.services.shared_state import SQLiteCacheBackend, SQLiteStateStore
+from app.services.token import blacklist
+from app.services.token.blacklist_filter import BlacklistNegativeFilter, get_blacklist_filter
+from tests.utils import auth as auth_utils
+from tests.utils.emails import email_for_user
+from tests.utils.passwords import valid_password
+
+"""
+Tests für den Bloom-Negativ-Filter vor der Access-Token-Blacklist:
+Treffer/Nicht-Treffer, Alterung per Rebuild und Sync zwischen Workern.
+"""
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def _filter() -> BlacklistNegativeFilter:
+    return BlacklistNegativeFilter(size_bits=1 << 12, num_hashes=5, bucket_seconds=60)
+
+
+@pytest.mark.unit
+def test_filter_reports_added_jtis_and_ages_them_out() -> None:
+    flt = _filter()
+    exp = time.time() + 30
+    flt.add("revoked-jti", exp)
+
+    assert flt.might_contain("revoked-jti")
+    assert not any(flt.might_contain(f"other-{i}") for i in range(50))
+
+    # Rebuild nach Ablauf des Buckets verwirft den Eintrag
+    assert flt.prune(now=exp + 120) == 1
+    assert not flt.might_contain("revoked-jti")
+
+
+@pytest.mark.anyio
+@pytest.mark.integration
+async def test_workers_sync_filter_through_shared_backend(client: TestClient) -> None:
+    worker_a, worker_b = _filter(), _filter()
+    bucket = worker_a.add("jti-from-a", time.time() + 30)
+
+    await worker_a.sync([bucket])
+    assert not worker_b.might_contain("jti-from-a")
+
+    await worker_b.sync()
+    assert worker_b.ready
+    assert worker_b.might_contain("jti-from-a")
+
+
+@pytest.mark.integration
+def test_logout_still_rejects_token_with_filter_active(client: TestClient) -> None:
+    flt = get_blacklist_filter()
+    assert flt is not None
+
+    email, password = email_for_user(1), valid_password()
+    auth_utils.register(client, email, password)
+    access = auth_utils.login(client, email, password).json()["access_token"]
+    other = auth_utils.login(client, email, password).json()["access_token"]
+
+    assert auth_utils.logout(client, access).status_code == 204
+    assert flt.ready
+
+    before = flt.stats()
+    assert auth_utils.get_me(client, access).status_code == 401
+    assert auth_utils.get_me(client, other).status_code == 200
+    after = flt.stats()
+    assert after.positives > before.positives
+    assert after.negatives > before.negatives
+
+
+@pytest.mark.anyio
+@pytest.mark.unit
+async def test_shared_backend_ignores_stale_filter_of_other_worker(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(FastAPICache, "_backend", SQLiteCacheBackend(SQLiteStateStore(str(tmp_path / "s.sqlite"))))
+    worker_a, worker_b = _filter(), _filter()
+    await worker_b.sync()
+    assert worker_b.ready
+
+    # Worker A sperrt und veröffentlicht; Worker B hat noch nicht erneut synchronisiert
+    monkeypatch.setattr(blacklist, "get_blacklist_filter", lambda: worker_a)
+    await blacklist.blacklist_access_token("jti-revoked-on-a", datetime.now(tz=UTC) + timedelta(minutes=5))
+
+    monkeypatch.setattr(blacklist, "get_blacklist_filter", lambda: worker_b)
+    assert not worker_b.might_contain("jti-revoked-on-a")
+    assert await blacklist.is_access_token_blacklisted("jti-revoked-on-a") is True
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.token.claims_cache import VerifiedClaimsCache, get_claims_cache
+from tests.utils import auth as auth_utils
+from tests.utils.emails import email_for_user
+from tests.utils.passwords import valid_password
+
+"""
+Tests für den Cache verifizierter Access-Token-Claims (Ablauf zum `exp`,
+LRU-Begrenzung, sofortige Entfernung bei Logout, Hit-Ratio).
+"""
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _claims(jti: str, exp: int) -> dict:
+    return {"sub": f"{jti}@example.com", "jti": jti, "exp": exp, "type": "access"}
+
+
+@pytest.mark.unit
+def test_entries_expire_at_token_exp() -> None:
+    clock = FakeClock()
+    cache = VerifiedClaimsCache(max_entries=10, clock=clock)
+    cache.put("token-a", _claims("a", exp=1_010))
+
+    assert cache.get("token-a") == _claims("a", exp=1_010)
+    clock.now = 1_010
+    assert cache.get("token-a") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expired, stats.size) == (1, 1, 1, 0)
+    assert stats.hit_ratio == 0.5
+
+
+@pytest.mark.unit
+def test_lru_bound_and_revoke() -> None:
+    cache = VerifiedClaimsCache(max_entries=2, clock=FakeClock())
+    cache.put("token-a", _claims("a", exp=2_000))
+    cache.put("token-b", _claims("b", exp=2_000))
+    assert cache.get("token-a") is not None  # a ist jetzt zuletzt benutzt
+    cache.put("token-c", _claims("c", exp=2_000))
+
+    assert cache.get("token-b") is None
+    assert cache.get("token-a") is not None
+
+    cache.revoke_jti("a")
+    assert cache.get("token-a") is None
+    assert cache.stats().revoked == 1
+
+
+@pytest.mark.integration
+def test_logout_evicts_cached_claims(client: TestClient) -> None:
+    email, password = email_for_user(1), valid_password()
+    auth_utils.register(client, email, password)
+    access = auth_utils.login(client, email, password).json()["access_token"]
+
+    before = get_claims_cache().stats()
+    assert auth_utils.get_me(client, access).status_code == 200
+    assert auth_utils.get_me(client, access).status_code == 200
+    after = get_claims_cache().stats()
+    assert after.hits - before.hits >= 1
+
+    assert auth_utils.logout(client, access).status_code == 204
+    assert auth_utils.get_me(client, access).status_code == 401
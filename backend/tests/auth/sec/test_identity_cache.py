@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.models.user import User
+from app.services.identity_cache import get_identity_cache
+from tests.utils import auth as auth_utils
+from tests.utils.emails import email_for_user
+from tests.utils.passwords import valid_password
+
+"""
+Tests für den Identity-Cache in `get_current_user`: Treffer ohne users-Query,
+Invalidierung bei Upgrade und Deaktivierung.
+"""
+
+pytestmark = pytest.mark.integration
+
+
+def _login(client: TestClient, n: int) -> tuple[str, str]:
+    email, password = email_for_user(n), valid_password()
+    auth_utils.register(client, email, password)
+    return email, auth_utils.login(client, email, password).json()["access_token"]
+
+
+def test_repeated_requests_hit_identity_cache(client: TestClient) -> None:
+    _email, access = _login(client, 1)
+
+    before = get_identity_cache().stats()
+    for _ in range(3):
+        assert auth_utils.get_me(client, access).status_code == 200
+    after = get_identity_cache().stats()
+
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 2
+
+
+def test_upgrade_to_premium_invalidates_identity(client: TestClient) -> None:
+    _email, access = _login(client, 2)
+    assert auth_utils.get_me(client, access).json()["role"] == "common"
+
+    resp = client.post("/api/auth/upgrade-to-premium", headers=auth_utils.auth_headers(access))
+    assert resp.status_code == 200, resp.text
+
+    assert auth_utils.get_me(client, access).json()["role"] == "premium"
+
+
+def test_deactivation_invalidates_identity(client: TestClient, engine: Engine) -> None:
+    email, access = _login(client, 3)
+    assert auth_utils.get_me(client, access).status_code == 200
+
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == email)).one()
+        user.is_active = False
+        session.add(user)
+        session.commit()
+
+    assert auth_utils.get_me(client, access).status_code == 401
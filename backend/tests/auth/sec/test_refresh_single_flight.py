@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.token.refresh_single_flight import RefreshSingleFlight
+
+"""
+Tests für das asyncio-Single-Flight der Refresh-Rotation (geteiltes Ergebnis,
+Nachlaufzeit, Fehlerweitergabe, Abbruch eines Wartenden).
+"""
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # RefreshSingleFlight nutzt asyncio-Futures/-Tasks
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.anyio
+async def test_concurrent_callers_share_one_rotation() -> None:
+    flight: RefreshSingleFlight[str] = RefreshSingleFlight(grace_seconds=2, clock=FakeClock())
+    calls = 0
+    release = asyncio.Event()
+
+    async def rotate() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return f"pair-{calls}"
+
+    waiters = [asyncio.create_task(flight.run("digest", rotate)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["pair-1"] * 5
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_grace_window_serves_result_then_expires() -> None:
+    clock = FakeClock()
+    flight: RefreshSingleFlight[str] = RefreshSingleFlight(grace_seconds=2, clock=clock)
+    calls = 0
+
+    async def rotate() -> str:
+        nonlocal calls
+        calls += 1
+        return f"pair-{calls}"
+
+    assert await flight.run("digest", rotate) == "pair-1"
+    clock.now += 1.5
+    assert await flight.run("digest", rotate) == "pair-1"
+    clock.now += 1
+    assert await flight.run("digest", rotate) == "pair-2"
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared_but_not_remembered() -> None:
+    flight: RefreshSingleFlight[str] = RefreshSingleFlight(grace_seconds=2, clock=FakeClock())
+    calls = 0
+
+    async def rotate() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    results = await asyncio.gather(*(flight.run("digest", rotate) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, HTTPException) and r.status_code == 401 for r in results)
+    assert calls == 1
+
+    with pytest.raises(HTTPException):
+        await flight.run("digest", rotate)
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_rotation() -> None:
+    flight: RefreshSingleFlight[str] = RefreshSingleFlight(grace_seconds=0, clock=FakeClock())
+    release = asyncio.Event()
+
+    async def rotate() -> str:
+        await release.wait()
+        return "pair"
+
+    leader = asyncio.create_task(flight.run("digest", rotate))
+    follower = asyncio.create_task(flight.run("digest", rotate))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "pair"
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.routes import auth as auth_routes
+from app.services import auth_service, rate_limit
+from app.services.login_lockout import LoginLockout
+from app.services.rate_limit import InMemoryRateLimiter
+
+from ..utils import auth as auth_utils
+from ..utils.emails import email_for_user
+from ..utils.passwords import valid_password
+
+"""
+Tests für den Login-Lockout: Sperre je Konto und je IP nach `maxAttempts`
+Versuchen (atomar vor der Passwortprüfung gezählt), Ablehnung ohne
+Argon2-Verifikation, Reset bzw. Erstattung nach Erfolg.
+"""
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+@pytest.mark.unit
+def test_account_and_ip_thresholds(clock: _Clock) -> None:
+    lockout = LoginLockout(InMemoryRateLimiter(), max_attempts=2, cooldown_seconds=60, ip_factor=2)
+
+    for _ in range(2):
+        lockout.try_acquire("Victim@example.com", "10.0.0.1")
+
+    with pytest.raises(HTTPException) as exc_info:
+        lockout.try_acquire("victim@example.com", "10.0.0.2")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "60"}
+
+    # Anderes Konto von derselben IP: IP-Schwelle (4) noch nicht erreicht;
+    # der abgewiesene Versuch oben hat seinen IP-Zähler (10.0.0.2) erstattet
+    lockout.try_acquire("other@example.com", "10.0.0.1")
+    lockout.try_acquire("third@example.com", "10.0.0.1")
+    with pytest.raises(HTTPException):
+        lockout.try_acquire("fourth@example.com", "10.0.0.1")
+    lockout.try_acquire("fourth@example.com", "10.0.0.2")
+
+    # Nach Ablauf des Cooldowns ist alles wieder frei
+    clock.now += 61
+    lockout.try_acquire("victim@example.com", "10.0.0.1")
+
+
+@pytest.mark.unit
+def test_success_resets_account_counter_and_release_refunds(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter()
+    lockout = LoginLockout(limiter, max_attempts=2, cooldown_seconds=60, ip_factor=1)
+
+    lockout.try_acquire("user@example.com", "10.0.0.1")
+    lockout.try_acquire("user@example.com", "10.0.0.1")
+    lockout.record_success("User@example.com", "10.0.0.1")
+    # Kontozähler zurückgesetzt, IP-Zähler um den erfolgreichen Versuch erstattet
+    lockout.try_acquire("user@example.com", "10.0.0.1")
+    lockout.release("user@example.com", "10.0.0.1")
+
+    assert limiter.remaining("lockout:account:user@example.com", lockout._account_rule) == 2
+    assert limiter.remaining("lockout:ip:10.0.0.1", lockout._ip_rule) == 1
+
+
+@pytest.mark.unit
+def test_concurrent_attempts_cannot_exceed_threshold(clock: _Clock) -> None:
+    lockout = LoginLockout(InMemoryRateLimiter(), max_attempts=3, cooldown_seconds=60, ip_factor=10)
+    barrier = threading.Barrier(10)
+    admitted: list[bool] = []
+
+    def _attempt() -> None:
+        barrier.wait()
+        try:
+            lockout.try_acquire("victim@example.com", "10.0.0.1")
+            admitted.append(True)
+        except HTTPException:
+            admitted.append(False)
+
+    threads = [threading.Thread(target=_attempt) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=2)
+
+    assert admitted.count(True) == 3
+
+
+@pytest.mark.unit
+def test_zero_cooldown_disables_lockout(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter()
+    lockout = LoginLockout(limiter, max_attempts=1, cooldown_seconds=0)
+
+    for _ in range(5):
+        lockout.try_acquire("user@example.com", "10.0.0.1")
+    assert limiter.stats().keys == 0
+
+
+@pytest.mark.integration
+def test_locked_login_skips_password_verification(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    email = email_for_user(1)
+    password = valid_password()
+    auth_utils.register(client, email, password)
+
+    monkeypatch.setattr(
+        auth_routes, "login_lockout", LoginLockout(InMemoryRateLimiter(), max_attempts=3, cooldown_seconds=60)
+    )
+    verify_calls: list[str] = []
+    real_verify = auth_service.verify_password
+
+    def _counting_verify(plain: str, hashed: str) -> bool:
+        verify_calls.append(plain)
+        return real_verify(plain, hashed)
+
+    monkeypatch.setattr(auth_service, "verify_password", _counting_verify)
+
+    statuses = [auth_utils.login(client, email, "WrongPassword999!").status_code for _ in range(3)]
+    assert statuses == [401, 401, 401]
+
+    locked = auth_utils.login(client, email, password)
+    assert locked.status_code == 429
+    assert locked.headers["Retry-After"] == "60"
+    # Nur die drei Fehlversuche haben Argon2 ausgeführt, die gesperrte Anfrage nicht
+    assert len(verify_calls) == 3
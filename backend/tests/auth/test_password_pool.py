@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.password_pool import BoundedPasswordExecutor, PasswordPoolSaturatedError
+from ..utils import auth as auth_utils
+from ..utils.emails import email_for_user
+from ..utils.passwords import valid_password
+
+"""
+Tests für den begrenzten Argon2-Pool: Queue-Limit führt zu schnellem 503,
+Auslastung ist über `stats()` sichtbar.
+"""
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # asyncio.wrap_future ist asyncio-spezifisch
+    return "asyncio"
+
+
+def _occupy(pool: BoundedPasswordExecutor, release: threading.Event, count: int) -> list[threading.Thread]:
+    """Belegt `count` Slots des Pools mit blockierenden Aufgaben."""
+    threads = [threading.Thread(target=pool.run, args=(release.wait,)) for _ in range(count)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _wait_for(pool: BoundedPasswordExecutor, *, active: int, queued: int, timeout: float = 2.0) -> None:
+    """Wartet auf exakt `active` laufende und `queued` wartende Aufgaben."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = pool.stats()
+        if (stats.active, stats.queued) == (active, queued):
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"pool did not reach active={active}, queued={queued}: {pool.stats()}")
+
+
+async def _await_state(pool: BoundedPasswordExecutor, *, active: int, queued: int, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = pool.stats()
+        if (stats.active, stats.queued) == (active, queued):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"pool did not reach active={active}, queued={queued}: {pool.stats()}")
+
+
+@pytest.mark.unit
+def test_pool_rejects_above_queue_limit_and_reports_depth() -> None:
+    pool = BoundedPasswordExecutor(max_workers=1, queue_limit=1)
+    release = threading.Event()
+    threads = _occupy(pool, release, 2)
+    try:
+        _wait_for(pool, active=1, queued=1)
+
+        with pytest.raises(PasswordPoolSaturatedError):
+            pool.run(lambda: None)
+        assert pool.stats().rejected_total == 1
+    finally:
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+    stats = pool.stats()
+    assert (stats.active, stats.queued, stats.completed_total) == (0, 0, 2)
+    assert pool.run(lambda x: x * 2, 21) == 42
+
+
+@pytest.mark.unit
+@pytest.mark.anyio
+async def test_reservation_is_admitted_up_front_and_released_when_unused() -> None:
+    pool = BoundedPasswordExecutor(max_workers=1, queue_limit=0)
+
+    with pool.reserve():
+        assert pool.stats().queued == 1
+        with pytest.raises(PasswordPoolSaturatedError):
+            pool.reserve()
+    assert pool.stats().queued == 0
+
+    with pool.reserve() as slot:
+        assert await slot.run(lambda x: x * 2, 21) == 42
+        with pytest.raises(RuntimeError):
+            await slot.run(lambda: None)
+    stats = pool.stats()
+    assert (stats.active, stats.queued, stats.completed_total, stats.rejected_total) == (0, 0, 1, 1)
+
+
+@pytest.mark.unit
+@pytest.mark.anyio
+async def test_cancelled_arun_frees_its_queue_slot() -> None:
+    pool = BoundedPasswordExecutor(max_workers=1, queue_limit=1)
+    release = threading.Event()
+    threads = _occupy(pool, release, 1)
+    try:
+        await _await_state(pool, active=1, queued=0)
+        task = asyncio.create_task(pool.arun(lambda: None))
+        await _await_state(pool, active=1, queued=1)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await _await_state(pool, active=1, queued=0)
+    finally:
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+    await _await_state(pool, active=0, queued=0)
+    assert await pool.arun(lambda: "ok") == "ok"
+
+
+@pytest.mark.integration
+def test_login_returns_503_when_password_pool_is_saturated(client: TestClient, monkeypatch) -> None:
+    email, password = email_for_user(1), valid_password()
+    assert auth_utils.register(client, email, password).status_code == 200
+
+    pool = BoundedPasswordExecutor(max_workers=1, queue_limit=0)
+    monkeypatch.setattr("app.services.auth_service.get_password_pool", lambda: pool)
+    release = threading.Event()
+    threads = _occupy(pool, release, 1)
+    try:
+        _wait_for(pool, active=1, queued=0)
+        response = auth_utils.login(client, email, password)
+    finally:
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+    assert response.status_code == 503
+    assert response.headers.get("retry-after") == "1"
+    # Nach Entlastung funktioniert Login wieder
+    assert auth_utils.login(client, email, password).status_code == 200
@@ -8,14 +8,16 @@ Die Modelle werden importiert, damit ihre Tabellen in SQLModel-Metadaten registr
 from __future__ import annotations
 
 import tempfile
-from collections.abc import Generator, Callable
+from collections.abc import AsyncGenerator, Generator, Callable
 from pathlib import Path
 from typing import Any, Protocol
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.main import create_app
 # Modelle zuerst importieren, damit sie in den SQLModel-Metadaten registriert werden
@@ -97,20 +99,29 @@ def client(engine: Engine) -> Generator[TestClient, None, None]:
     # Produktive App-Erzeugungslogik verwenden
     app = create_app()
 
-    from app.core.database import get_session as prod_get_session
+    from app.core.database import create_async_db_engine, get_async_session, get_session as prod_get_session
+
+    # Async-Engine auf dieselbe Datei; NullPool, da Verbindungen an den Loop des Clients gebunden sind
+    async_engine = create_async_db_engine(str(engine.url), profile="off", poolclass=NullPool)
 
     def _get_test_session() -> Generator[Session, None, None]:
         with Session(engine) as session:
             yield session
 
-    # DB-Session-Dependency für Tests überschreiben
+    async def _get_test_async_session() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    # DB-Session-Dependencies für Tests überschreiben
     app.dependency_overrides[prod_get_session] = _get_test_session
+    app.dependency_overrides[get_async_session] = _get_test_async_session
 
     with TestClient(app, raise_server_exceptions=True) as c:
         yield c
 
     # Dependency-Overrides aufräumen nach Test
     app.dependency_overrides.clear()
+    async_engine.sync_engine.dispose()
 
 
 @pytest.fixture()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.services import rate_limit
+from app.services.rate_limit import GCRA, InMemoryRateLimiter, RateAlgorithm, RateRule
+from app.services.shared_state import SQLiteRateLimiter, SQLiteStateStore
+
+"""
+Tests für den GCRA-Limiter: Burst bis `count`, gleichmäßiges Nachfüllen und
+gleiche Entscheidungen im In-Memory- und im SQLite-Limiter.
+"""
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    monkeypatch.setattr("app.services.shared_state.time.time", fake)
+    return fake
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("factory", ["memory", "sqlite"])
+def test_gcra_allows_burst_then_refills_evenly(factory: str, clock: _Clock, tmp_path: Path) -> None:
+    limiter = InMemoryRateLimiter() if factory == "memory" else SQLiteRateLimiter(SQLiteStateStore(str(tmp_path / "s.sqlite")))
+    rule = RateRule(count=4, window_seconds=60, algorithm=GCRA)
+
+    assert limiter.remaining("k", rule) == 4
+    assert [limiter.allow("k", rule) for _ in range(5)] == [True, True, True, True, False]
+    assert limiter.remaining("k", rule) == 0
+
+    # Emission-Intervall = 15 s: danach genau eine weitere Anfrage
+    clock.now += 15
+    assert limiter.remaining("k", rule) == 1
+    assert limiter.allow("k", rule) is True
+    assert limiter.allow("k", rule) is False
+
+    # Nach einem vollen Fenster Leerlauf steht wieder der komplette Burst bereit
+    clock.now += 60
+    assert limiter.remaining("k", rule) == 4
+    assert limiter.remaining("other", rule) == 4
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("factory", ["memory", "sqlite"])
+@pytest.mark.parametrize("algorithm", ["sliding_window", GCRA])
+def test_refund_returns_one_counted_request(factory: str, algorithm: RateAlgorithm, clock: _Clock, tmp_path: Path) -> None:
+    limiter = InMemoryRateLimiter() if factory == "memory" else SQLiteRateLimiter(SQLiteStateStore(str(tmp_path / "s.sqlite")))
+    rule = RateRule(count=2, window_seconds=60, algorithm=algorithm)
+
+    assert limiter.allow("k", rule) and limiter.allow("k", rule)
+    assert limiter.allow("k", rule) is False
+
+    limiter.refund("k", rule)
+    assert limiter.remaining("k", rule) == 1
+    assert limiter.allow("k", rule) is True
+    # Erstattung unbekannter Keys ist ein No-op
+    limiter.refund("unknown", rule)
+    assert limiter.remaining("unknown", rule) == 2
+
+
+@pytest.mark.unit
+def test_gcra_keeps_one_timestamp_per_key(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter()
+    rule = RateRule(count=1000, window_seconds=60, algorithm=GCRA)
+
+    for _ in range(1000):
+        assert limiter.allow("feed:1", rule)
+    assert limiter.allow("feed:1", rule) is False
+
+    assert limiter._tat == {"feed:1": pytest.approx(clock.now + 60)}
+    assert not limiter._events
+
+
+@pytest.mark.unit
+def test_sliding_window_remains_default(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter()
+    rule = RateRule(count=2, window_seconds=10)
+
+    assert limiter.allow("k", rule) and limiter.allow("k", rule)
+    assert limiter.allow("k", rule) is False
+    assert len(limiter._events["k"]) == 2
+    assert not limiter._tat
+
+
+@pytest.mark.unit
+def test_remaining_does_not_track_unknown_keys(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter(max_keys=10)
+
+    for i in range(100):
+        assert limiter.remaining(f"login:ip:user{i}", RateRule(count=5, window_seconds=60)) == 5
+        assert limiter.remaining(f"feed:{i}", RateRule(count=5, window_seconds=60, algorithm=GCRA)) == 5
+
+    assert limiter.stats().keys == 0
+
+
+@pytest.mark.unit
+def test_hard_cap_evicts_least_recently_used_key(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter(max_keys=3)
+    rule = RateRule(count=1, window_seconds=60)
+
+    for key in ("a", "b", "c"):
+        assert limiter.allow(key, rule)
+    # "a" erneut benutzt (abgelehnt) → "b" ist am längsten unbenutzt
+    assert limiter.allow("a", rule) is False
+    assert limiter.allow("d", rule)
+
+    stats = limiter.stats()
+    assert (stats.keys, stats.evictions) == (3, 1)
+    assert list(limiter._events) == ["c", "a", "d"]
+    assert limiter.remaining("a", rule) == 0
+
+
+@pytest.mark.unit
+def test_zero_max_keys_means_unbounded(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter(max_keys=0)
+    window = RateRule(count=1, window_seconds=60)
+    gcra = RateRule(count=1, window_seconds=60, algorithm=GCRA)
+
+    for key in ("a", "b", "c"):
+        assert limiter.allow(key, window)
+        assert limiter.allow(f"feed:{key}", gcra)
+    # Ohne Obergrenze bleibt der Zustand erhalten: zweite Anfrage wird abgelehnt
+    assert limiter.allow("a", window) is False
+    assert limiter.allow("feed:a", gcra) is False
+
+    stats = limiter.stats()
+    assert (stats.keys, stats.evictions) == (6, 0)
+
+
+@pytest.mark.unit
+def test_sweep_removes_only_idle_windows(clock: _Clock) -> None:
+    limiter = InMemoryRateLimiter()
+    window = RateRule(count=5, window_seconds=60)
+    gcra = RateRule(count=5, window_seconds=60, algorithm=GCRA)
+
+    limiter.allow("old", window)
+    limiter.allow("old_gcra", gcra)
+    clock.now += 61
+    limiter.allow("fresh", window)
+    limiter.allow("fresh_gcra", gcra)
+
+    assert limiter.sweep() == 2
+    assert set(limiter._events) == {"fresh"}
+    assert set(limiter._tat) == {"fresh_gcra"}
+    assert limiter.stats().swept == 2
+
+
+@pytest.mark.anyio
+async def test_sweep_loop_sweeps_created_limiters(clock: _Clock) -> None:
+    limiter = rate_limit.create_rate_limiter()
+    assert isinstance(limiter, InMemoryRateLimiter)
+    limiter.allow("k", RateRule(count=5, window_seconds=1))
+    clock.now += 2
+
+    await rate_limit.rate_limit_sweep_loop(0.01, max_runs=1)
+
+    assert limiter.stats().keys == 0
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.rate_limit import RateRule
+from app.services.rate_limit import GCRA
+from app.services.shared_state import SQLiteCacheBackend, SQLiteGenerations, SQLiteRateLimiter, SQLiteStateStore
+
+"""
+Tests für den SQLite-WAL-Shared-State: Cache-Backend-Semantik, ein über
+mehrere Prozesse geteiltes Rate-Limit, geteilte Generationszähler und das
+globale Aufräumen der Rate-Tabellen.
+"""
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_sqlite_backend_is_shared_between_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.sqlite")
+    worker_a = SQLiteCacheBackend(SQLiteStateStore(path))
+    worker_b = SQLiteCacheBackend(SQLiteStateStore(path))
+
+    await worker_a.set("token_blacklist:abc", b"1", expire=60)
+    await worker_a.set("token_blacklist:expired", b"1", expire=0)
+    await worker_a.set("other:key", b"x")
+
+    assert await worker_b.get("token_blacklist:abc") == b"1"
+    assert await worker_b.get("token_blacklist:expired") is None
+    assert await worker_b.get_many(["token_blacklist:abc", "missing", "other:key"]) == [b"1", None, b"x"]
+    ttl, value = await worker_b.get_with_ttl("token_blacklist:abc")
+    assert value == b"1" and 0 < ttl <= 60
+
+    assert await worker_b.clear(namespace="token_blacklist:") == 2
+    assert await worker_a.get("token_blacklist:abc") is None
+    assert await worker_a.get("other:key") == b"x"
+
+
+def _hammer_limiter(path: str, attempts: int) -> int:
+    limiter = SQLiteRateLimiter(SQLiteStateStore(path))
+    rule = RateRule(count=25, window_seconds=60)
+    return sum(limiter.allow("login:shared", rule) for _ in range(attempts))
+
+
+def test_rate_limit_is_enforced_across_processes(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.sqlite")
+    SQLiteStateStore(path).connection()  # Schema/WAL vorab anlegen
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes=4) as pool:
+        allowed = pool.starmap(_hammer_limiter, [(path, 20)] * 4)
+
+    # 80 Versuche aus 4 Prozessen, Limit 25 gilt insgesamt (nicht je Prozess)
+    assert sum(allowed) == 25
+    assert SQLiteRateLimiter(SQLiteStateStore(path)).remaining("login:shared", RateRule(25, 60)) == 0
+
+
+@pytest.mark.unit
+def test_generations_are_shared_and_never_reused(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.sqlite")
+    worker_a = SQLiteGenerations(SQLiteStateStore(path))
+    worker_b = SQLiteGenerations(SQLiteStateStore(path))
+
+    assert worker_b.current("home_feed_gen:1") == 0
+    first = worker_a.bump("home_feed_gen:1", ttl_seconds=60)
+    assert worker_b.current("home_feed_gen:1") == first > 0
+    assert worker_b.bump("home_feed_gen:1", ttl_seconds=60) > first
+    assert worker_a.current("home_feed_gen:2") == 0
+
+    # Abgelaufene Zähler lesen sich als 0; der nächste Wert liegt trotzdem über allen bisherigen
+    expired = worker_a.bump("home_feed_gen:3", ttl_seconds=-1)
+    assert worker_b.current("home_feed_gen:3") == 0
+    assert worker_b.bump("home_feed_gen:3", ttl_seconds=60) > expired
+
+
+@pytest.mark.unit
+def test_sweep_purges_rate_tables_globally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [1_000.0]
+    monkeypatch.setattr("app.services.shared_state.time.time", lambda: clock[0])
+    path = str(tmp_path / "state.sqlite")
+    writer = SQLiteRateLimiter(SQLiteStateStore(path))
+    sliding = RateRule(count=5, window_seconds=60)
+    gcra = RateRule(count=5, window_seconds=60, algorithm=GCRA)
+
+    for i in range(20):
+        assert writer.allow(f"ip:{i}", sliding)
+        assert writer.allow(f"feed:{i}", gcra)
+    clock[0] += 30
+    assert writer.allow("ip:recent", sliding)
+    assert writer.stats().keys == 41
+
+    # Ein anderer Worker (ohne eigene Regeln) räumt anhand des geteilten Maximalfensters auf
+    clock[0] += 45
+    sweeper = SQLiteRateLimiter(SQLiteStateStore(path))
+    assert sweeper.sweep() == 40
+    assert sweeper.stats().keys == 1
+    assert sweeper.remaining("ip:recent", sliding) == 4
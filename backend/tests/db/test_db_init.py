@@ -30,3 +30,117 @@ def test_db_init_creates_tables() -> None:
     finally:
         # Verbindungen explizit schließen, um ResourceWarnings zu vermeiden
         engine.dispose()
+
+
+def test_ensure_indexes_adds_feed_index_to_existing_database() -> None:
+    from sqlalchemy import text
+
+    from app.core.database import ensure_indexes
+
+    engine = create_engine("sqlite://", echo=False)
+
+    try:
+        SQLModel.metadata.create_all(engine)
+        # Bestandsdatenbank ohne Composite-Index simulieren
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_widgets_feed_selection"))
+        assert "ix_widgets_feed_selection" not in {ix["name"] for ix in inspect(engine).get_indexes("widgets")}
+
+        ensure_indexes(engine)
+        ensure_indexes(engine)  # idempotent
+
+        assert "ix_widgets_feed_selection" in {ix["name"] for ix in inspect(engine).get_indexes("widgets")}
+    finally:
+        engine.dispose()
+
+
+def test_feed_query_uses_composite_index() -> None:
+    from datetime import UTC, datetime
+
+    from sqlmodel import Session
+
+    from app.models.user import User
+    from app.services.home_feed_service import HomeFeedService
+
+    engine = create_engine("sqlite://", echo=False)
+
+    try:
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            user = User(email="plan@example.com", password_hash="x")
+            session.add(user)
+            session.commit()
+            session.refresh(user)
+
+            statements: list[tuple[str, tuple]] = []
+
+            from sqlalchemy import event
+
+            def _capture(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+                if statement.lstrip().upper().startswith("SELECT") and "FROM widgets" in statement:
+                    statements.append((statement, parameters))
+
+            event.listen(engine, "before_cursor_execute", _capture)
+            HomeFeedService(session).get_user_widgets(user, now=datetime.now(tz=UTC))
+            event.remove(engine, "before_cursor_execute", _capture)
+
+            assert statements, "Feed-Query wurde nicht ausgeführt"
+            sql, params = statements[-1]
+            plan_rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+            plan = " ".join(str(row[-1]) for row in plan_rows)
+
+            assert "ix_widgets_feed_selection" in plan
+            # Sortierung kommt aus dem Index, kein zusätzlicher Sort-Schritt
+            assert "TEMP B-TREE" not in plan
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("profile", "expected"),
+    [
+        ("prod", {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "cache_size": -65536, "temp_store": 2}),
+        ("e2e", {"journal_mode": "wal", "synchronous": 0}),
+        ("off", {"journal_mode": "delete", "synchronous": 2}),
+    ],
+)
+def test_sqlite_pragmas_are_applied_on_connect(tmp_path, profile: str, expected: dict) -> None:
+    from sqlalchemy import text
+
+    from app.core.database import create_sqlite_engine
+
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'pragmas.db'}", profile=profile)
+    try:
+        with engine.connect() as conn:
+            actual = {name: conn.execute(text(f"PRAGMA {name}")).scalar() for name in expected}
+        assert actual == expected
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_pragmas_skip_file_only_settings_in_memory() -> None:
+    from sqlalchemy import text
+
+    from app.core.database import create_sqlite_engine
+
+    engine = create_sqlite_engine("sqlite://", profile="prod")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "memory"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    finally:
+        engine.dispose()
+
+
+def test_init_db_propagates_migration_failure_outside_prod(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.core import database, migrations
+    from app.core.config import settings
+
+    def _fail(_engine) -> int:
+        raise RuntimeError("create_all failed")
+
+    monkeypatch.setattr(settings, "ENV", "dev")
+    monkeypatch.setattr(migrations, "run_migrations", _fail)
+
+    with pytest.raises(RuntimeError, match="create_all failed"):
+        database.init_db()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from loguru import logger
+from sqlalchemy import exc, text
+
+from app.core import database
+from app.core.database import async_database_url, create_sqlite_engine, db_pool_stats_loop
+from app.core.db_pool import WAIT_BUCKETS_MS, InstrumentedQueuePool, install_pool_metrics, pool_options
+
+"""
+Unit‑Tests für Pool-Konfiguration und Pool-Metriken (Checkouts, Overflow,
+Wartezeit-Histogramm, Timeouts) sowie das periodische `db_pool_stats`-Log.
+"""
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # db_pool_stats_loop nutzt asyncio.sleep
+    return "asyncio"
+
+
+def test_pool_options_follow_url_kind() -> None:
+    assert pool_options("sqlite://") == {}
+    assert pool_options("sqlite:///:memory:") == {}
+
+    file_opts = pool_options("sqlite:////tmp/app.db")
+    assert file_opts["poolclass"] is InstrumentedQueuePool
+    assert "pool_pre_ping" not in file_opts
+
+    pg_opts = pool_options("postgresql://u:p@db/app")
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_pre_ping", "pool_recycle"} <= pg_opts.keys()
+
+
+def test_async_pool_options_use_separate_sizing(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.core.config import settings
+    from app.core.db_pool import InstrumentedAsyncQueuePool
+
+    monkeypatch.setattr(settings, "DB_ASYNC_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_ASYNC_MAX_OVERFLOW", 4)
+
+    async_opts = pool_options("sqlite:////tmp/app.db", asyncio=True)
+    assert async_opts["poolclass"] is InstrumentedAsyncQueuePool
+    assert (async_opts["pool_size"], async_opts["max_overflow"]) == (3, 4)
+
+    sync_opts = pool_options("sqlite:////tmp/app.db")
+    assert (sync_opts["pool_size"], sync_opts["max_overflow"]) == (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+
+def test_async_database_url_selects_async_driver() -> None:
+    assert async_database_url("sqlite:////tmp/app.db") == "sqlite+aiosqlite:////tmp/app.db"
+    assert async_database_url("sqlite://") == "sqlite+aiosqlite://"
+    assert async_database_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@db/app")
+
+
+def test_pool_metrics_count_checkouts_and_overflow(tmp_path: Path) -> None:
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'pool.db'}", profile="off", pool_size=1, max_overflow=2)
+    metrics = install_pool_metrics(engine)
+    try:
+        with engine.connect() as c1, engine.connect() as c2:
+            c1.execute(text("SELECT 1"))
+            c2.execute(text("SELECT 1"))
+            assert metrics.stats().checked_out == 2
+
+        stats = metrics.stats()
+        assert stats.checkouts == 2
+        assert stats.checked_out == 0
+        assert stats.connects == 2
+        assert stats.peak_overflow == 1
+        assert stats.wait_count == 2
+        assert len(stats.wait_histogram) == len(WAIT_BUCKETS_MS) + 1
+    finally:
+        engine.dispose()
+
+
+def test_pool_timeout_is_recorded_and_waits_are_histogrammed(tmp_path: Path) -> None:
+    engine = create_sqlite_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", profile="off", pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    metrics = install_pool_metrics(engine)
+    try:
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+            # Zweiter Anforderer wartet, bis die Verbindung zurückgegeben wird
+            waited: list[float] = []
+
+            def _wait_for_connection() -> None:
+                started = time.perf_counter()
+                with engine.connect():
+                    waited.append(time.perf_counter() - started)
+
+            engine.pool._timeout = 5  # type: ignore[attr-defined]
+            worker = threading.Thread(target=_wait_for_connection)
+            worker.start()
+            time.sleep(0.1)
+        worker.join(timeout=5)
+
+        stats = metrics.stats()
+        assert stats.timeouts == 1
+        assert waited and waited[0] >= 0.05
+        # Die Wartezeit des zweiten Anforderers landet in einem Bucket > 50 ms
+        slow_buckets = sum(stats.wait_histogram[WAIT_BUCKETS_MS.index(50) + 1:])
+        assert slow_buckets >= 1
+    finally:
+        engine.dispose()
+
+
+def test_metrics_survive_pool_recreate(tmp_path: Path) -> None:
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'pool.db'}", profile="off")
+    metrics = install_pool_metrics(engine)
+    try:
+        engine.dispose()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.metrics is metrics
+        assert metrics.stats().wait_count == 1
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_pool_stats_loop_logs_metrics_periodically(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'pool.db'}", profile="off")
+    metrics = install_pool_metrics(engine)
+    monkeypatch.setattr(database, "_pool_metrics", metrics)
+    monkeypatch.setattr(database, "_async_pool_metrics", None)
+    captured = []
+    sink_id = logger.add(lambda m: captured.append(m.record), level="DEBUG")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            await db_pool_stats_loop(0.01, max_runs=2)
+    finally:
+        logger.remove(sink_id)
+        engine.dispose()
+
+    records = [r["extra"] for r in captured if r["message"] == "db_pool_stats"]
+    assert len(records) == 2
+    assert records[0]["engine"] == "sync"
+    assert (records[0]["checkouts"], records[0]["checked_out"], records[0]["timeouts"]) == (1, 1, 0)
+    assert len(records[0]["wait_histogram"]) == len(WAIT_BUCKETS_MS) + 1
+
+
+@pytest.mark.anyio
+async def test_pool_stats_loop_is_disabled_by_zero_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+    monkeypatch.setattr(database, "log_pool_stats", lambda: calls.append(1))
+
+    await db_pool_stats_loop(0, max_runs=1)
+
+    assert calls == []
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlmodel import create_engine
+
+# Modelle importieren, damit sie in SQLModel.metadata registriert sind
+from app.core.database import DB_SCHEMA_VERSION
+from app.core import migrations
+from app.core.migrations import read_schema_version, run_migrations
+from app.models.user import User  # noqa: F401
+from app.models.widget import RefreshToken, Widget  # noqa: F401
+
+"""
+Unit‑Tests für die versionierten Migrationen: Anlage per Version, Fast Path ohne
+Introspektion, Nachrüsten alter SQLite-Dateien und Start-Lock.
+"""
+pytestmark = pytest.mark.unit
+
+
+def _file_engine(path: Path) -> Engine:
+    return create_engine(f"sqlite:///{path}", echo=False, connect_args={"check_same_thread": False})
+
+
+def _statements(engine: Engine) -> list[str]:
+    seen: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda _c, _cur, stmt, *_a: seen.append(stmt))
+    return seen
+
+
+def test_fresh_database_is_migrated_to_current_version(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path / "app.db")
+    try:
+        assert run_migrations(engine) == DB_SCHEMA_VERSION
+
+        with engine.connect() as conn:
+            assert read_schema_version(conn) == DB_SCHEMA_VERSION
+        assert {"users", "widgets", "refresh_tokens"} <= set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+
+
+def test_current_database_skips_introspection(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path / "app.db")
+    try:
+        run_migrations(engine)
+        statements = _statements(engine)
+
+        assert run_migrations(engine) == 0
+        # Nur die Version wird gelesen – kein table_info, kein DDL
+        assert statements == ["PRAGMA user_version"]
+    finally:
+        engine.dispose()
+
+
+def test_version_table_is_read_without_ddl_and_created_under_lock(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Pfad anderer Dialekte (schema_version-Tabelle) auf SQLite nachstellen
+    monkeypatch.setattr(migrations, "_uses_user_version", lambda _conn: False)
+    engine = _file_engine(tmp_path / "app.db")
+    try:
+        with engine.connect() as conn:
+            assert read_schema_version(conn) == 0
+            assert not inspect(conn).has_table("schema_version")
+
+        assert run_migrations(engine) == DB_SCHEMA_VERSION
+        statements = _statements(engine)
+        assert run_migrations(engine) == 0
+
+        assert not [s for s in statements if s.lstrip().upper().startswith(("CREATE", "INSERT", "DELETE"))]
+        with engine.connect() as conn:
+            assert read_schema_version(conn) == DB_SCHEMA_VERSION
+            assert conn.exec_driver_sql("SELECT COUNT(*) FROM schema_version").scalar() == 1
+    finally:
+        engine.dispose()
+
+
+def test_legacy_sqlite_file_gets_missing_columns(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path / "legacy.db")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT NOT NULL, password_hash TEXT)")
+            conn.exec_driver_sql("INSERT INTO users (email, password_hash) VALUES ('old@example.com', 'x')")
+
+        run_migrations(engine)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("users")}
+        assert {"role", "created_at", "updated_at"} <= columns
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT role FROM users").scalar() == "common"
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("stamped_version", [1, 2])
+def test_version_stamped_legacy_sqlite_file_is_repaired(tmp_path: Path, stamped_version: int) -> None:
+    # Der frühere init_db stempelte Nicht-Prod-Dateien, ohne fehlende Spalten nachzurüsten
+    engine = _file_engine(tmp_path / "stamped.db")
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT NOT NULL, password_hash TEXT)")
+            conn.exec_driver_sql(f"PRAGMA user_version={stamped_version}")
+
+        assert run_migrations(engine) == DB_SCHEMA_VERSION - stamped_version
+
+        columns = {c["name"] for c in inspect(engine).get_columns("users")}
+        assert {"role", "created_at", "updated_at"} <= columns
+        with engine.connect() as conn:
+            assert read_schema_version(conn) == DB_SCHEMA_VERSION
+    finally:
+        engine.dispose()
+
+
+def test_concurrent_workers_migrate_once(tmp_path: Path) -> None:
+    # Getrennte Engines simulieren Worker; der flock-Start-Lock serialisiert sie
+    db_path = tmp_path / "shared.db"
+    engines = [_file_engine(db_path) for _ in range(4)]
+    barrier = threading.Barrier(len(engines))
+    applied: list[int] = []
+
+    def _worker(worker_engine: Engine) -> None:
+        barrier.wait()
+        applied.append(run_migrations(worker_engine))
+
+    threads = [threading.Thread(target=_worker, args=(e,)) for e in engines]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=30)
+
+        assert sorted(applied, reverse=True)[0] == DB_SCHEMA_VERSION
+        assert sum(applied) == DB_SCHEMA_VERSION
+    finally:
+        for e in engines:
+            e.dispose()
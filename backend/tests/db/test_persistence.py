@@ -4,7 +4,8 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 from fastapi import HTTPException
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from app.models.user import User
 from app.models.widget import RefreshToken
@@ -108,4 +109,57 @@ def test_auth_service_handles_naive_refresh_token_expiration() -> None:
             auth_service.rotate_refresh("expired-refresh-token")
 
         assert exc_info.value.status_code == 401
-        assert "invalid refresh token" in exc_info.value.detail.lower()
\ No newline at end of file
+        assert "invalid refresh token" in exc_info.value.detail.lower()
+
+def test_rotate_refresh_revokes_and_issues_in_one_commit() -> None:
+    """Widerruf und neuer Refresh-Token landen in genau einer Transaktion."""
+    engine = create_engine("sqlite://", echo=False)
+    SQLModel.metadata.create_all(engine)
+    commits: list[int] = []
+    event.listen(engine, "commit", lambda _conn: commits.append(1))
+
+    with Session(engine) as session:
+        user = User(email="rotation-commit@example.com", password_hash="dummy_hash", is_active=True)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        service = AuthService(session)
+        _access, old_refresh, _expires_in = service.issue_tokens(user)
+
+        commits.clear()
+        _access, new_refresh, _expires_in, rotated_user = service.rotate_refresh(old_refresh)
+
+        assert len(commits) == 1
+        assert rotated_user.id == user.id
+        tokens = session.exec(select(RefreshToken).order_by(RefreshToken.id)).all()
+        assert [t.revoked for t in tokens] == [True, False]
+
+        # Wiederverwendung des alten Tokens schlägt fehl, der Nachfolger bleibt gültig
+        with pytest.raises(HTTPException):
+            service.rotate_refresh(old_refresh)
+        service.rotate_refresh(new_refresh)
+
+
+def test_rejected_rotation_leaves_token_unrevoked() -> None:
+    """Inaktiver Benutzer: Der Widerruf wird zurückgerollt, es entsteht kein neuer Token."""
+    engine = create_engine("sqlite://", echo=False)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = User(email="rotation-inactive@example.com", password_hash="dummy_hash", is_active=True)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        service = AuthService(session)
+        _access, refresh_token, _expires_in = service.issue_tokens(user)
+
+        user.is_active = False
+        session.add(user)
+        session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.rotate_refresh(refresh_token)
+        assert exc_info.value.status_code == 401
+
+        tokens = session.exec(select(RefreshToken)).all()
+        assert [t.revoked for t in tokens] == [False]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core import database
+from app.models.user import User
+from app.models.widget import RefreshToken
+from app.services.token import maintance
+from app.services.token.maintance import cleanup_loop, purge_expired_refresh_tokens_batched
+
+"""
+Tests für den Refresh-Token-Cleanup: Löschen in begrenzten Batches mit Report
+und Ausführung außerhalb des Event-Loops.
+"""
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # cleanup_loop nutzt asyncio.to_thread/asyncio.sleep
+    return "asyncio"
+
+
+def _seed(engine: Engine, *, purgeable: int, valid: int) -> None:
+    now = datetime.now(tz=UTC)
+    with Session(engine) as session:
+        user = User(email="purge@example.com", password_hash="dummy_hash")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        for i in range(purgeable):
+            expired = i % 2 == 0
+            session.add(
+                RefreshToken(
+                    user_id=user.id,
+                    token_digest=f"purge-{i}",
+                    expires_at=now - timedelta(hours=1) if expired else now + timedelta(days=1),
+                    revoked=not expired,
+                )
+            )
+        for i in range(valid):
+            session.add(RefreshToken(user_id=user.id, token_digest=f"valid-{i}", expires_at=now + timedelta(days=1)))
+        session.commit()
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    # Dateibasiert: der Worker-Thread des Cleanup-Loops nutzt eine eigene Verbindung
+    engine = create_engine(f"sqlite:///{tmp_path / 'purge.db'}", echo=False, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def test_purge_deletes_in_bounded_batches(engine: Engine) -> None:
+    _seed(engine, purgeable=12, valid=3)
+
+    with Session(engine) as session:
+        report = purge_expired_refresh_tokens_batched(session, batch_size=5, pause_seconds=0)
+        remaining = session.exec(select(RefreshToken.token_digest)).all()
+
+    assert (report.rows, report.batches) == (12, 3)
+    assert report.duration_ms >= 0
+    assert sorted(remaining) == ["valid-0", "valid-1", "valid-2"]
+
+
+def test_purge_stops_between_batches(engine: Engine) -> None:
+    _seed(engine, purgeable=12, valid=0)
+    checks: list[int] = []
+
+    def _stop_after_first() -> bool:
+        checks.append(1)
+        return len(checks) > 1
+
+    with Session(engine) as session:
+        report = purge_expired_refresh_tokens_batched(
+            session, batch_size=5, pause_seconds=0, should_stop=_stop_after_first
+        )
+
+    assert (report.rows, report.batches) == (5, 1)
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_purge_rejects_non_positive_batch_size(engine: Engine, batch_size: int) -> None:
+    _seed(engine, purgeable=2, valid=0)
+
+    with Session(engine) as session, pytest.raises(ValueError):
+        purge_expired_refresh_tokens_batched(session, batch_size=batch_size, pause_seconds=0)
+
+
+@pytest.mark.anyio
+async def test_cleanup_loop_purges_in_worker_thread(engine: Engine, monkeypatch: pytest.MonkeyPatch) -> None:
+    _seed(engine, purgeable=4, valid=1)
+    monkeypatch.setattr(database, "engine", engine)
+
+    threads: list[threading.Thread] = []
+    real_purge = maintance.purge_expired_refresh_tokens_batched
+
+    def _recording_purge(session: Session, **kwargs: object):
+        threads.append(threading.current_thread())
+        return real_purge(session, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(maintance, "purge_expired_refresh_tokens_batched", _recording_purge)
+
+    await cleanup_loop(max_runs=1)
+
+    assert threads and threads[0] is not threading.main_thread()
+    with Session(engine) as session:
+        assert session.exec(select(RefreshToken.token_digest)).all() == ["valid-0"]
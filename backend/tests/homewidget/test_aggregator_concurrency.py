@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, List
+
+from loguru import logger
+
+from app.homewidget.contracts.v1.widget_contracts import WidgetContractV1
+from app.homewidget.providers.aggregator import ProvidersAggregator
+from app.homewidget.providers.base import ProviderBase
+
+"""
+Tests für den nebenläufigen Provider-Fan-out im Aggregator: Provider laufen parallel,
+Timeouts/Deadlines sind fail-open und werden als `provider_timeout` geloggt.
+"""
+
+_BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class SleepyProvider(ProviderBase):
+    def __init__(self, name: str, item_id: int, delay: float):
+        self._name = name
+        self._item_id = item_id
+        self._delay = delay
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def load_items(self) -> List[WidgetContractV1]:
+        time.sleep(self._delay)
+        return [WidgetContractV1(id=self._item_id, name=self._name, priority=1, created_at=_BASE)]
+
+
+class AsyncSleepyProvider(SleepyProvider):
+    async def aload_items(self) -> List[WidgetContractV1]:
+        await asyncio.sleep(self._delay)
+        return [WidgetContractV1(id=self._item_id, name=self._name, priority=1, created_at=_BASE)]
+
+
+def _capture_messages() -> tuple[list[Any], int]:
+    captured: list[Any] = []
+    sink_id = logger.add(lambda m: captured.append(m.record), level="DEBUG")
+    return captured, sink_id
+
+
+def test_providers_run_concurrently() -> None:
+    providers = [SleepyProvider(f"p{i}", i, 0.2) for i in range(4)]
+    aggregator = ProvidersAggregator(providers=providers, provider_timeout_seconds=2, page_deadline_seconds=3)
+
+    started = time.monotonic()
+    page = aggregator.load_page(limit=10)
+    elapsed = time.monotonic() - started
+
+    assert {it.id for it in page.items} == {0, 1, 2, 3}
+    # Sequenziell wären es >= 0.8s
+    assert elapsed < 0.6
+
+
+def test_slow_provider_times_out_fail_open() -> None:
+    captured, sink_id = _capture_messages()
+    try:
+        aggregator = ProvidersAggregator(
+            providers=[SleepyProvider("fast", 1, 0.0), SleepyProvider("slow", 2, 1.0), AsyncSleepyProvider("aslow", 3, 1.0)],
+            provider_timeout_seconds=0.1,
+            page_deadline_seconds=2,
+        )
+        started = time.monotonic()
+        page = aggregator.load_page(limit=10)
+        elapsed = time.monotonic() - started
+    finally:
+        logger.remove(sink_id)
+
+    assert [it.id for it in page.items] == [1]
+    assert elapsed < 0.5
+    timeouts = {r["extra"].get("provider") for r in captured if r["message"] == "provider_timeout"}
+    assert timeouts == {"slow", "aslow"}
+
+
+def test_page_deadline_bounds_total_latency() -> None:
+    captured, sink_id = _capture_messages()
+    try:
+        slow = AsyncSleepyProvider("slow", 2, 1.0)
+        slow.timeout_seconds = 5  # Provider-Timeout großzügig, Seiten-Deadline greift zuerst
+        aggregator = ProvidersAggregator(
+            providers=[AsyncSleepyProvider("fast", 1, 0.0), slow],
+            provider_timeout_seconds=5,
+            page_deadline_seconds=0.1,
+        )
+        started = time.monotonic()
+        page = aggregator.load_page(limit=10)
+        elapsed = time.monotonic() - started
+    finally:
+        logger.remove(sink_id)
+
+    assert [it.id for it in page.items] == [1]
+    assert elapsed < 0.5
+    reasons = [r["extra"].get("reason") for r in captured if r["message"] == "provider_timeout"]
+    assert reasons == ["page_deadline"]
+
+
+def test_aload_page_inside_running_loop() -> None:
+    async def _run():
+        aggregator = ProvidersAggregator(providers=[AsyncSleepyProvider("a", 1, 0.0), SleepyProvider("s", 2, 0.0)])
+        async_page = await aggregator.aload_page(limit=10)
+        # Sync-Einstieg aus laufendem Loop heraus darf nicht crashen
+        sync_page = aggregator.load_page(limit=10)
+        return async_page, sync_page
+
+    async_page, sync_page = asyncio.run(_run())
+    assert {it.id for it in async_page.items} == {1, 2}
+    assert async_page == sync_page
+
+
+def test_sync_load_page_runs_without_event_loop(monkeypatch) -> None:
+    from app.homewidget.providers import aggregator as aggregator_module
+
+    def _no_loop(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("sync fan-out must not start an event loop")
+
+    # Sync-Provider: Fan-out nur über Pool-Futures, kein asyncio.run im aufrufenden Thread
+    monkeypatch.setattr(aggregator_module.asyncio, "run", _no_loop)
+    aggregator = ProvidersAggregator(providers=[SleepyProvider(f"p{i}", i, 0.0) for i in range(3)])
+
+    assert {it.id for it in aggregator.load_page(limit=10).items} == {0, 1, 2}
@@ -29,3 +29,177 @@ def test_aggregator_drops_invalid_widgets():
     assert len(page.items) == 1
     assert page.items[0].id == 1
     assert page.items[0].name == "Valid"
+
+
+def test_aggregator_keyset_cursor_is_stable_under_inserts():
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = [
+        WidgetContractV1(id=i, name=f"W{i}", priority=i % 3, created_at=base.replace(day=1 + i))
+        for i in range(1, 8)
+    ]
+    provider = MockProvider("test", list(items))
+    aggregator = ProvidersAggregator(providers=[provider])
+
+    page1 = aggregator.load_page(limit=3)
+    assert page1.next_cursor is not None
+
+    # Neues Item mit höchster Priorität einfügen (landet vor dem Cursor)
+    provider._items.append(WidgetContractV1(id=99, name="New", priority=10, created_at=base))
+
+    page2 = aggregator.load_page(cursor=page1.next_cursor, limit=3)
+    seen = [it.id for it in page1.items] + [it.id for it in page2.items]
+
+    # Keine Duplikate, keine Lücke trotz Insert vor dem Cursor
+    assert len(seen) == len(set(seen)) == 6
+    assert 99 not in seen
+
+    # Offset-Cursor bleiben akzeptiert
+    assert [it.id for it in aggregator.load_page(cursor="0", limit=3).items][0] == 99
+
+
+class SortedMockProvider(MockProvider):
+    sorted_output = True
+
+
+def _random_items(seed: int, ids: range) -> list[WidgetContractV1]:
+    import random
+
+    rnd = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        WidgetContractV1(id=i, name=f"W{i}", priority=rnd.randint(0, 3), created_at=base.replace(day=rnd.randint(1, 5)))
+        for i in ids
+    ]
+
+
+def test_aggregator_kway_merge_matches_global_sort():
+    streams = [_random_items(1, range(0, 40)), _random_items(2, range(40, 70)), _random_items(3, range(70, 75))]
+    sort_agg = ProvidersAggregator(providers=[MockProvider(f"p{i}", s) for i, s in enumerate(streams)])
+    merge_agg = ProvidersAggregator(
+        providers=[
+            SortedMockProvider(f"p{i}", sorted(s, key=lambda it: (it.priority, it.created_at, it.id), reverse=True))
+            for i, s in enumerate(streams)
+        ]
+    )
+
+    for cursor in ("0", "7"):
+        assert merge_agg.load_page(cursor=cursor, limit=10) == sort_agg.load_page(cursor=cursor, limit=10)
+
+    # Vollständiges Durchblättern per Keyset-Cursor liefert dieselbe Folge
+    def walk(agg: ProvidersAggregator) -> list[int]:
+        ids, cursor = [], None
+        while True:
+            page = agg.load_page(cursor=cursor, limit=8)
+            ids.extend(it.id for it in page.items)
+            if page.next_cursor is None:
+                return ids
+            cursor = page.next_cursor
+
+    assert walk(merge_agg) == walk(sort_agg)
+    assert len(walk(merge_agg)) == 75
+
+
+def test_aggregator_overlapping_ids_are_delivered_once_across_pages():
+    # Überlappende IDs (20..39) mit je Provider unterschiedlichem Sortierschlüssel und Payload
+    streams = [
+        [it.model_copy(update={"name": f"a{it.id}"}) for it in _random_items(11, range(0, 40))],
+        [it.model_copy(update={"name": f"b{it.id}"}) for it in _random_items(12, range(20, 60))],
+    ]
+    sort_agg = ProvidersAggregator(providers=[MockProvider(f"p{i}", s) for i, s in enumerate(streams)])
+    merge_agg = ProvidersAggregator(
+        providers=[
+            SortedMockProvider(f"p{i}", sorted(s, key=lambda it: (it.priority, it.created_at, it.id), reverse=True))
+            for i, s in enumerate(streams)
+        ]
+    )
+
+    def walk(agg: ProvidersAggregator) -> list[WidgetContractV1]:
+        items, cursor = [], None
+        while True:
+            page = agg.load_page(cursor=cursor, limit=7)
+            items.extend(page.items)
+            if page.next_cursor is None:
+                return items
+            cursor = page.next_cursor
+
+    merged, sorted_ = walk(merge_agg), walk(sort_agg)
+    ids = [it.id for it in merged]
+    assert len(ids) == len(set(ids)) == 60
+    # Beide Pfade liefern dieselbe Kopie (höchster Sortierschlüssel) in derselben Folge
+    assert merged == sorted_
+
+    def key(it: WidgetContractV1) -> tuple:
+        return it.priority, it.created_at, it.id
+
+    for item in merged:
+        copies = [c for stream in streams for c in stream if c.id == item.id]
+        assert key(item) == max(key(c) for c in copies)
+
+
+def test_merge_page_cost_does_not_grow_with_cursor_depth():
+    from app.homewidget.contracts.v1.cursor import (
+        FeedCursorV1,
+        contract_sort_key,
+        duplicate_best_keys,
+        merge_page,
+    )
+
+    class CountingList(list):
+        reads = 0
+
+        def __getitem__(self, index):
+            CountingList.reads += 1
+            return super().__getitem__(index)
+
+    def by_key(items: list[WidgetContractV1]) -> CountingList:
+        return CountingList(sorted(items, key=contract_sort_key, reverse=True))
+
+    # Überlappende IDs, damit der Duplikat-Pfad aktiv ist
+    streams = [by_key(_random_items(21, range(0, 3000))), by_key(_random_items(22, range(1500, 4500)))]
+    duplicates = duplicate_best_keys(streams)
+    ordered = sorted((it for s in streams for it in s), key=contract_sort_key, reverse=True)
+
+    def reads_at(depth: int) -> int:
+        CountingList.reads = 0
+        page = merge_page(streams, FeedCursorV1(after=contract_sort_key(ordered[depth])), 20, duplicates)
+        assert len(page.items) == 20
+        return CountingList.reads
+
+    # Gelesen werden nur die binäre Suche und die Seite samt übersprungener Duplikate,
+    # nicht die ~6000 Items vor dem Cursor
+    assert reads_at(10) < 250
+    assert reads_at(len(ordered) - 200) < 250
+
+
+def test_aggregator_sorts_provider_that_breaks_sorted_promise():
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    unsorted = [WidgetContractV1(id=i, name=f"W{i}", priority=i, created_at=base) for i in (1, 3, 2)]
+    aggregator = ProvidersAggregator(providers=[SortedMockProvider("liar", unsorted)])
+
+    assert [it.id for it in aggregator.load_page(limit=10).items] == [3, 2, 1]
+
+
+def test_batch_validation_drops_only_invalid_and_keeps_instances():
+    from loguru import logger
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    instance = WidgetContractV1(id=1, name="Instance", priority=3, created_at=base)
+    raw_items = [
+        instance,
+        {"id": 2, "name": "Dict", "priority": 2, "created_at": base},
+        {"id": 3, "priority": 1, "created_at": base},  # name fehlt
+        {"id": "x", "name": "Bad", "priority": 1, "created_at": base},  # id ungültig
+    ]
+
+    captured = []
+    sink_id = logger.add(lambda m: captured.append(m.record), level="DEBUG")
+    try:
+        valid = ProvidersAggregator._validate(MockProvider("mixed", raw_items), raw_items)
+    finally:
+        logger.remove(sink_id)
+
+    assert [it.id for it in valid] == [1, 2]
+    # Bereits konstruierte Instanzen werden nicht revalidiert/kopiert
+    assert valid[0] is instance
+    failed = [r["extra"].get("index") for r in captured if r["message"] == "widget_validation_failed"]
+    assert failed == [2, 3]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from app.homewidget.contracts.v1.widget_contracts import WidgetContractV1
+from app.homewidget.providers.aggregator import ProvidersAggregator
+from app.homewidget.providers.base import ProviderBase
+from app.homewidget.providers.result_cache import ProviderResultCache
+
+"""
+Tests für den Provider-Ergebnis-Cache (Stale-While-Revalidate) im Aggregator.
+"""
+
+_BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingProvider(ProviderBase):
+    def __init__(self, name: str = "counting") -> None:
+        self.calls = 0
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    @property
+    def name(self) -> str:
+        return "counting"
+
+    def load_items(self) -> List[WidgetContractV1]:
+        self.calls += 1
+        self.release.wait(timeout=2)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [WidgetContractV1(id=self.calls, name=f"v{self.calls}", priority=1, created_at=_BASE)]
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_fresh_entry_is_served_without_calling_provider() -> None:
+    clock = FakeClock()
+    provider = CountingProvider()
+    aggregator = ProvidersAggregator(providers=[provider], result_cache=ProviderResultCache(60, clock=clock))
+
+    first = aggregator.load_page(limit=10)
+    clock.now = 30
+    second = aggregator.load_page(limit=10)
+
+    assert provider.calls == 1
+    assert first == second
+
+
+def test_stale_entry_is_served_while_single_refresh_runs() -> None:
+    clock = FakeClock()
+    cache = ProviderResultCache(60, clock=clock)
+    provider = CountingProvider()
+    aggregator = ProvidersAggregator(providers=[provider], result_cache=cache)
+    aggregator.load_page(limit=10)
+
+    clock.now = 120
+    provider.release.clear()  # Hintergrund-Refresh blockiert, bis freigegeben
+    pages = [aggregator.load_page(limit=10) for _ in range(5)]
+
+    # Alle Aufrufe liefern sofort den veralteten Stand; nur ein Refresh wurde gestartet
+    assert all([it.id for it in p.items] == [1] for p in pages)
+    _wait_until(lambda: provider.calls == 2)
+    assert provider.calls == 2
+
+    provider.release.set()
+    _wait_until(lambda: cache.get("counting").items[0].id == 2)  # type: ignore[union-attr]
+    assert [it.id for it in aggregator.load_page(limit=10).items] == [2]
+
+
+def test_last_good_result_is_served_when_refresh_fails() -> None:
+    clock = FakeClock()
+    cache = ProviderResultCache(60, clock=clock)
+    provider = CountingProvider()
+    aggregator = ProvidersAggregator(providers=[provider], result_cache=cache)
+    aggregator.load_page(limit=10)
+
+    provider.fail = True
+    clock.now = 120
+    assert [it.id for it in aggregator.load_page(limit=10).items] == [1]
+
+    _wait_until(lambda: provider.calls == 2 and not cache._refreshing)
+    assert [it.id for it in aggregator.load_page(limit=10).items] == [1]
+
+
+def test_hanging_sync_refresh_times_out_and_releases_reservation() -> None:
+    clock = FakeClock()
+    cache = ProviderResultCache(60, clock=clock)
+    provider = CountingProvider()
+    provider.timeout_seconds = 0.1
+    aggregator = ProvidersAggregator(providers=[provider], result_cache=cache)
+    aggregator.load_page(limit=10)
+
+    clock.now = 120
+    provider.release.clear()  # Refresh hängt bis zur Freigabe (max. 2 s)
+    try:
+        assert [it.id for it in aggregator.load_page(limit=10).items] == [1]
+        _wait_until(lambda: provider.calls == 2)
+
+        # Timeout greift deutlich vor dem Ende des Providers: Reservierung ist wieder frei
+        _wait_until(lambda: not cache._refreshing, timeout=1.0)
+        assert not cache._refreshing
+        assert provider.calls == 2
+    finally:
+        provider.release.set()
@@ -34,17 +34,18 @@ def test_feed_v1_pagination_and_ordering(client: TestClient) -> None:
     data1 = page1.json()
     assert "items" in data1 and isinstance(data1["items"], list)
     assert len(data1["items"]) == 2
-    assert data1["next_cursor"] == 2
+    # next_cursor ist ein opaker Keyset-Cursor
+    assert isinstance(data1["next_cursor"], str)
 
     # Reihenfolge ist deterministisch nach (priority desc, created_at desc, id desc)
     ids_page1 = [it["id"] for it in data1["items"]]
     # Demo-Provider liefern deterministisch: 2002, 2001 auf Seite 1
     assert ids_page1 == [2002, 2001]
 
-    # Act: Zweite Seite (cursor=2)
+    # Act: Zweite Seite über den Keyset-Cursor der ersten Seite
     page2 = client.get(
         "/api/home/feed_v1",
-        params={"limit": 2, "cursor": 2},
+        params={"limit": 2, "cursor": data1["next_cursor"]},
         headers=auth_utils.auth_headers(access),
     )
     assert page2.status_code == 200, page2.text
@@ -57,6 +58,23 @@ def test_feed_v1_pagination_and_ordering(client: TestClient) -> None:
     all_ids = ids_page1 + ids_page2
     assert all_ids == [2002, 2001, 2102, 2101]
 
+    # Kompatibilität: Offset-Cursor (cursor=2) liefert dieselbe zweite Seite
+    page2_offset = client.get(
+        "/api/home/feed_v1",
+        params={"limit": 2, "cursor": 2},
+        headers=auth_utils.auth_headers(access),
+    )
+    assert page2_offset.status_code == 200, page2_offset.text
+    assert [it["id"] for it in page2_offset.json()["items"]] == ids_page2
+
+    # Ungültiger Cursor -> 400
+    bad = client.get(
+        "/api/home/feed_v1",
+        params={"limit": 2, "cursor": "k1.not-base64!"},
+        headers=auth_utils.auth_headers(access),
+    )
+    assert bad.status_code == 400
+
     # Determinismus: wiederholter Aufruf liefert gleiche Reihenfolge
     repeat = client.get(
         "/api/home/feed_v1",
@@ -109,3 +109,33 @@ from tests.utils.time import TimeUtil
 def items_ts(days: int) -> datetime:
     t = TimeUtil()
     return t.future(days=days)
+
+
+def test_demo_fixture_bytes_match_model_serialization(client: TestClient, monkeypatch) -> None:
+    from app.fixtures.v1 import FIXTURE_DETAILS, get_feed_page
+
+    monkeypatch.setattr(
+        "app.services.demo_feed_real_source.load_real_demo_feed_v1",
+        lambda cursor=0, limit=20: FeedPageV1(items=[], next_cursor=None),
+        raising=True,
+    )
+
+    # Alle Seiten per Offset und per Keyset-Cursor entsprechen der Pydantic-Serialisierung
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        resp = client.get("/api/home/demo/feed_v1", params=params)
+        assert resp.status_code == 200, resp.text
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.json() == get_feed_page(cursor=cursor, limit=2).model_dump(mode="json")
+        cursor = resp.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    resp = client.get("/api/home/demo/feed_v1", params={"limit": 5, "cursor": "99"})
+    assert resp.json() == {"items": [], "next_cursor": None}
+
+    for widget_id, detail in FIXTURE_DETAILS.items():
+        resp = client.get(f"/api/home/demo/widgets/{widget_id}/detail_v1")
+        assert resp.status_code == 200
+        assert resp.json() == detail.model_dump(mode="json")
@@ -124,3 +124,73 @@ def test_feed_after_widget_deletion(client: TestClient) -> None:
     feed2 = client.get("/api/home/feed", headers=auth_utils.auth_headers(access_token))
     assert feed2.status_code == 200
     assert feed2.json() == []
+
+
+def test_feed_is_cached_until_invalidated(client: TestClient, engine) -> None:
+    """Direkte DB-Änderungen erscheinen erst nach Invalidierung; Routen invalidieren selbst."""
+    from sqlmodel import Session, select
+
+    from app.models.user import User
+    from app.models.widget import Widget
+    from app.services.home_feed_cache import invalidate_home_feed
+
+    resp = auth_utils.register_and_login(client, "cached@example.com", "Secret1234!")
+    access_token = resp.json()["access_token"]
+    headers = auth_utils.auth_headers(access_token)
+
+    assert client.get("/api/home/feed", headers=headers).json() == []
+
+    # Widget am Cache vorbei direkt in die DB schreiben
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == "cached@example.com")).one()
+        session.add(Widget(owner_id=user.id, name="Direct"))
+        session.commit()
+        user_id = user.id
+
+    assert client.get("/api/home/feed", headers=headers).json() == []
+
+    invalidate_home_feed(user_id)
+    assert [w["name"] for w in client.get("/api/home/feed", headers=headers).json()] == ["Direct"]
+
+    # Anlegen über die Route invalidiert automatisch
+    client.post("/api/widgets/", headers=headers, json={"name": "ViaRoute", "config_json": "{}"})
+    names = {w["name"] for w in client.get("/api/home/feed", headers=headers).json()}
+    assert names == {"Direct", "ViaRoute"}
+
+
+def test_feed_generations_expire_and_are_not_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Generationszähler laufen ab (Speicher schrumpft), neue Werte liegen stets über alten."""
+    from app.services import home_feed_cache
+    from app.services.home_feed_cache import InMemoryGenerations
+
+    clock = [1_000.0]
+    monkeypatch.setattr(home_feed_cache.time, "time", lambda: clock[0])
+    generations = InMemoryGenerations()
+
+    first = generations.bump("home_feed_gen:1", ttl_seconds=30)
+    for user_id in range(2, 50):
+        generations.bump(f"home_feed_gen:{user_id}", ttl_seconds=30)
+    assert generations.current("home_feed_gen:1") == first
+    assert len(generations) == 49
+
+    clock[0] += 31
+    assert generations.current("home_feed_gen:1") == 0
+    assert generations.bump("home_feed_gen:1", ttl_seconds=30) > first
+    assert len(generations) == 1
+
+
+def test_feed_cache_ttl_bounded_by_earliest_widget_expiry() -> None:
+    """Die Cache-Lebensdauer endet spätestens mit dem frühesten freshness_ttl-Ablauf."""
+    from datetime import UTC, datetime, timedelta
+
+    from app.core.config import settings
+    from app.models.widget import Widget
+    from app.services.home_feed_cache import feed_cache_ttl
+
+    now = datetime.now(tz=UTC)
+    unlimited = Widget(owner_id=1, name="u", freshness_ttl=0, created_at=now - timedelta(days=1))
+    soon = Widget(owner_id=1, name="s", freshness_ttl=60, created_at=now - timedelta(seconds=55))
+    later = Widget(owner_id=1, name="l", freshness_ttl=600, created_at=now)
+
+    assert feed_cache_ttl([unlimited], now=now) == settings.HOME_FEED_CACHE_TTL_SECONDS
+    assert feed_cache_ttl([unlimited, soon, later], now=now) == pytest.approx(5.0)
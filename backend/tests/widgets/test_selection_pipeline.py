@@ -4,16 +4,26 @@ from datetime import timedelta
 
 import pytest
 from freezegun import freeze_time
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.database import create_async_db_engine
 from app.models.user import User, UserRole
 from app.models.widget import Widget
-from app.services.home_feed_service import HomeFeedService
+from app.services.home_feed_service import AsyncHomeFeedService, HomeFeedService
 from tests.utils.time import TimeUtil
 
 pytestmark = pytest.mark.unit
 
 
+@pytest.fixture
+def anyio_backend() -> str:
+    # SQLAlchemy-Asyncio (aiosqlite) läuft nur unter asyncio
+    return "asyncio"
+
+
 def test_enabled_false_is_excluded(db_session: Session) -> None:
     # Arrange: Benutzer + zwei Widgets
     user = User(email="sel_enabled@example.com", password_hash="x", role=UserRole.common)
@@ -207,3 +217,70 @@ def test_combined_filters_and_sorting_is_deterministic(db_session: Session) -> N
         names = [w.name for w in res]
         # Erwartet: ok2 (p3, newer) > ok1 (p1). Abgelehnte: no_common, disabled, expired
         assert names == ["ok2", "ok1"]
+
+
+def test_sql_selection_matches_python_reference(db_session: Session) -> None:
+    # Arrange: gemischte Widgets inkl. Sub‑Sekunden‑Grenzen beim TTL‑Ablauf
+    user = User(email="sel_sql_ref@example.com", password_hash="x", role=UserRole.common)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    assert user.id is not None
+    t = TimeUtil()
+    base = t.now().replace(microsecond=250_000)
+    ws = [
+        Widget(owner_id=user.id, name=f"w{i}", priority=i % 3, enabled=(i % 5 != 0),
+               visibility_rules=(["premium"] if i % 7 == 0 else []), freshness_ttl=(i % 4) * 30,
+               created_at=base - timedelta(seconds=i * 11, microseconds=i * 999))
+        for i in range(40)
+    ]
+    # Exakt auf der Grenze abgelaufen (created_at + ttl == now) und 1µs davor
+    ws.append(Widget(owner_id=user.id, name="edge_expired", freshness_ttl=60, created_at=base - timedelta(seconds=60)))
+    ws.append(Widget(owner_id=user.id, name="edge_fresh", freshness_ttl=60,
+                     created_at=base - timedelta(seconds=60) + timedelta(microseconds=1)))
+    for w in ws:
+        db_session.add(w)
+    db_session.commit()
+
+    service = HomeFeedService(db_session)
+
+    # Act: SQL‑Pfad (tz‑aware now) vs. reine Python‑Referenz
+    sql_res = service.get_user_widgets(user, now=base)
+    py_res = service._select_in_python(user, ref_now=base, ctx="common")
+
+    # Assert: identische Auswahl und Reihenfolge
+    assert [w.id for w in sql_res] == [w.id for w in py_res]
+    names = {w.name for w in sql_res}
+    assert "edge_fresh" in names
+    assert "edge_expired" not in names
+
+
+@pytest.mark.anyio
+async def test_async_service_matches_sync_service(engine: Engine, db_session: Session) -> None:
+    # Arrange: gemischte Widgets (Sichtbarkeit, enabled, TTL) in der Datei-DB der Fixture
+    user = User(email="sel_async@example.com", password_hash="x", role=UserRole.common)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    assert user.id is not None
+    base = TimeUtil().now().replace(microsecond=500_000)
+    for i in range(20):
+        db_session.add(Widget(owner_id=user.id, name=f"w{i}", priority=i % 3, enabled=(i % 4 != 0),
+                              visibility_rules=(["premium"] if i % 5 == 0 else []), freshness_ttl=(i % 3) * 40,
+                              created_at=base - timedelta(seconds=i * 17)))
+    db_session.commit()
+
+    sync_res = HomeFeedService(db_session).get_user_widgets(user, now=base)
+
+    async_engine = create_async_db_engine(str(engine.url), profile="off", poolclass=NullPool)
+    try:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            async_res = await AsyncHomeFeedService(session).get_user_widgets(user, now=base)
+    finally:
+        await async_engine.dispose()
+
+    # Assert: identische Auswahl und Reihenfolge über die AsyncSession
+    assert sync_res
+    assert [w.id for w in async_res] == [w.id for w in sync_res]
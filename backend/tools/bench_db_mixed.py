@@ -0,0 +1,109 @@
+"""
+Benchmark: gemischter Login-/Feed-Traffic auf einer SQLite-Datei je Pragma-Profil.
+
+Aufruf (aus `backend/`):
+    python -m tools.bench_db_mixed [--profiles off,prod] [--writers 4] [--readers 8] [--seconds 5]
+
+Writer-Threads bilden den DB-Anteil eines Logins nach (Benutzer laden, Refresh-Token
+ausstellen und committen; ohne Argon2), Reader-Threads laden den Home-Feed über
+`HomeFeedService`. Ausgegeben werden Durchsatz sowie p50/p99-Latenz je Operation.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, select
+
+from app.core.database import create_sqlite_engine
+from app.core.logging_config import setup_logging
+from app.models.user import User
+from app.models.widget import Widget
+from app.services.auth_service import AuthService
+from app.services.home_feed_service import HomeFeedService
+
+
+def _seed(engine, writers: int, widgets: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        users = [User(email=f"bench{i}@example.com", password_hash="unused") for i in range(writers + 1)]
+        session.add_all(users)
+        session.commit()
+        owner = users[-1]
+        session.refresh(owner)
+        session.add_all(Widget(name=f"w{i}", owner_id=owner.id, priority=i % 10) for i in range(widgets))
+        session.commit()
+
+
+def _login(engine, email: str) -> None:
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == email)).one()
+        AuthService(session).issue_tokens(user)
+
+
+def _feed(engine, email: str) -> None:
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == email)).one()
+        HomeFeedService(session).get_user_widgets(user)
+
+
+def _run(profile: str, writers: int, readers: int, seconds: float, directory: str | None) -> dict[str, list[float]]:
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", profile=profile, pool_size=writers + readers)
+        _seed(engine, writers, widgets=200)
+        latencies: dict[str, list[float]] = {"login": [], "feed": []}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def worker(kind: str, email: str) -> None:
+            op = _login if kind == "login" else _feed
+            local: list[float] = []
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                op(engine, email)
+                local.append((time.perf_counter() - started) * 1000)
+            with lock:
+                latencies[kind].extend(local)
+
+        threads = [threading.Thread(target=worker, args=("login", f"bench{i}@example.com")) for i in range(writers)]
+        threads += [threading.Thread(target=worker, args=("feed", f"bench{writers}@example.com")) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        engine.dispose()
+        return latencies
+
+
+def _p(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) >= 2 else float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="off,prod")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--dir", default=None, help="Verzeichnis der DB-Datei (Default: System-Temp)")
+    args = parser.parse_args()
+    # Request-Logs würden die Messung dominieren
+    setup_logging(level="WARNING")
+
+    print(f"writers={args.writers} readers={args.readers} seconds={args.seconds}")
+    print(f"{'profile':<8}{'op':<7}{'ops/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for profile in args.profiles.split(","):
+        latencies = _run(profile, args.writers, args.readers, args.seconds, args.dir)
+        for op, values in latencies.items():
+            print(
+                f"{profile:<8}{op:<7}{len(values) / args.seconds:>9.0f}"
+                f"{_p(values, 50):>9.2f}{_p(values, 99):>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
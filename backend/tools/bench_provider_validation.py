@@ -0,0 +1,60 @@
+"""
+Benchmark: Validierung einer Provider-Ausgabe (Einzel- vs. Batch-Pfad).
+
+Aufruf (aus `backend/`):
+    python -m tools.bench_provider_validation [--items 10000] [--repeat 5]
+
+Vergleicht die frühere Einzelvalidierung (`model_validate` je Item mit try/except)
+mit `_validate_batch` (Listen-`TypeAdapter`) für Roh-Dicts, Dicts mit ~1 % ungültigen
+Items sowie bereits konstruierte `WidgetContractV1`-Instanzen.
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from app.homewidget.contracts.v1.widget_contracts import WidgetContractV1
+from app.homewidget.providers.aggregator import _validate_batch
+
+
+def _per_item(raw_items: list[Any]) -> list[WidgetContractV1]:
+    valid = []
+    for raw in raw_items:
+        try:
+            valid.append(WidgetContractV1.model_validate(raw))
+        except Exception:  # noqa: BLE001
+            pass
+    return valid
+
+
+def _payloads(n: int) -> dict[str, list[Any]]:
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    dicts = [
+        {"id": i, "name": f"W{i}", "priority": i % 50, "created_at": base + timedelta(seconds=i)}
+        for i in range(n)
+    ]
+    with_invalid = [dict(d) for d in dicts]
+    for d in with_invalid[::100]:
+        del d["name"]
+    instances = [WidgetContractV1.model_validate(d) for d in dicts]
+    return {"dicts": dicts, "dicts_1pct_invalid": with_invalid, "instances": instances}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"items={args.items} repeat={args.repeat} (best of, ms)")
+    print(f"{'payload':<22}{'per_item':>12}{'batch':>12}{'speedup':>10}")
+    for label, payload in _payloads(args.items).items():
+        per_item = min(timeit.repeat(lambda: _per_item(payload), number=1, repeat=args.repeat)) * 1000
+        batch = min(timeit.repeat(lambda: _validate_batch(payload), number=1, repeat=args.repeat)) * 1000
+        print(f"{label:<22}{per_item:>12.2f}{batch:>12.2f}{per_item / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: Rate-Limiter Sliding-Window (deque) vs. GCRA.
+
+Aufruf (aus `backend/`):
+    python -m tools.bench_rate_limiter [--keys 1000] [--count 1000] [--window 60] [--ops 200000]
+
+Misst je Algorithmus den Speicher pro Key (tracemalloc, nachdem jeder Key sein Limit
+ausgeschöpft hat) sowie ns/op für `allow` im Dauerbetrieb über alle Keys.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+import tracemalloc
+
+from app.services.rate_limit import GCRA, SLIDING_WINDOW, InMemoryRateLimiter, RateRule
+
+
+def _memory_per_key(rule: RateRule, keys: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    limiter = InMemoryRateLimiter()
+    for k in range(keys):
+        key = f"login:10.0.0.{k}:user{k}"
+        for _ in range(rule.count):
+            limiter.allow(key, rule)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return used / keys
+
+
+def _ns_per_op(rule: RateRule, keys: int, ops: int) -> float:
+    limiter = InMemoryRateLimiter()
+    names = [f"feed:{k}" for k in range(keys)]
+    # Aufwärmen: jeder Key hat sein Fenster gefüllt (realistischer Dauerzustand)
+    for key in names:
+        for _ in range(rule.count):
+            limiter.allow(key, rule)
+
+    allow = limiter.allow
+    started = time.perf_counter_ns()
+    for key in itertools.islice(itertools.cycle(names), ops):
+        allow(key, rule)
+    return (time.perf_counter_ns() - started) / ops
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--ops", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"keys={args.keys} rule={args.count}/{args.window}s ops={args.ops}")
+    print(f"{'algorithm':<16}{'bytes/key':>12}{'ns/op':>10}")
+    for algorithm in (SLIDING_WINDOW, GCRA):
+        rule = RateRule(count=args.count, window_seconds=args.window, algorithm=algorithm)
+        per_key = _memory_per_key(rule, args.keys)
+        ns = _ns_per_op(rule, args.keys, args.ops)
+        print(f"{algorithm:<16}{per_key:>12.0f}{ns:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
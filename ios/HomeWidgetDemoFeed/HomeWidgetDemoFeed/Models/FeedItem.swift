@@ -6,8 +6,8 @@ import Foundation
 struct FeedPage: Codable {
     /// Liste der in dieser Seite enthaltenen Feed-Einträge.
     let items: [FeedItem]
-    /// Der Cursor für die nächste Seite, falls vorhanden (serverseitige Paginierung).
-    let nextCursor: Int?
+    /// Opaker Cursor für die nächste Seite, falls vorhanden (serverseitige Keyset-Paginierung).
+    let nextCursor: String?
 
     enum CodingKeys: String, CodingKey {
         case items
@@ -11,7 +11,7 @@ export type {FeedPageV1 as FeedPageV1, WidgetDetailV1 as WidgetDetailV1} from '.
 const EMPTY_FEED_PAGE: FeedPageV1Type = {items: [], next_cursor: null};
 
 export async function getDemoFeedPage(params: {
-	cursor?: number | null;
+	cursor?: string | number | null;
 	limit?: number
 } = {}): Promise<FeedPageV1Type> {
 	const search = new URLSearchParams();
@@ -9,7 +9,8 @@ export const WidgetContractV1 = z.object({
 
 export const FeedPageV1 = z.object({
 	items: z.array(WidgetContractV1),
-	next_cursor: z.number().nullable().optional(),
+	// Opaker Keyset-Cursor (Server); numerische Werte = Legacy-Offset
+	next_cursor: z.union([z.string(), z.number()]).nullable().optional(),
 });
 
 export type WidgetContractV1 = z.infer<typeof WidgetContractV1>;
@@ -6,6 +6,11 @@
  */
 import {useInfiniteQuery, type InfiniteData, type QueryKey} from '@tanstack/react-query';
 
+/**
+ * Cursor der Feed-Pagination: opaker Keyset-Cursor (string) oder Legacy-Offset (number).
+ */
+export type FeedCursor = string | number;
+
 /**
  * Typdefinition für eine Feed-Seite mit Cursor-Paginierung.
  * 
@@ -13,7 +18,7 @@ import {useInfiniteQuery, type InfiniteData, type QueryKey} from '@tanstack/reac
  */
 export interface CursorFeedPage<TItem> {
 	items: TItem[];
-	next_cursor?: number | null;
+	next_cursor?: FeedCursor | null;
 }
 
 /**
@@ -27,7 +32,7 @@ export interface InfiniteFeedConfig<TItem, TQueryKey extends QueryKey> {
 	queryKey: TQueryKey;
 	
 	/** Fetch-Funktion, die eine Seite lädt */
-	fetchPage: (cursor: number | null, limit: number) => Promise<CursorFeedPage<TItem>>;
+	fetchPage: (cursor: FeedCursor | null, limit: number) => Promise<CursorFeedPage<TItem>>;
 	
 	/** Maximale Anzahl Items pro Seite */
 	limit: number;
@@ -66,11 +71,11 @@ export function useInfiniteFeedBase<TItem, TQueryKey extends QueryKey>(
 		Error,
 		InfiniteData<CursorFeedPage<TItem>>,
 		TQueryKey,
-		number | null
+		FeedCursor | null
 	>({
 		queryKey,
-		queryFn: ({pageParam}: {pageParam: number | null}) => fetchPage(pageParam, limit),
-		initialPageParam: null as number | null,
+		queryFn: ({pageParam}: {pageParam: FeedCursor | null}) => fetchPage(pageParam, limit),
+		initialPageParam: null as FeedCursor | null,
 		getNextPageParam: (lastPage: CursorFeedPage<TItem>) => lastPage.next_cursor ?? undefined,
 		enabled,
 		staleTime,